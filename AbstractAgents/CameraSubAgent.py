@@ -25,6 +25,8 @@ The Lorax Camera API is as follows:
         Disconnect from the camera
     status
         Broadcast the current status of the camera
+    history
+        Broadcast the telemetry history of a status field
     expose
         Take an exposure with the currently defined settings
     pause_exposure
@@ -53,6 +55,9 @@ The Lorax Camera API is as follows:
         Set the FITS comment field to be included in the header
     set_image_directory
         Set the directory into which the FITS images will be stored
+    set_filter_sequence
+        Set the filters for a multi-filter exposure sequence; the filter wheel
+        moves to the next filter while each frame is read out
     reset_frame
         Reset the binning, origin, and size properties to initial values
     reset_properties
@@ -62,13 +67,12 @@ The Lorax Camera API is as follows:
 
 # Built-In Libraries
 from abc import abstractmethod
-import warnings
 
 # 3rd Party Libraries
 
 # Internal Imports
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import Arg, CommandRegistry
 
 
 class CameraSubAgent(SubAgent):
@@ -107,13 +111,25 @@ class CameraSubAgent(SubAgent):
         self.img_title = None
         self.fits_comment = None
         self.ccd_binning = (1, 1)
+        self.filter_sequence = []
+
+    commands = CommandRegistry("camera", parent=SubAgent.commands)
+    commands.placeholder(
+        "set_binning",
+        "set_origin",
+        "set_size",
+        "set_image_directory",
+        "reset_frame",
+        "reset_properties",
+    )
 
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the CameraSubAgent.  Incoming messages
-        are compared against the command list, and the proper method is called.
-        Some of the API commands are general to all Camera Agents and are fully
+        are looked up in the ``commands`` registry, their arguments are checked
+        against the command's schema, and the proper method is called.  Some of
+        the API commands are general to all Camera Agents and are fully
         implemented here; others are hardware-specific and are left as abstract
         methods for later implementation.
 
@@ -124,158 +140,124 @@ class CameraSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in CameraSubAgent: {message}")
-
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        # CASE out the COMMAND
-        if command == "init":
-            print("Connecting to the camera...")
-            # Call hardware-specific method
-            self.connect_to_camera()
-
-        elif command == "disconnect":
-            print("Disconnecting from camera...")
-            # Reset all internal attributes
-            self.ccd = None
-            self.device_ccd = None
-            self.exptime = None
-            self.exptype = None
-            self.ccd_binning = (1, 1)
-            # Call hardware-specific method
-            self.disconnect_from_camera()
-
-        elif command == "status":
-            # Call hardware-specific method
-            self.get_status_and_broadcast()
-
-        elif command == "expose":
-            # check arguments.
-            # check exposure settings.
-            # send "wait" to DTO.
-            # request FITS dictionary from Locutus.
-            # send camera specific command to camera. (call cam_specific_expose)
-            # when done, request another FITS dictionary from Locutus.
-            # save image data to local disk.
-            # spawn fits_writer in seperate process (data, fits1, fits2)
-            # send "go" command to DTO.
-            # print("camera:take exposure")
-
-            # Call hardware-specific method
-            self.expose()
-
-        elif command == "pause_exposure":
-            # Call hardware-specific method
-            self.pause_exposure()
-
-        elif command == "resume_exposure":
-            # Call hardware-specific method
-            self.resume_exposure()
-
-        elif command == "abort":
-            # Call hardware-specific method
-            self.abort_exposure()
-
-        elif command == "set_exposure_length":
-            # There should be ONE argument, and it should be a float
-            if len(arguments) != 1 or not isinstance(arguments[0], float):
-                warnings.warn("Exposure time must be a single float value.")
-                return
-            exptime = arguments[0]
-
-            # Check arguments against exposure length limits.
-
-            # Set the instance attribute
-            self.exptime = exptime
-            print(f"Exposure length set to {exptime:.2f}s")
-
-        elif command == "set_num_exposures":
-            # There should be ONE argument, and it should be a float
-            if len(arguments) != 1 or not isinstance(arguments[0], float):
-                warnings.warn("Number of exposures must be a single number.")
-                return
-            n_exposures = int(arguments[0])
-
-            # Check arguments against number of exposure limits.
-
-            # Set the instance attribute
-            self.n_exposures = n_exposures
-            print(f"Number of exposures set to {n_exposures}")
-
-        elif command == "set_exposure_type":
-            # There should be ONE argument, and it should be a string
-            if len(arguments) != 1 or not isinstance(arguments[0], str):
-                warnings.warn("Exposure type must be a single string.")
-                return
-            exptype = arguments[0]
-
-            # Check arguments against exposure types.
-
-            # Set the instance attribute
-            self.exptype = exptype
-            print(f"Exposure type set to {exptype}")
-
-        elif command == "set_binning":
-            # check arguments against binning limits.
-            # send camera specific set_binning.
-            print("camera: set_binning (no effect)")
-
-        elif command == "set_origin":
-            # check arguments against origin limits.
-            # send camera specific set_origin.
-            print("camera: set_origin (no effect)")
-
-        elif command == "set_size":
-            # check arguments against size limits.
-            # send camera specific set_size.
-            print("camera: set_size (no effect)")
-
-        elif command == "set_gain":
-            # There should be ONE argument, and it should be a float
-            if len(arguments) != 1 or not isinstance(arguments[0], float):
-                warnings.warn("Gain must be a single float value.")
-                return
-            gain = arguments[0]
-
-            # Check arguments against exposure length limits.
-
-            # Set the instance attribute
-            self.gain = gain
-            print(f"Gain set to {gain:.2f}s")
-
-        elif command == "set_image_title":
-            # There should be ONE argument, and it should be a string
-            if len(arguments) != 1 or not isinstance(arguments[0], str):
-                warnings.warn("Image title must be a single string.")
-                return
-            img_title = arguments[0]
-
-            # Set the instance attribute
-            self.img_title = img_title
-            print(f"Image title set to {img_title}")
-
-        elif command == "set_fits_comment":
-            # There should be ONE argument, and it should be a string
-            if len(arguments) != 1 or not isinstance(arguments[0], str):
-                warnings.warn("FITS comment must be a single string.")
-                return
-            fits_comment = arguments[0]
-
-            # Set the instance attribute
-            self.fits_comment = fits_comment
-            print(f"FITS comment set to {img_title}")
-
-        elif command == "set_image_directory":
-            print("camera: set_image_directory (no effect)")
-
-        elif command == "reset_frame":
-            print("camera: reset_frame (no effect)")
-
-        elif command == "reset_properties":
-            print("camera: reset_properties (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+        self.dispatch_command(message)
+
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the camera"""
+        print("Connecting to the camera...")
+        # Call hardware-specific method
+        self.connect_to_camera()
+
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the camera"""
+        print("Disconnecting from camera...")
+        # Reset all internal attributes
+        self.ccd = None
+        self.device_ccd = None
+        self.exptime = None
+        self.exptype = None
+        self.ccd_binning = (1, 1)
+        self.filter_sequence = []
+        # Call hardware-specific method
+        self.disconnect_from_camera()
+
+    @commands.command("status")
+    def cmd_status(self):
+        """Broadcast the current status of the camera"""
+        # Call hardware-specific method
+        self.get_status_and_broadcast()
+
+    @commands.command("expose")
+    def cmd_expose(self):
+        """Take an exposure with the currently defined settings"""
+        # check exposure settings.
+        # send "wait" to DTO.
+        # request FITS dictionary from Locutus.
+        # send camera specific command to camera. (call cam_specific_expose)
+        # when done, request another FITS dictionary from Locutus.
+        # save image data to local disk.
+        # spawn fits_writer in seperate process (data, fits1, fits2)
+        # send "go" command to DTO.
+
+        # Call hardware-specific method
+        self.expose()
+
+    @commands.command("pause_exposure")
+    def cmd_pause_exposure(self):
+        """Pause the exposure without reading out the detector"""
+        # Call hardware-specific method
+        self.pause_exposure()
+
+    @commands.command("resume_exposure")
+    def cmd_resume_exposure(self):
+        """Resume a previously paused exposure"""
+        # Call hardware-specific method
+        self.resume_exposure()
+
+    @commands.command("abort")
+    def cmd_abort(self):
+        """Abort the exposure completely (exposure lost)"""
+        # Call hardware-specific method
+        self.abort_exposure()
+
+    @commands.command("set_exposure_length", Arg("exptime", float))
+    def cmd_set_exposure_length(self, exptime):
+        """Set the exposure length"""
+        # Check arguments against exposure length limits.
+
+        # Set the instance attribute
+        self.exptime = exptime
+        print(f"Exposure length set to {exptime:.2f}s")
+
+    @commands.command("set_num_exposures", Arg("n_exposures", int))
+    def cmd_set_num_exposures(self, n_exposures):
+        """Set the number of exposures to take"""
+        # Check arguments against number of exposure limits.
+
+        # Set the instance attribute
+        self.n_exposures = n_exposures
+        print(f"Number of exposures set to {n_exposures}")
+
+    @commands.command("set_exposure_type", Arg("exptype", str))
+    def cmd_set_exposure_type(self, exptype):
+        """Set the exposure type"""
+        # Check arguments against exposure types.
+
+        # Set the instance attribute
+        self.exptype = exptype
+        print(f"Exposure type set to {exptype}")
+
+    @commands.command("set_gain", Arg("gain", float))
+    def cmd_set_gain(self, gain):
+        """Set the gain of the detector"""
+        # Check arguments against gain limits.
+
+        # Set the instance attribute
+        self.gain = gain
+        print(f"Gain set to {gain:.2f}")
+
+    @commands.command("set_image_title", Arg("img_title", str))
+    def cmd_set_image_title(self, img_title):
+        """Set the image title to be placed in the FITS header"""
+        # Set the instance attribute
+        self.img_title = img_title
+        print(f"Image title set to {img_title}")
+
+    @commands.command("set_fits_comment", Arg("fits_comment", str))
+    def cmd_set_fits_comment(self, fits_comment):
+        """Set the FITS comment field to be included in the header"""
+        # Set the instance attribute
+        self.fits_comment = fits_comment
+        print(f"FITS comment set to {fits_comment}")
+
+    @commands.command("set_filter_sequence", varargs=Arg("filter", None))
+    def cmd_set_filter_sequence(self, *filter_sequence):
+        """Set the filters for a multi-filter exposure sequence"""
+        # Any number of filter names or slots; no arguments clears it
+        self.filter_sequence = list(filter_sequence)
+        print(f"Filter sequence set to {self.filter_sequence}")
 
     def get_status_and_broadcast(self):
         """Get the current camera status and broadcast it
@@ -371,6 +353,31 @@ class CameraSubAgent(SubAgent):
         Must be implemented by hardware-specific Agent
         """
 
+    @abstractmethod
+    def acquire_frame(self, exptime, roi=None):
+        """Take a single frame for another SubAgent, and return the image
+
+        Unlike :meth:`expose`, no WAIT / GO is sent to the DTO and the frame is
+        not written to disk; it is for acquisition and pointing work by the
+        other SubAgents of the CompositeAgent.
+
+        Must be implemented by hardware-specific Agent
+
+        Parameters
+        ----------
+        exptime : ``float``
+            Exposure time in seconds
+        roi : ``tuple``, optional
+            Region of interest ``(x, y, width, height)`` in unbinned pixels;
+            the full frame if not given.  (Default: None)
+
+        Returns
+        -------
+        ``tuple``
+            The image (:obj:`numpy.ndarray`), and the ``(x, y)`` origin of the
+            region read out
+        """
+
     @abstractmethod
     def pause_exposure(self):
         """Pause an in-progress exposure
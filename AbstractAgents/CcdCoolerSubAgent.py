@@ -25,6 +25,8 @@ The Lorax CCD Cooler API is as follows:
         Disconnect from the cooler
     status
         Broadcast the current status of the cooler
+    history
+        Broadcast the telemetry history of a status field
     set_temperature
         Set the temperature goal for the cooler
     set_temp_tolerance
@@ -33,18 +35,26 @@ The Lorax CCD Cooler API is as follows:
         Turn the power to the cooler off (but don't disconnect)
     power_on
         Turn the power to the cooler on, set nominal temperature
+    ramp_temperature
+        Ramp the set point to a target at a maximum slope (ºC/min), with
+        optional ``(temperature, minutes)`` hold points along the way
+    abort_ramp
+        Stop a running ramp, leaving the set point where it is
 
 """
 
 # Built-In Libraries
 from abc import abstractmethod
+import threading
+import time
 import warnings
 
 # 3rd Party Libraries
 
 # Internal Imports
+from AbstractAgents.CoolerRamp import CoolerRamp
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import Arg, CommandError, CommandRegistry
 
 
 class CcdCoolerSubAgent(SubAgent):
@@ -77,14 +87,24 @@ class CcdCoolerSubAgent(SubAgent):
         self.cooler = None
         self.device_cooler = None
 
+        # Ramp profile controller state
+        self.ramp_thread = None
+        self.ramp_abort = threading.Event()
+        self.ramp_status = {}
+        self.ramp_lock = threading.Lock()
+
+    commands = CommandRegistry("ccdcooler", parent=SubAgent.commands)
+    commands.placeholder("set_temp_tolerance", "power_on")
+
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the CcdCoolerSubAgent.  Incoming
-        messages are compared against the command list, and the proper method
-        is called.  Some of the API commands are general to all CCD Cooler
-        Agents and are fully implemented here; others are hardware-specific and
-        are left as abstract methods for later implementation.
+        messages are looked up in the ``commands`` registry, their arguments
+        are checked against the command's schema, and the proper method is
+        called.  Some of the API commands are general to all CCD Cooler Agents
+        and are fully implemented here; others are hardware-specific and are
+        left as abstract methods for later implementation.
 
         Parameters
         ----------
@@ -93,52 +113,62 @@ class CcdCoolerSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in CcdCoolerSubAgent: {message}")
+        self.dispatch_command(message)
+
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the cooler"""
+        print("Connecting to the cooler...")
+        # Call hardware-specific method
+        self.connect_to_cooler()
+
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the cooler"""
+        print("Disconnecting from cooler...")
+        self.abort_ramp()
+        # Call hardware-specific method
+        self.disconnect_from_cooler()
+        self.cooler = None
+        self.device_cooler = None
 
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        # CASE out the COMMAND
-        if command == "init":
-            print("Connecting to the cooler...")
-            # Call hardware-specific method
-            self.connect_to_cooler()
-
-        elif command == "disconnect":
-            print("Disconnecting from cooler...")
-            # Call hardware-specific method
-            self.disconnect_from_cooler()
-            self.cooler = None
-            self.device_cooler = None
-
-        elif command == "status":
-            # Call hardware-specific method
-            self.get_status_and_broadcast()
-
-        elif command == "set_temperature":
-            # There should be ONE argument, and it should be a float
-            if len(arguments) != 1 or not isinstance(arguments[0], float):
-                warnings.warn("Set temperature must be a single float value.")
-                return
-            temperature = arguments[0]
-
-            # Check arguments against temperature limits.
-
-            # Call hardware-specific method
-            self.set_temperature(temperature)
-            print(f"Temperature set to {temperature:.1f}ºC")
-
-        elif command == "set_temp_tolerance":
-            print("cooler: set_temp_tolerance (no effect)")
-
-        elif command == "power_off":
-            # Call hardware-specific method
-            self.power_off()
-
-        elif command == "power_on":
-            print("cooler: power_on (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+    @commands.command("status")
+    def cmd_status(self):
+        """Broadcast the current status of the cooler"""
+        # Call hardware-specific method
+        self.get_status_and_broadcast()
+
+    @commands.command("set_temperature", Arg("temperature", float))
+    def cmd_set_temperature(self, temperature):
+        """Set the temperature goal for the cooler"""
+        # Check arguments against temperature limits.
+
+        # An explicit set point replaces any ramp in progress
+        self.abort_ramp()
+
+        # Call hardware-specific method
+        self.set_temperature(temperature)
+        print(f"Temperature set to {temperature:.1f}ºC")
+
+    @commands.command("power_off")
+    def cmd_power_off(self):
+        """Turn the power to the cooler off (but don't disconnect)"""
+        self.abort_ramp()
+        # Call hardware-specific method
+        self.power_off()
+
+    @commands.command(
+        "ramp_temperature",
+        Arg("target", float),
+        Arg("max_slope", float),
+        varargs=Arg("hold", float),
+    )
+    def cmd_ramp_temperature(self, target, max_slope, *holds):
+        """Ramp the set point to a target at a maximum slope (ºC/min)"""
+        # Target and slope, followed by (temperature, minutes) hold pairs
+        if len(holds) % 2:
+            raise CommandError("Ramp hold points must be (temperature, minutes) pairs.")
+        self.start_ramp(target, max_slope, list(zip(holds[::2], holds[1::2])))
 
     def get_status_and_broadcast(self):
         """Get the current cooler status and broadcast it
@@ -147,6 +177,10 @@ class CcdCoolerSubAgent(SubAgent):
         """
         # Check if the cooler is connected; get status or set empty dictionary
         device_status = self.device_status if self.check_cooler_connection() else {}
+        # Include the ramp progress, if a ramp has been run
+        if device_status:
+            with self.ramp_lock:
+                device_status = {**device_status, **self.ramp_status}
         # Broadcast
         self.broadcast_status(device_status)
 
@@ -166,6 +200,114 @@ class CcdCoolerSubAgent(SubAgent):
         # )
         return False
 
+    def start_ramp(self, target, max_slope, holds=None):
+        """Start a ramp profile in a background thread
+
+        Any ramp already in progress is aborted and the new ramp starts from
+        the present CCD temperature.  This method returns immediately; the
+        DTO is sent "WAIT" now and "GO" when the target is reached, or an
+        "ERROR" if the ramp is aborted.
+
+        Parameters
+        ----------
+        target : ``float``
+            The final set point (ºC)
+        max_slope : ``float``
+            The maximum rate of change of the set point (ºC/min)
+        holds : ``list``, optional
+            List of ``(temperature, minutes)`` hold points.  (Default: None)
+        """
+        if not self.check_cooler_connection():
+            self.reply_to_dto("ERROR: The cooler is not connected")
+            return
+        self.abort_ramp()
+
+        if (temperature := self.get_temperature()) is None:
+            warnings.warn("CCD temperature not available; cannot start the ramp.")
+            self.reply_to_dto("ERROR: CCD temperature not available")
+            return
+        try:
+            ramp = CoolerRamp(temperature, target, max_slope, holds)
+        except ValueError as err:
+            warnings.warn(str(err))
+            self.reply_to_dto(f"ERROR: {err}")
+            return
+        print(
+            f"Ramping cooler from {ramp.start:.1f}ºC to {ramp.target:.1f}ºC "
+            f"at {ramp.max_slope:.2f}ºC/min ({ramp.duration / 60:.1f} min)"
+        )
+
+        self.reply_to_dto("WAIT")
+        self.ramp_abort.clear()
+        self.ramp_thread = threading.Thread(
+            target=self.run_ramp, args=(ramp, self.correlation_id), daemon=True
+        )
+        self.ramp_thread.start()
+
+    @commands.command("abort_ramp")
+    def abort_ramp(self):
+        """Stop any ramp in progress, leaving the set point where it is"""
+        if self.ramp_thread and self.ramp_thread.is_alive():
+            print("Aborting cooler ramp...")
+            self.ramp_abort.set()
+            self.ramp_thread.join()
+        self.ramp_thread = None
+
+    def run_ramp(self, ramp, correlation_id=None):
+        """Walk a ramp profile, pushing set points to the hardware
+
+        This is the body of the ramp controller thread.  The set point is
+        updated every ``ramp_update_interval`` seconds (from the configuration,
+        default 5 s) and the progress is added to the status broadcast.
+
+        Parameters
+        ----------
+        ramp : :class:`~AbstractAgents.CoolerRamp.CoolerRamp`
+            The ramp profile to follow
+        correlation_id : str, optional
+            Correlation ID of the command that started the ramp, for the "GO"
+            sent when it ends, or ``None`` if that command was not tagged.
+            (Default: None)
+        """
+        interval = self.config.get("ramp_update_interval", 5.0)
+        t_start = time.monotonic()
+
+        while True:
+            elapsed = time.monotonic() - t_start
+            setpoint = ramp.setpoint(elapsed)
+            state = ramp.state(elapsed)
+            self.set_cooler_setpoint(setpoint)
+
+            with self.ramp_lock:
+                self.ramp_status = {
+                    "PROFILE_STATE": state,
+                    "PROFILE_SETPOINT": setpoint,
+                    "PROFILE_TARGET": ramp.target,
+                    "PROFILE_PROGRESS": (
+                        min(elapsed / ramp.duration, 1.0) if ramp.duration else 1.0
+                    ),
+                    "PROFILE_REMAINING": max(ramp.duration - elapsed, 0.0),
+                }
+            self.get_status_and_broadcast()
+
+            if state == "DONE":
+                print(f"Cooler ramp complete, set point {ramp.target:.1f}ºC")
+                # The final state has been broadcast; drop the PROFILE_* keys
+                with self.ramp_lock:
+                    self.ramp_status = {}
+                self.reply_from_thread("GO", correlation_id)
+                return
+
+            # Sleep until the next update, waking early at the end of the ramp
+            if self.ramp_abort.wait(min(interval, ramp.duration - elapsed)):
+                with self.ramp_lock:
+                    self.ramp_status["PROFILE_STATE"] = "ABORTED"
+                self.get_status_and_broadcast()
+                with self.ramp_lock:
+                    self.ramp_status = {}
+                self.reply_from_thread("ERROR: ramp aborted", correlation_id)
+                return
+
     @abstractmethod
     def connect_to_cooler(self):
         """Connect to CCD cooler
@@ -190,6 +332,24 @@ class CcdCoolerSubAgent(SubAgent):
         is stable.
         """
 
+    @abstractmethod
+    def set_cooler_setpoint(self, cool_temp):
+        """Send a new cooler set point without waiting for it to be reached
+
+        Must be implemented by hardware-specific Agent
+
+        Used by the ramp controller, which must never block.
+        """
+
+    @abstractmethod
+    def get_temperature(self):
+        """Return the present CCD temperature (ºC)
+
+        Must be implemented by hardware-specific Agent
+
+        Returns ``None`` if the temperature is not known.
+        """
+
     @abstractmethod
     def power_off(self):
         """Turn the cooler power off
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax CCD Cooler Ramp Profiles
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+A ramp profile describes how the cooler set point should move from the
+present CCD temperature to a target temperature without exceeding a maximum
+slope (in ºC per minute), optionally pausing at a series of hold points along
+the way.  The schedule is piecewise-linear: the set point moves at exactly the
+maximum slope between hold points (the minimum time allowed by the limit) and
+sits still for the requested duration at each hold point.
+
+The profile itself is pure bookkeeping; it is the CcdCoolerSubAgent that walks
+the schedule in a background thread and pushes set points to the hardware.
+"""
+
+# Built-In Libraries
+import warnings
+
+# 3rd Party Libraries
+
+# Internal Imports
+
+
+class CoolerRamp:
+    """Minimum-time piecewise-linear cooler set point schedule
+
+    Parameters
+    ----------
+    start : ``float``
+        The starting temperature (ºC), usually the present CCD temperature
+    target : ``float``
+        The final set point (ºC)
+    max_slope : ``float``
+        The maximum rate of change of the set point (ºC/min), must be positive
+    holds : ``list``, optional
+        List of ``(temperature, minutes)`` hold points.  Hold points that do
+        not lie between ``start`` and ``target`` are ignored.  (Default: None)
+    """
+
+    def __init__(self, start, target, max_slope, holds=None):
+        if max_slope <= 0:
+            raise ValueError("Ramp slope must be a positive number of ºC/min")
+
+        self.start = float(start)
+        self.target = float(target)
+        self.max_slope = float(max_slope)
+
+        # Keep only the hold points along the path, in the direction of travel
+        direction = 1.0 if self.target >= self.start else -1.0
+        low, high = sorted((self.start, self.target))
+        path_holds = []
+        for temp, minutes in holds or []:
+            if not low <= temp <= high:
+                warnings.warn(
+                    f"Hold point {temp:.1f}ºC is not between {self.start:.1f}ºC "
+                    f"and {self.target:.1f}ºC; ignoring it."
+                )
+                continue
+            path_holds.append((float(temp), max(float(minutes), 0.0)))
+        path_holds.sort(key=lambda hold: direction * hold[0])
+
+        # Build the segments as (t_start, t_end, temp_start, temp_end) in seconds
+        self.segments = []
+        t_now, temp_now = 0.0, self.start
+        for temp, minutes in path_holds + [(self.target, 0.0)]:
+            t_ramp = abs(temp - temp_now) / self.max_slope * 60.0
+            if t_ramp > 0:
+                self.segments.append((t_now, t_now + t_ramp, temp_now, temp))
+                t_now += t_ramp
+            if minutes > 0:
+                self.segments.append((t_now, t_now + minutes * 60.0, temp, temp))
+                t_now += minutes * 60.0
+            temp_now = temp
+
+    @property
+    def duration(self):
+        """Total length of the ramp schedule in seconds"""
+        return self.segments[-1][1] if self.segments else 0.0
+
+    def setpoint(self, elapsed):
+        """Return the scheduled set point ``elapsed`` seconds into the ramp
+
+        Parameters
+        ----------
+        elapsed : ``float``
+            Seconds since the ramp was started
+
+        Returns
+        -------
+        ``float``
+            The set point (ºC) at this point in the schedule
+        """
+        for t_start, t_end, temp_start, temp_end in self.segments:
+            if elapsed < t_end:
+                frac = max(elapsed - t_start, 0.0) / (t_end - t_start)
+                return temp_start + frac * (temp_end - temp_start)
+        return self.target
+
+    def state(self, elapsed):
+        """Return a short description of the ramp state at ``elapsed``
+
+        Parameters
+        ----------
+        elapsed : ``float``
+            Seconds since the ramp was started
+
+        Returns
+        -------
+        ``str``
+            One of ``RAMPING``, ``HOLDING``, or ``DONE``
+        """
+        for t_start, t_end, temp_start, temp_end in self.segments:
+            if t_start <= elapsed < t_end:
+                return "HOLDING" if temp_start == temp_end else "RAMPING"
+        return "DONE"
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Dome Slaving Geometry and Planning
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+The dome azimuth that centers the slit on the telescope beam is not the
+telescope azimuth: the mount sits off the dome center (the pier offset) and
+the optical axis may be displaced from the mount's vertical axis along the
+elevation axis.  :class:`DomeGeometry` intersects the optical axis with the
+dome sphere for whole arrays of telescope positions at once, and gives how
+far the dome may be from that azimuth before the beam touches a slit edge.
+
+Rather than following every change of the required azimuth, the planner
+looks ahead along the telescope's tracking path.  Each predicted position
+allows the dome a window of azimuths; the dome is left alone until the
+window is about to exclude it, and is then sent to the azimuth that stays
+inside the windows for the longest time ahead.  For sidereal tracking this
+means a few dome moves per hour, each well before the slit edge reaches the
+beam.
+
+The planning is pure bookkeeping; it is the DomeSubAgent that runs it in a
+background thread and moves the dome.
+"""
+
+# Built-In Libraries
+
+# 3rd Party Libraries
+import numpy as np
+
+# Internal Imports
+from Astronomy.Coordinates import altaz_to_vector
+
+
+class DomeGeometry:
+    """Geometry of the telescope in the dome
+
+    Positions are in meters, from the center of the dome sphere, in a
+    (north, east, up) frame.
+
+    Parameters
+    ----------
+    radius : ``float``
+        Radius of the dome sphere (m)
+    slit_width : ``float``
+        Width of the shutter opening (m)
+    aperture : ``float``
+        Diameter of the telescope beam at the dome (m)
+    mount_offset : ``tuple``, optional
+        Position of the intersection of the mount axes (m, north, east,
+        up).  (Default: (0, 0, 0))
+    axis_offset : ``float``, optional
+        Displacement of the optical axis from the mount's vertical axis
+        along the elevation axis (m, positive to the right seen from
+        behind the telescope).  (Default: 0)
+    """
+
+    def __init__(
+        self,
+        radius,
+        slit_width,
+        aperture,
+        mount_offset=(0.0, 0.0, 0.0),
+        axis_offset=0.0,
+    ):
+        if slit_width <= aperture:
+            raise ValueError("The dome slit must be wider than the telescope beam")
+        self.radius = float(radius)
+        self.slit_width = float(slit_width)
+        self.aperture = float(aperture)
+        self.mount_offset = np.asarray(mount_offset, dtype=float)
+        self.axis_offset = float(axis_offset)
+
+    def beam_intersection(self, alt_degs, az_degs):
+        """Where the optical axis meets the dome
+
+        Parameters
+        ----------
+        alt_degs, az_degs : ``float`` or :obj:`numpy.ndarray`
+            Telescope altitude and azimuth (deg)
+
+        Returns
+        -------
+        :obj:`numpy.ndarray`
+            The (north, east, up) points on the dome sphere (m), stacked
+            along the last axis
+        """
+        direction = altaz_to_vector(alt_degs, az_degs)
+        az = np.radians(az_degs)
+        elevation_axis = np.stack((-np.sin(az), np.cos(az), np.zeros_like(az)), axis=-1)
+        origin = self.mount_offset + self.axis_offset * elevation_axis
+
+        # Solve |origin + t direction| = radius for the positive root
+        b = np.sum(origin * direction, axis=-1)
+        c = np.sum(origin * origin, axis=-1) - self.radius**2
+        t = -b + np.sqrt(b * b - c)
+        return origin + t[..., np.newaxis] * direction
+
+    def dome_azimuth(self, alt_degs, az_degs):
+        """Dome azimuth centering the slit on the beam, and its tolerance
+
+        Parameters
+        ----------
+        alt_degs, az_degs : ``float`` or :obj:`numpy.ndarray`
+            Telescope altitude and azimuth (deg)
+
+        Returns
+        -------
+        ``tuple``
+            The dome azimuth (deg, 0-360) and the largest dome azimuth error
+            (deg) that keeps the beam clear of the slit edges
+        """
+        point = self.beam_intersection(alt_degs, az_degs)
+        azimuth = np.degrees(np.arctan2(point[..., 1], point[..., 0])) % 360.0
+
+        # The beam is clear while its distance from the plane of the slit,
+        #  rho * sin(error), is less than (slit_width - aperture) / 2
+        rho = np.hypot(point[..., 0], point[..., 1])
+        ratio = 0.5 * (self.slit_width - self.aperture) / np.maximum(rho, 1e-9)
+        tolerance = np.degrees(np.arcsin(np.minimum(ratio, 1.0)))
+        return azimuth, tolerance
+
+
+def plan_dome_move(times, azimuth, tolerance, dome_azimuth, margin=1.0):
+    """Decide when the dome must move along a predicted path, and where to
+
+    Parameters
+    ----------
+    times : :obj:`numpy.ndarray`
+        Times of the predicted positions (s from now, increasing, from 0)
+    azimuth, tolerance : :obj:`numpy.ndarray`
+        Required dome azimuth and its tolerance at those times (deg), from
+        :meth:`DomeGeometry.dome_azimuth`
+    dome_azimuth : ``float``
+        Present (or commanded) dome azimuth (deg)
+    margin : ``float``, optional
+        Part of the tolerance kept in reserve (deg).  (Default: 1.0)
+
+    Returns
+    -------
+    ``tuple``
+        The time (s from now) at which the dome would leave the allowed
+        window (``None`` if not within the predicted times), the azimuth to
+        move to (deg, 0-360), and the time (s from now) that azimuth keeps
+        the beam clear for
+    """
+    # Unwrap the path and express the dome position on the same branch
+    path = np.degrees(np.unwrap(np.radians(azimuth)))
+    window = np.maximum(np.asarray(tolerance) - margin, 0.0)
+    dome = path[0] + (dome_azimuth - path[0] + 180.0) % 360.0 - 180.0
+
+    outside = np.abs(dome - path) > window
+    leave = times[np.argmax(outside)] if outside.any() else None
+
+    # The target must lie in every window up to the last time it can: the
+    #  intersection of the windows [path - window, path + window] so far
+    low = np.maximum.accumulate(path - window)
+    high = np.minimum.accumulate(path + window)
+    last = np.count_nonzero(low <= high) - 1
+    target = 0.5 * (low[last] + high[last])
+    return leave, target % 360.0, float(times[last])
@@ -25,12 +25,15 @@ The Lorax Dome API is as follows:
         Disconnect from the dome
     status
         Broadcast the current status of the dome
+    history
+        Broadcast the telemetry history of a status field
     home
         Home the dome
     move
         Move the dome to a specified azimuth
     track_mount
-        Track the mount in azimuth
+        Keep the slit on the telescope, moving the dome only when the slit
+        edge is about to reach the beam
     stop_tracking
         Stop tracking the mount and stay in this position
     open_shutter
@@ -38,17 +41,32 @@ The Lorax Dome API is as follows:
     close_shutter
         Close the dome shutter
 
+Mount tracking (``track_mount``) follows the SubAgent named by
+``dome_mount_agent`` in the same CompositeAgent (default ``mount``), which
+must provide ``mount_pointing()``.  The dome geometry comes from the
+configuration: ``dome_radius``, ``dome_slit_width``, ``telescope_aperture``
+(m), ``mount_offset`` ([north, east, up] m from the dome center) and
+``mount_axis_offset`` (m), with ``site_latitude`` and ``site_longitude``
+(deg); and the planning from ``dome_slit_margin`` (deg),
+``dome_lookahead`` and ``dome_lookahead_step`` (s), ``dome_lead_time`` (s),
+``dome_speed`` (deg/s) and ``dome_track_interval`` (s).
+
 """
 
 # Built-In Libraries
 from abc import abstractmethod
+import threading
+import time
 import warnings
 
 # 3rd Party Libraries
+import numpy as np
 
 # Internal Imports
+from AbstractAgents.DomeSlaving import DomeGeometry, plan_dome_move
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from Astronomy.Coordinates import julian_date, radec_to_altaz
+from CommandLanguage.command_registry import CommandRegistry
 
 
 class DomeSubAgent(SubAgent):
@@ -81,12 +99,25 @@ class DomeSubAgent(SubAgent):
         self.dome = None
         self.device_dome = None
 
+        # Mount tracking state
+        self.tracking_thread = None
+        self.tracking_stop = threading.Event()
+        self.tracking_status = {}
+        self.dome_target = None
+        self.dome_lock = threading.Lock()
+        self.geometry = None
+        self.slew_start = None
+
+    commands = CommandRegistry("dome", parent=SubAgent.commands)
+    commands.placeholder("home", "move", "open_shutter", "close_shutter")
+
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the DomeSubAgent.  Incoming
-        messages are compared against the command list, and the proper method
-        is called.  Some of the API commands are general to all Dome Agents
+        messages are looked up in the ``commands`` registry, their arguments
+        are checked against the command's schema, and the proper method is
+        called.  Some of the API commands are general to all Dome Agents
         and are fully implemented here; others are hardware-specific and are
         left as abstract methods for later implementation.
 
@@ -97,53 +128,25 @@ class DomeSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in DomeSubAgent: {message}")
-
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        if command == "init":
-            print("Connecting to the dome...")
-            self.connect_to_dome()
-
-        elif command == "disconnect":
-            print("Disconnecting from dome...")
-            self.disconnect_from_dome()
-
-        elif command == "status":
-            # print("doing status")
-            self.get_status_and_broadcast()
-
-        elif command == "home":
-            # send dome home.
-            # send "wait" to DTO.
-            # send specific command, "home", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("dome: home")
-
-        elif command == "move":
-            # send dome to specific position.
-            # check arguments against position limits.
-            # send "wait" to DTO.
-            # send specific command, "movoto x", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("dome: move")
-
-        elif command == "track_mount":
-            print("dome: track_mount (no effect)")
-
-        elif command == "stop_tracking":
-            print("dome: stop_tracking (no effect)")
-
-        elif command == "open_shutter":
-            print("dome: open_shutter (no effect)")
-
-        elif command == "close_shutter":
-            print("dome: close_shutter (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+        self.dispatch_command(message)
+
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the dome"""
+        print("Connecting to the dome...")
+        self.connect_to_dome()
+
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the dome"""
+        print("Disconnecting from dome...")
+        self.stop_tracking()
+        self.disconnect_from_dome()
+
+    @commands.command("status")
+    def cmd_status(self):
+        """Broadcast the current status of the dome"""
+        self.get_status_and_broadcast()
 
     def get_status_and_broadcast(self):
         """Get the current dome status and broadcast it
@@ -152,6 +155,9 @@ class DomeSubAgent(SubAgent):
         """
         # Check if the cooler is connected; get status or set empty dictionary
         device_status = self.device_status if self.check_dome_connection() else {}
+        # Include the mount tracking state, if tracking has been run
+        if device_status:
+            device_status = {**device_status, **self.tracking_status}
         # Broadcast
         self.broadcast_status(device_status)
 
@@ -168,6 +174,281 @@ class DomeSubAgent(SubAgent):
         print("Warning: Dome must be connected first (dome : connect_to_dome)")
         return False
 
+    @commands.command("track_mount")
+    def start_tracking(self):
+        """Start tracking the mount in a background thread
+
+        Any tracking already in progress is stopped first.
+        """
+        if not self.check_dome_connection():
+            self.reply_to_dto("ERROR: The dome is not connected")
+            return
+        self.stop_tracking()
+
+        mount = self.peers.get(self.config.get("dome_mount_agent", "mount"))
+        if mount is None:
+            warnings.warn("Dome tracking needs the mount in the same CompositeAgent")
+            self.reply_to_dto("ERROR: No mount to track in this CompositeAgent")
+            return
+        try:
+            geometry = self.dome_geometry()
+        except (KeyError, ValueError) as err:
+            warnings.warn(f"Dome geometry not usable: {err}")
+            self.reply_to_dto(f"ERROR: Dome geometry not usable: {err}")
+            return
+
+        print("Dome tracking the mount")
+        self.tracking_stop.clear()
+        self.tracking_thread = threading.Thread(
+            target=self.run_tracking, args=(mount, geometry), daemon=True
+        )
+        self.tracking_thread.start()
+
+    def dome_geometry(self):
+        """The telescope and dome geometry, from the configuration
+
+        Returns
+        -------
+        :class:`~AbstractAgents.DomeSlaving.DomeGeometry`
+            The geometry
+        """
+        if self.geometry is None:
+            self.geometry = DomeGeometry(
+                self.config["dome_radius"],
+                self.config["dome_slit_width"],
+                self.config["telescope_aperture"],
+                self.config.get("mount_offset", (0.0, 0.0, 0.0)),
+                self.config.get("mount_axis_offset", 0.0),
+            )
+        return self.geometry
+
+    def lookahead_times(self):
+        """Times (s from now) at which the telescope path is predicted"""
+        return np.arange(
+            0.0,
+            self.config.get("dome_lookahead", 7200.0),
+            self.config.get("dome_lookahead_step", 30.0),
+        )
+
+    @commands.command("stop_tracking")
+    def stop_tracking(self):
+        """Stop any mount tracking, leaving the dome where it is"""
+        if self.tracking_thread and self.tracking_thread.is_alive():
+            print("Stopping dome tracking...")
+            self.tracking_stop.set()
+            self.tracking_thread.join()
+        self.tracking_thread = None
+        self.dome_target = None
+        if self.tracking_status:
+            self.tracking_status["DOME_TRACKING"] = False
+
+    def predict_path(self, pointing, times):
+        """Telescope altitude and azimuth at times ahead (s from now)
+
+        A tracking telescope follows its RA/Dec; the predicted path is
+        anchored to the mount's reported altitude and azimuth, so that
+        precession and refraction (ignored in the prediction) cancel.
+        Otherwise the telescope is taken to stay where it is.
+
+        Parameters
+        ----------
+        pointing : ``dict``
+            The mount's ``mount_pointing()``
+        times : :obj:`numpy.ndarray`
+            Times to predict (s from now, starting at 0)
+
+        Returns
+        -------
+        ``tuple``
+            Altitudes and azimuths (deg)
+        """
+        alt = np.full(len(times), float(pointing["alt_degs"]))
+        az = np.full(len(times), float(pointing["az_degs"]))
+        if not pointing["is_tracking"]:
+            return alt, az
+
+        model_alt, model_az = radec_to_altaz(
+            pointing["ra_j2000_hours"],
+            pointing["dec_j2000_degs"],
+            julian_date() + times / 86400.0,
+            self.config["site_latitude"],
+            self.config["site_longitude"],
+        )
+        alt += model_alt - model_alt[0]
+        az += (model_az - model_az[0] + 180.0) % 360.0 - 180.0
+        return np.clip(alt, -90.0, 90.0), az % 360.0
+
+    def run_tracking(self, mount, geometry):
+        """Keep the slit on the telescope
+
+        This is the body of the dome tracking thread.  Every
+        ``dome_track_interval`` seconds the telescope's path is predicted
+        ``dome_lookahead`` seconds ahead and the dome is moved only if the
+        beam would otherwise come within ``dome_slit_margin`` of a slit edge
+        before the dome could get there.
+
+        Parameters
+        ----------
+        mount : :class:`~AbstractAgents.SubAgent.SubAgent`
+            The mount SubAgent
+        geometry : :class:`~AbstractAgents.DomeSlaving.DomeGeometry`
+            The telescope and dome geometry
+        """
+        interval = self.config.get("dome_track_interval", 10.0)
+        margin = self.config.get("dome_slit_margin", 1.0)
+        lead_time = self.config.get("dome_lead_time", 30.0)
+        speed = self.config.get("dome_speed", 3.0)
+        times = self.lookahead_times()
+        moves = 0
+
+        while not self.tracking_stop.is_set():
+            fetched = time.monotonic()
+            try:
+                pointing = mount.mount_pointing()
+            except Exception as err:
+                # Keep tracking through a missed mount status
+                warnings.warn(f"Dome tracking could not get the mount position: {err}")
+                pointing = None
+
+            if pointing is None or pointing["is_slewing"]:
+                self.tracking_stop.wait(interval)
+                continue
+
+            alt, az = self.predict_path(pointing, times)
+            azimuth, tolerance = geometry.dome_azimuth(alt, az)
+            with self.dome_lock:
+                # A coordinated slew started since has moved the dome already
+                if self.slew_start is not None and self.slew_start > fetched:
+                    continue
+                if self.dome_target is None:
+                    self.dome_target = self.get_azimuth()
+                leave, target, hold = plan_dome_move(
+                    times, azimuth, tolerance, self.dome_target, margin
+                )
+
+                # Move if the dome could not get there before the beam reaches
+                #  the slit margin
+                distance = abs((target - self.dome_target + 180.0) % 360.0 - 180.0)
+                if (
+                    leave is not None
+                    and leave <= lead_time + distance / speed + interval
+                ):
+                    self.move(target)
+                    self.dome_target = target
+                    moves += 1
+                    print(
+                        f"Dome to {target:.1f}º (clear for {hold / 60:.0f} min, "
+                        f"{moves} moves)"
+                    )
+                    leave, _, _ = plan_dome_move(
+                        times, azimuth, tolerance, self.dome_target, margin
+                    )
+
+                self.tracking_status = {
+                    "DOME_TRACKING": True,
+                    "DOME_TARGET": self.dome_target,
+                    "DOME_REQUIRED_AZ": float(azimuth[0]),
+                    "DOME_NEXT_MOVE": leave,
+                    "DOME_MOVES": moves,
+                }
+
+            self.tracking_stop.wait(interval)
+
+    def start_slew(self, alt, az, ra_j2000_hours=None, dec_j2000_degs=None):
+        """Start moving the dome for a telescope slew
+
+        Called by the mount agent as it starts a slew, so that the dome moves
+        at the same time as the mount.  The dome is sent to the azimuth
+        needed at the telescope's final position; for a slew to RA/Dec, the
+        azimuth chosen also keeps the beam clear for as long as possible as
+        the telescope tracks from there.  This method returns at once; see
+        :meth:`wait_for_slew`.
+
+        Parameters
+        ----------
+        alt, az : ``float``
+            The telescope's final altitude and azimuth (deg)
+        ra_j2000_hours, dec_j2000_degs : ``float``, optional
+            The RA/Dec the telescope will track, if any.  (Default: None)
+
+        Returns
+        -------
+        ``float``
+            The dome azimuth commanded (deg), or ``None`` if the dome could
+            not be moved
+        """
+        if not self.check_dome_connection():
+            return None
+        try:
+            geometry = self.dome_geometry()
+        except (KeyError, ValueError) as err:
+            warnings.warn(f"Dome geometry not usable: {err}")
+            return None
+
+        pointing = {
+            "alt_degs": alt,
+            "az_degs": az,
+            "ra_j2000_hours": ra_j2000_hours,
+            "dec_j2000_degs": dec_j2000_degs,
+            "is_tracking": ra_j2000_hours is not None,
+        }
+        with self.dome_lock:
+            times = self.lookahead_times()
+            azimuth, tolerance = geometry.dome_azimuth(
+                *self.predict_path(pointing, times)
+            )
+            _, target, _ = plan_dome_move(
+                times,
+                azimuth,
+                tolerance,
+                azimuth[0],
+                self.config.get("dome_slit_margin", 1.0),
+            )
+            self.move(target)
+            self.dome_target = target
+            self.slew_start = time.monotonic()
+        print(f"Dome slewing to {target:.1f}º")
+        return target
+
+    def wait_for_slew(self, timeout=None):
+        """Wait for the dome to reach the azimuth of the last slew
+
+        The dome has arrived when it is within ``dome_settle_tolerance``
+        (deg, default 0.5) of its target; it is polled every
+        ``dome_poll_interval`` seconds (default 0.5).
+
+        Parameters
+        ----------
+        timeout : ``float``, optional
+            Longest time to wait (s); by default ``dome_slew_timeout``
+            (default 300).  (Default: None)
+
+        Returns
+        -------
+        ``float``
+            Time from the start of the dome slew to its arrival (s), or
+            ``None`` if it did not arrive in time
+        """
+        if self.dome_target is None or self.slew_start is None:
+            return None
+        timeout = (
+            self.config.get("dome_slew_timeout", 300.0) if timeout is None else timeout
+        )
+        settle_tolerance = self.config.get("dome_settle_tolerance", 0.5)
+        poll = self.config.get("dome_poll_interval", 0.5)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            error = (self.get_azimuth() - self.dome_target + 180.0) % 360.0 - 180.0
+            if abs(error) <= settle_tolerance:
+                return time.monotonic() - self.slew_start
+            if time.monotonic() >= deadline:
+                warnings.warn(
+                    f"Dome did not reach {self.dome_target:.1f}º in {timeout:.0f} s"
+                )
+                return None
+            time.sleep(poll)
+
     @abstractmethod
     def connect_to_dome(self):
         """Connect to dome
@@ -195,3 +476,10 @@ class DomeSubAgent(SubAgent):
 
         Must be implemented by hardware-specific Agent
         """
+
+    @abstractmethod
+    def get_azimuth(self):
+        """Get the present dome azimuth (deg)
+
+        Must be implemented by hardware-specific Agent
+        """
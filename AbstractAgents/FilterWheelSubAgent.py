@@ -25,22 +25,24 @@ The Lorax Filter Wheel API is as follows:
         Disconnect from the filter wheel
     status
         Broadcast the current status of the filter wheel
+    history
+        Broadcast the telemetry history of a status field
     home
         Home the filter wheel
     move
-        Move the filter wheel to a specified slot
+        Move the filter wheel to a specified slot number or filter name
 
 """
 
 # Built-In Libraries
 from abc import abstractmethod
-import warnings
+import threading
 
 # 3rd Party Libraries
 
 # Internal Imports
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import Arg, CommandRegistry
 
 
 class FilterWheelSubAgent(SubAgent):
@@ -73,14 +75,24 @@ class FilterWheelSubAgent(SubAgent):
         self.filterwheel = None
         self.device_filterwheel = None
 
+        # Cleared while a move is in progress, so that other SubAgents (`e.g.`,
+        #   a camera running a filter sequence) can wait on it; why the last
+        #   move failed, or None if it succeeded
+        self.move_complete = threading.Event()
+        self.move_complete.set()
+        self.move_error = None
+
+    commands = CommandRegistry("filterwheel", parent=SubAgent.commands)
+
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the FilterWheelSubAgent.  Incoming
-        messages are compared against the command list, and the proper method
-        is called.  Some of the API commands are general to all Filter Wheel
-        Agents and are fully implemented here; others are hardware-specific and
-        are left as abstract methods for later implementation.
+        messages are looked up in the ``commands`` registry, their arguments
+        are checked against the command's schema, and the proper method is
+        called.  Some of the API commands are general to all Filter Wheel Agents
+        and are fully implemented here; others are hardware-specific and are
+        left as abstract methods for later implementation.
 
         Parameters
         ----------
@@ -89,41 +101,36 @@ class FilterWheelSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in FilterWheelSubAgent: {message}")
-
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        if command == "init":
-            print("Connecting to the filter wheel...")
-            self.connect_to_filterwheel()
-
-        elif command == "disconnect":
-            print("Disconnecting from filter wheel...")
-            self.disconnect_from_filterwheel()
-
-        elif command == "status":
-            # print("doing status")
-            self.get_status_and_broadcast()
-
-        elif command == "home":
-            # send wheel home.
-            # send "wait" to DTO.
-            # send specific command, "home", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("filter wheel: home (no effect)")
-
-        elif command == "move":
-            # send wheel to specific position.
-            # check arguments against position limits.
-            # send "wait" to DTO.
-            # send specific command, "movoto x", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("filter wheel: move (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+        self.dispatch_command(message)
+
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the filter wheel"""
+        print("Connecting to the filter wheel...")
+        self.connect_to_filterwheel()
+
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the filter wheel"""
+        print("Disconnecting from filter wheel...")
+        self.disconnect_from_filterwheel()
+
+    @commands.command("status")
+    def cmd_status(self):
+        """Broadcast the current status of the filter wheel"""
+        self.get_status_and_broadcast()
+
+    @commands.command("home")
+    def cmd_home(self):
+        """Home the filter wheel"""
+        # Call hardware-specific method
+        self.home()
+
+    @commands.command("move", Arg("position", None))
+    def cmd_move(self, position):
+        """Move the filter wheel to a slot number or filter name"""
+        # Call hardware-specific method (sends "WAIT" and "GO" to the DTO)
+        self.move(position)
 
     def get_status_and_broadcast(self):
         """Get the current filter wheel status and broadcast it
@@ -179,4 +186,29 @@ class FilterWheelSubAgent(SubAgent):
         """Move the filter wheel
 
         Must be implemented by hardware-specific Agent
+
+        ``slot`` may be a slot number or a filter name.  The DTO should be
+        sent "WAIT" when the move starts and "GO" when it completes, and
+        ``self.move_complete`` cleared and set to match.  If the move cannot
+        be made or fails, the reason is put in ``self.move_error``.
+
+        Returns
+        -------
+        ``bool``
+            Whether the move was started
+        """
+
+    @abstractmethod
+    def start_move(self, slot):
+        """Start a move of the filter wheel for another SubAgent
+
+        Must be implemented by hardware-specific Agent
+
+        As :meth:`move`, but the DTO is sent no replies: the caller waits on
+        ``self.move_complete`` and reports ``self.move_error`` itself.
+
+        Returns
+        -------
+        ``str``
+            Why the move cannot be made, or ``None`` if it was started
         """
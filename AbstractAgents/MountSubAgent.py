@@ -25,6 +25,8 @@ The Lorax Mount API is as follows:
         Disconnect from the mount
     status
         Broadcast the current status of the mount
+    history
+        Broadcast the telemetry history of a status field
     park
         Park the mount
     stop
@@ -33,26 +35,34 @@ The Lorax Mount API is as follows:
         Track the telescope at the sidereal rate
     track_ephemeris
         Track the telescope according to the supplied ephemeris
+    track_tle
+        Placeholder, no effect yet; the PlaneWave mount agent follows a
+        satellite from its two-line elements with ``trackTle``
     goto_ra_dec_apparent
         Go to apparent RA/Dec location
-    goto_ra_dec_j2000    
+    goto_ra_dec_j2000
         Go to the J2000 RA/Dec location
     goto_alt_az
         Go to the ALT/AZ location
     offset
         Apply the specified offset
+    acquire
+        Placeholder, no effect yet; the PlaneWave mount agent searches a
+        spiral with the camera and centers the target with ``acquireTarget``
+
+Mount agents also provide :meth:`MountSubAgent.mount_pointing`, which other
+SubAgents in the CompositeAgent (`e.g.`, the dome) use to follow the mount.
 
 """
 
 # Built-In Libraries
 from abc import abstractmethod
-import warnings
 
 # 3rd Party Libraries
 
 # Internal Imports
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import CommandRegistry
 
 
 class MountSubAgent(SubAgent):
@@ -85,12 +95,28 @@ class MountSubAgent(SubAgent):
         self.mount = None
         self.device_mount = None
 
+    commands = CommandRegistry("mount", parent=SubAgent.commands)
+    commands.placeholder(
+        "park",
+        "move",
+        "stop",
+        "track_sidereal",
+        "track_ephemeris",
+        "track_tle",
+        "goto_ra_dec_apparent",
+        "goto_ra_dec_j2000",
+        "goto_alt_az",
+        "offset",
+        "acquire",
+    )
+
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the MountSubAgent.  Incoming
-        messages are compared against the command list, and the proper method
-        is called.  Some of the API commands are general to all Mount Agents
+        messages are looked up in the ``commands`` registry, their arguments
+        are checked against the command's schema, and the proper method is
+        called.  Some of the API commands are general to all Mount Agents
         and are fully implemented here; others are hardware-specific and are
         left as abstract methods for later implementation.
 
@@ -101,58 +127,19 @@ class MountSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in MountSubAgent: {message}")
+        self.dispatch_command(message)
 
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        if command == "init":
-            print("Connecting to the mount...")
-            self.connect_to_mount()
-
-        elif command == "disconnect":
-            print("Disconnecting from mount...")
-            self.disconnect_from_mount()
-
-        elif command == "park":
-            # send mount to the park.
-            # send "wait" to DTO.
-            # send specific command, "park", to mount
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("mount: park (no effect)")
-
-        elif command == "move":
-            # send mount to specific position.
-            # check arguments against position limits.
-            # send "wait" to DTO.
-            # send specific command, "movoto x", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("mount: move")
-
-        elif command == "stop":
-            print("mount: stop (no effect)")
-
-        elif command == "track_sidereal":
-            print("mount: track_sidereal (no effect)")
-
-        elif command == "track_ephemeris":
-            print("mount: track_ephemeris (no effect)")
-
-        elif command == "goto_ra_dec_apparent":
-            print("mount: goto_ra_dec_apparent (no effect)")
-
-        elif command == "goto_ra_dec_j2000":
-            print("mount: goto_ra_dec_j2000 (no effect)")
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the mount"""
+        print("Connecting to the mount...")
+        self.connect_to_mount()
 
-        elif command == "goto_alt_az":
-            print("mount: goto_alt_az (no effect)")
-
-        elif command == "offset":
-            print("mount: offset (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the mount"""
+        print("Disconnecting from mount...")
+        self.disconnect_from_mount()
 
     def get_status_and_broadcast(self):
         """Get the current mount status and broadcast it
@@ -191,6 +178,19 @@ class MountSubAgent(SubAgent):
         Must be implemented by hardware-specific Agent
         """
 
+    @abstractmethod
+    def mount_pointing(self):
+        """Where the telescope points and whether it is moving
+
+        Must be implemented by hardware-specific Agent
+
+        Returns
+        -------
+        ``dict``
+            ``alt_degs``, ``az_degs``, ``ra_j2000_hours``, ``dec_j2000_degs``,
+            ``is_tracking`` and ``is_slewing``
+        """
+
     @abstractmethod
     def park(self):
         """Park the mount
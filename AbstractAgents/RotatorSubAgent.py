@@ -25,6 +25,8 @@ The Lorax Rotator API is as follows:
         Disconnect from the rotator
     status
         Broadcast the current status of the rotator
+    history
+        Broadcast the telemetry history of a status field
     home
         Home the rotator
     stop
@@ -40,13 +42,12 @@ The Lorax Rotator API is as follows:
 
 # Built-In Libraries
 from abc import abstractmethod
-import warnings
 
 # 3rd Party Libraries
 
 # Internal Imports
 from AbstractAgents.SubAgent import SubAgent
-from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import CommandRegistry
 
 
 class RotatorSubAgent(SubAgent):
@@ -78,12 +79,16 @@ class RotatorSubAgent(SubAgent):
         self.rotator = None
         self.device_rotator = None
 
+    commands = CommandRegistry("rotator", parent=SubAgent.commands)
+    commands.placeholder("home", "stop", "goto_field", "goto_mech", "offset")
+
     def handle_message(self, message):
         """Handle an incoming message
 
         This method contains the API for the RotatorSubAgent.  Incoming
-        messages are compared against the command list, and the proper method
-        is called.  Some of the API commands are general to all Rotator Agents
+        messages are looked up in the ``commands`` registry, their arguments
+        are checked against the command's schema, and the proper method is
+        called.  Some of the API commands are general to all Rotator Agents
         and are fully implemented here; others are hardware-specific and are
         left as abstract methods for later implementation.
 
@@ -94,40 +99,19 @@ class RotatorSubAgent(SubAgent):
             Composite Agent.
         """
         print(f"\nReceived message in RotatorSubAgent: {message}")
-
-        # Parse out the message
-        command, arguments = parse_dscl.parse_command(message)
-
-        if command == "init":
-            print("Connecting to the rotator...")
-            self.connect_to_rotator()
-
-        elif command == "disconnect":
-            print("Disconnecting from rotator...")
-            self.disconnect_from_rotator()
-
-        elif command == "home":
-            # send mount home.
-            # send "wait" to DTO.
-            # send specific command, "home", to filter wheel
-            # keep checking status until done.
-            # send "go" command to DTO.
-            print("rotator: home (no effect)")
-
-        elif command == "stop":
-            print("rotator: stop (no effect)")
-
-        elif command == "goto_field":
-            print("rotator: goto_field (no effect)")
-
-        elif command == "goto_mech":
-            print("rotator: goto_mech (no effect)")
-
-        elif command == "offset":
-            print("rotator: offset (no effect)")
-
-        else:
-            warnings.warn(f"Unknown command: {command}")
+        self.dispatch_command(message)
+
+    @commands.command("init")
+    def cmd_init(self):
+        """Initialize and connect to the rotator"""
+        print("Connecting to the rotator...")
+        self.connect_to_rotator()
+
+    @commands.command("disconnect")
+    def cmd_disconnect(self):
+        """Disconnect from the rotator"""
+        print("Disconnecting from rotator...")
+        self.disconnect_from_rotator()
 
     def get_status_and_broadcast(self):
         """Get the current rotator status and broadcast it
@@ -3,13 +3,19 @@ Created on Sept. 19, 2022
 @author: dlytle
 
 """
+
 from abc import ABC, abstractmethod
 import datetime
 import uuid
+import warnings
 
 import xmltodict
 import yaml
 
+from AbstractAgents.TelemetryHistory import TelemetryHistory
+from CommandLanguage.command_registry import Arg, CommandError, CommandRegistry
+
+
 # General Sub-Agent class, inherit from Abstract Base Class
 class SubAgent(ABC):
     """SubAgent
@@ -17,12 +23,33 @@ class SubAgent(ABC):
     _extended_summary_
     """
 
+    # The commands every SubAgent accepts; each SubAgent class extends this
+    commands = CommandRegistry("agent")
+
+    # STOMP header the DTO tags each command with, echoed in the replies
+    correlation_header = "correlation-id"
+
     def __init__(self, logger, conn, config):
         # print(config)
         self.logger = logger
         self.conn = conn
         self.config = config
 
+        # The other SubAgents of the CompositeAgent, by configuration name
+        self.peers = {}
+
+        # The correlation ID of the command being handled, and the last
+        #  reply sent for it
+        self.correlation_id = None
+        self.command_reply = None
+
+        # Fixed-memory history of the numeric status fields
+        self.history = TelemetryHistory(
+            config.get("history_length", 3600),
+            config.get("history_decimation", 10),
+            config.get("history_tiers", 3),
+        )
+
     @abstractmethod
     def get_status_and_broadcast(self):
         """Get hardware status and broadcast on the broker
@@ -37,6 +64,95 @@ class SubAgent(ABC):
         Must be implemented by inheriting class.
         """
 
+    def dispatch_command(self, message):
+        """Run a message through this SubAgent's command registry
+
+        The command is looked up in the class's ``commands`` registry, its
+        arguments are checked and converted against the command's schema, and
+        its handler is called.  Unknown commands and bad arguments are
+        reported with a warning.
+
+        Parameters
+        ----------
+        message : str
+            The incoming message from the broker
+        """
+        try:
+            return self.commands.dispatch(self, message)
+        except CommandError as err:
+            warnings.warn(str(err))
+            self.reply_to_dto(f"ERROR: {err}")
+            return None
+
+    def start_command(self, correlation_id):
+        """Note the correlation ID of the command about to be handled
+
+        Parameters
+        ----------
+        correlation_id : str
+            The ``correlation-id`` header of the command, or ``None`` if the
+            sender did not tag it
+        """
+        self.correlation_id = correlation_id
+        self.command_reply = None
+
+    def reply_to_dto(self, body, correlation_id=None):
+        """Send the DTO a "WAIT", "GO" or "ERROR: ..." reply
+
+        "WAIT" tells the DTO the command continues after :meth:`handle_message`
+        returns; "GO" (or an error) that the command is finished.  The reply
+        carries the command's correlation ID, so the DTO can match it to the
+        command it sent.
+
+        Parameters
+        ----------
+        body : str
+            The reply
+        correlation_id : str, optional
+            ID of the command replied to; a command that continues in a
+            background thread must use :meth:`reply_from_thread` instead.
+            (Default: the command being handled)
+        """
+        if correlation_id is None:
+            correlation_id = self.correlation_id
+        self.reply_from_thread(body, correlation_id)
+
+    def reply_from_thread(self, body, correlation_id):
+        """Send the reply to a command that continues in a background thread
+
+        Unlike :meth:`reply_to_dto`, an untagged command's reply is sent
+        untagged, rather than under the ID of whatever command is being
+        handled when the thread finishes.
+
+        Parameters
+        ----------
+        body : str
+            The reply
+        correlation_id : str
+            ID of the command replied to, as noted when it was started, or
+            ``None`` if the sender did not tag it
+        """
+        if correlation_id is not None and correlation_id == self.correlation_id:
+            self.command_reply = body
+        headers = {}
+        if correlation_id is not None:
+            headers[self.correlation_header] = correlation_id
+        self.conn.send(
+            body=body,
+            destination="/topic/" + self.config["dto_command_topic"],
+            headers=headers,
+        )
+
+    def finish_command(self):
+        """Reply "GO" for a command that is finished without having said so
+
+        Called once :meth:`handle_message` has returned.  Commands that replied
+        "WAIT" send their own "GO" when they are done.
+        """
+        if self.correlation_id is not None and self.command_reply is None:
+            self.reply_to_dto("GO")
+        self.correlation_id = None
+
     def broadcast_status(self, device_status):
         """Broadcast the status packet from the device
 
@@ -59,6 +175,9 @@ class SubAgent(ABC):
         if not isinstance(device_status, dict):
             raise TypeError("`device_status` must be a dictionary")
 
+        # Keep the numeric fields for the ``history`` command
+        self.history.record(device_status)
+
         # Build the XML Status Packet
         status = {
             "message_id": uuid.uuid4(),
@@ -73,3 +192,42 @@ class SubAgent(ABC):
             body=xml_format,
             destination="/topic/" + self.config["outgoing_topic"],
         )
+
+    @commands.command("history", Arg("field", str, None), Arg("seconds", float, None))
+    def broadcast_history(self, field=None, seconds=None):
+        """Broadcast the telemetry history of a status field
+
+        This method is common to all SubAgents and implements the ``history``
+        command.  With no arguments, the list of fields with history is
+        broadcast.  The history goes to the ``outgoing_topic`` status topic,
+        or the ``broadcast_topic`` of agents that name theirs so.
+
+        Parameters
+        ----------
+        field : str, optional
+            The status field wanted
+        seconds : float, optional
+            How many seconds of history are wanted (all that is kept if not
+            given)
+        """
+        if field is None:
+            history = {"fields": sorted(self.history.fields)}
+        else:
+            history = self.history.query(field, seconds)
+            if history is None:
+                warnings.warn(f"No history for status field: {field}")
+                self.reply_to_dto(f"ERROR: No history for status field: {field}")
+                return
+
+        # Build the XML History Packet
+        packet = {
+            "message_id": uuid.uuid4(),
+            "timestamput": datetime.datetime.utcnow(),
+            "sender": self.__class__.__name__,
+            "history": history,
+        }
+        xml_format = xmltodict.unparse({"root": packet}, pretty=True)
+
+        # Broadcast
+        topic = self.config.get("outgoing_topic", self.config.get("broadcast_topic"))
+        self.conn.send(body=xml_format, destination="/topic/" + topic)
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax In-Process Telemetry History
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Each SubAgent keeps a short history of every numeric field in its
+``device_status`` dictionary, so that diagnostics can plot the last few hours
+of (`e.g.`) cooler temperature or mount altitude without a database.
+
+Memory use is fixed: each field owns a set of preallocated ring buffers
+(``array.array`` of doubles).  Tier 0 holds the raw samples; each successive
+tier holds the min / max envelope of ``decimation`` samples from the tier
+below it, so with the defaults (3600 samples, decimation 10, 3 tiers) and a
+0.5 s status cadence the tiers cover roughly 30 minutes, 5 hours and 50
+hours.
+"""
+
+# Built-In Libraries
+import array
+import numbers
+import threading
+import time
+
+# 3rd Party Libraries
+
+# Internal Imports
+
+
+class RingBuffer:
+    """Fixed-length ring buffer of ``(time, min, max)`` samples
+
+    Parameters
+    ----------
+    length : ``int``
+        Number of samples held before the oldest is overwritten
+    minmax : ``bool``, optional
+        Store a separate maximum for each sample; if ``False`` the minimum and
+        maximum share storage (raw samples).  (Default: True)
+    """
+
+    def __init__(self, length, minmax=True):
+        self.length = length
+        self.times = array.array("d", bytes(8 * length))
+        self.lows = array.array("d", bytes(8 * length))
+        self.highs = array.array("d", bytes(8 * length)) if minmax else self.lows
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp, low, high):
+        """Add a sample, overwriting the oldest if the buffer is full
+
+        Parameters
+        ----------
+        timestamp : ``float``
+            Unix time of the sample
+        low : ``float``
+            Minimum value over the sample interval
+        high : ``float``
+            Maximum value over the sample interval
+        """
+        self.times[self.head] = timestamp
+        self.lows[self.head] = low
+        self.highs[self.head] = high
+        self.head = (self.head + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+
+    @property
+    def oldest(self):
+        """Timestamp of the oldest sample held (``None`` if empty)"""
+        if not self.count:
+            return None
+        return self.times[(self.head - self.count) % self.length]
+
+    def snapshot(self, since=None):
+        """Return the samples in time order
+
+        Parameters
+        ----------
+        since : ``float``, optional
+            Only return samples at or after this Unix time.  (Default: None)
+
+        Returns
+        -------
+        ``tuple``
+            Lists of times, minima, and maxima
+        """
+        start = (self.head - self.count) % self.length
+        order = [(start + k) % self.length for k in range(self.count)]
+        if since is not None:
+            order = [i for i in order if self.times[i] >= since]
+        return (
+            [self.times[i] for i in order],
+            [self.lows[i] for i in order],
+            [self.highs[i] for i in order],
+        )
+
+
+class FieldHistory:
+    """History of a single numeric status field, with downsampling tiers
+
+    Parameters
+    ----------
+    length : ``int``
+        Number of samples per tier
+    decimation : ``int``
+        Number of samples from one tier combined into one sample of the next
+    n_tiers : ``int``
+        Number of tiers, including the raw tier
+    """
+
+    def __init__(self, length, decimation, n_tiers):
+        self.decimation = decimation
+        self.tiers = [RingBuffer(length, minmax=i > 0) for i in range(n_tiers)]
+        # Partially-accumulated [time, min, max, count] for each coarse tier
+        self.pending = [None] * n_tiers
+
+    def append(self, timestamp, value):
+        """Add a raw sample, cascading into the coarser tiers
+
+        Parameters
+        ----------
+        timestamp : ``float``
+            Unix time of the sample
+        value : ``float``
+            The field value
+        """
+        self.tiers[0].append(timestamp, value, value)
+
+        low = high = value
+        for level in range(1, len(self.tiers)):
+            acc = self.pending[level]
+            if acc is None:
+                acc = self.pending[level] = [timestamp, low, high, 0]
+            acc[1] = min(acc[1], low)
+            acc[2] = max(acc[2], high)
+            acc[3] += 1
+            if acc[3] < self.decimation:
+                break
+            # This bin is full: store it and pass it up to the next tier
+            timestamp, low, high = acc[0], acc[1], acc[2]
+            self.tiers[level].append(timestamp, low, high)
+            self.pending[level] = None
+
+
+class TelemetryHistory:
+    """Fixed-memory telemetry history for all numeric fields of a device
+
+    Parameters
+    ----------
+    length : ``int``, optional
+        Number of samples per tier.  (Default: 3600)
+    decimation : ``int``, optional
+        Downsampling factor between tiers.  (Default: 10)
+    n_tiers : ``int``, optional
+        Number of tiers, including the raw tier.  (Default: 3)
+    """
+
+    def __init__(self, length=3600, decimation=10, n_tiers=3):
+        self.length = int(length)
+        self.decimation = int(decimation)
+        self.n_tiers = int(n_tiers)
+        self.fields = {}
+        # Status updates may arrive on protocol-client threads
+        self.lock = threading.Lock()
+
+    def record(self, device_status, timestamp=None):
+        """Record the numeric values of a status dictionary
+
+        Non-numeric values (including booleans) are ignored.
+
+        Parameters
+        ----------
+        device_status : ``dict``
+            The device status dictionary
+        timestamp : ``float``, optional
+            Unix time of the status; the current time if not given.
+            (Default: None)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            for name, value in device_status.items():
+                if isinstance(value, bool) or not isinstance(value, numbers.Real):
+                    continue
+                if name not in self.fields:
+                    self.fields[name] = FieldHistory(
+                        self.length, self.decimation, self.n_tiers
+                    )
+                self.fields[name].append(timestamp, float(value))
+
+    def query(self, name, seconds=None):
+        """Return the history of one field
+
+        The finest tier that reaches back ``seconds`` is used; if no tier
+        does, the tier reaching furthest back is returned whole.
+
+        Parameters
+        ----------
+        name : ``str``
+            The status field name
+        seconds : ``float``, optional
+            How far back to look; the full raw tier if not given.
+            (Default: None)
+
+        Returns
+        -------
+        ``dict``
+            The field name, tier used, and lists of ``time``, ``min`` and
+            ``max``, or ``None`` if the field has no history
+        """
+        with self.lock:
+            if name not in self.fields:
+                return None
+            tiers = self.fields[name].tiers
+
+            since = None if seconds is None else time.time() - seconds
+            level = 0
+            if since is not None:
+                # Finest tier reaching back far enough, else the longest one
+                spans = [
+                    (tier.oldest, i) for i, tier in enumerate(tiers) if tier.count
+                ]
+                covering = [i for oldest, i in spans if oldest <= since]
+                level = covering[0] if covering else min(spans)[1]
+            times, lows, highs = tiers[level].snapshot(since)
+
+        return {
+            "field": name,
+            "tier": level,
+            "bin_samples": self.decimation**level,
+            "time": times,
+            "min": lows,
+            "max": highs,
+        }
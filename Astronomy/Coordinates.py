@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Coordinate Conversions
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Vectorized conversions between equatorial and horizon coordinates, for
+target selection and planning.  Precession, nutation and refraction are
+ignored (errors up to about half a degree), which is fine for choosing
+targets; the mount control software does the exact conversion when it
+points.
+"""
+
+# Built-In Libraries
+import time
+
+# 3rd Party Libraries
+import numpy as np
+
+# Internal Imports
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def julian_date(unix_time=None):
+    """Julian date (UTC) of a Unix time (now, if not given)"""
+    unix_time = time.time() if unix_time is None else unix_time
+    return unix_time / 86400.0 + UNIX_EPOCH_JD
+
+
+def local_sidereal_time(jd_utc, longitude):
+    """Local mean sidereal time
+
+    Parameters
+    ----------
+    jd_utc : ``float`` or :obj:`numpy.ndarray`
+        Julian date (UTC, taken as UT1)
+    longitude : ``float``
+        Site longitude (deg, east positive)
+
+    Returns
+    -------
+    ``float`` or :obj:`numpy.ndarray`
+        Local sidereal time (deg, 0-360)
+    """
+    gmst = 280.46061837 + 360.98564736629 * (np.asarray(jd_utc) - 2451545.0)
+    return (gmst + longitude) % 360.0
+
+
+def radec_to_altaz(ra_hours, dec_degs, jd_utc, latitude, longitude):
+    """Convert RA/Dec to altitude and azimuth
+
+    Parameters
+    ----------
+    ra_hours, dec_degs : ``float`` or :obj:`numpy.ndarray`
+        Right ascension (hours) and declination (deg)
+    jd_utc : ``float`` or :obj:`numpy.ndarray`
+        Julian date (UTC)
+    latitude, longitude : ``float``
+        Site latitude and east longitude (deg)
+
+    Returns
+    -------
+    ``tuple``
+        Altitude and azimuth (deg, azimuth east of north)
+    """
+    lat = np.radians(latitude)
+    dec = np.radians(dec_degs)
+    hour_angle = np.radians(
+        local_sidereal_time(jd_utc, longitude) - 15.0 * np.asarray(ra_hours)
+    )
+    alt = np.arcsin(
+        np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(hour_angle)
+    )
+    az = np.arctan2(
+        -np.cos(dec) * np.sin(hour_angle),
+        np.sin(dec) * np.cos(lat) - np.cos(dec) * np.sin(lat) * np.cos(hour_angle),
+    )
+    return np.degrees(alt), np.degrees(az) % 360.0
+
+
+def altaz_to_vector(alt_degs, az_degs):
+    """Unit vectors (north, east, up) of altitude / azimuth directions
+
+    Parameters
+    ----------
+    alt_degs, az_degs : ``float`` or :obj:`numpy.ndarray`
+        Altitude and azimuth (deg)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Unit vectors, stacked along the last axis
+    """
+    alt, az = np.radians(alt_degs), np.radians(az_degs)
+    return np.stack(
+        (np.cos(alt) * np.cos(az), np.cos(alt) * np.sin(az), np.sin(alt)), axis=-1
+    )
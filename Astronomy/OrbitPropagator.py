@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Offline Orbital-Element Propagator
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Topocentric astrometric (J2000) RA/Dec of comets and asteroids are computed
+from cached heliocentric osculating elements, with no network access, for
+many objects and many epochs in one set of NumPy array operations (objects
+along the first axis, times along the second).  The result is suitable for
+the PWI4 custom path / RA-Dec path APIs.
+
+The motion is two-body Keplerian from the osculating elements (elliptic,
+parabolic, and hyperbolic orbits are all handled), with light-time
+correction.  The Earth is placed with the JPL approximate Keplerian elements
+for the Earth-Moon barycenter (Standish, valid 1800-2050) plus a one-term
+lunar offset, and the observer with WGS84 geodetic coordinates and the mean
+sidereal time.  The ephemeris error is dominated by the Earth model (of order
+20 arcsec for an object 1 AU away) and by planetary perturbations since the
+epoch of the elements, so elements should be refreshed every few weeks.  The
+non-sidereal *rates*, which are what matter for tracking, are much better
+than the absolute positions.
+
+Elements are cached in a YAML file, keyed by object name::
+
+    28P:
+      q: 1.5823          # perihelion distance (AU)
+      e: 0.7753
+      i: 14.3            # inclination, node, argument of perihelion (deg,
+      node: 347.0        #   ecliptic and equinox J2000)
+      peri: 347.5
+      tp: 2459281.55     # time of perihelion (JD, TT)
+
+Asteroid-style elements (``a``, ``M`` at ``epoch``) may be given instead of
+``q`` and ``tp``.
+"""
+
+# Built-In Libraries
+
+# 3rd Party Libraries
+import numpy as np
+import yaml
+
+# Internal Imports
+
+
+# Gaussian gravitational constant (rad/day, AU, solar masses)
+GAUSS_K = 0.01720209895
+# Speed of light (AU/day)
+C_AU_PER_DAY = 173.1446326847
+AU_KM = 149597870.7
+OBLIQUITY_J2000 = np.radians(23.4392911)
+# TT - UTC (32.184 s + 37 leap seconds, valid since 2017)
+TT_MINUS_UTC_DAYS = 69.184 / 86400.0
+# Earth/Moon mass ratio
+EARTH_MOON_RATIO = 81.30056907
+WGS84_RADIUS_KM = 6378.137
+WGS84_FLATTENING = 1.0 / 298.257223563
+
+
+class OrbitalElements:
+    """Heliocentric osculating elements of one or more objects
+
+    All angles are in degrees, in the ecliptic and equinox of J2000.
+
+    Parameters
+    ----------
+    names : ``list``
+        Object names
+    q : array_like
+        Perihelion distances (AU)
+    e : array_like
+        Eccentricities
+    i : array_like
+        Inclinations (deg)
+    node : array_like
+        Longitudes of the ascending node (deg)
+    peri : array_like
+        Arguments of perihelion (deg)
+    tp : array_like
+        Times of perihelion passage (JD, TT)
+    """
+
+    def __init__(self, names, q, e, i, node, peri, tp):
+        self.names = list(names)
+        self.q = np.asarray(q, dtype=float)
+        self.e = np.asarray(e, dtype=float)
+        self.i = np.asarray(i, dtype=float)
+        self.node = np.asarray(node, dtype=float)
+        self.peri = np.asarray(peri, dtype=float)
+        self.tp = np.asarray(tp, dtype=float)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from a dictionary of ``name: {element: value}`` records
+
+        Each record has ``q``, ``e``, ``i``, ``node``, ``peri`` and ``tp``, or
+        ``a``, ``e``, ``i``, ``node``, ``peri``, ``M`` (deg) and ``epoch``
+        (JD, TT) for elliptic orbits.
+
+        Parameters
+        ----------
+        records : ``dict``
+            The element records
+
+        Returns
+        -------
+        :class:`OrbitalElements`
+            The elements of all objects, in the order given
+        """
+        columns = {key: [] for key in ("q", "e", "i", "node", "peri", "tp")}
+        for name, rec in records.items():
+            try:
+                e = float(rec["e"])
+                if "q" in rec:
+                    q, tp = float(rec["q"]), float(rec["tp"])
+                else:
+                    a = float(rec["a"])
+                    q = a * (1.0 - e)
+                    mean_motion = GAUSS_K / a**1.5
+                    tp = float(rec["epoch"]) - np.radians(float(rec["M"])) / mean_motion
+                for key, value in (("q", q), ("e", e), ("tp", tp)):
+                    columns[key].append(value)
+                for key in ("i", "node", "peri"):
+                    columns[key].append(float(rec[key]))
+            except (KeyError, TypeError, ValueError) as err:
+                raise ValueError(f"Bad orbital elements for {name}: {err}") from err
+        return cls(list(records), **columns)
+
+    @classmethod
+    def load(cls, path):
+        """Read cached elements from a YAML file
+
+        Parameters
+        ----------
+        path : ``str`` or path-like
+            The YAML element file
+
+        Returns
+        -------
+        :class:`OrbitalElements`
+            The elements of all objects in the file
+        """
+        with open(path, "r", encoding="utf-8") as stream:
+            records = yaml.safe_load(stream) or {}
+        return cls.from_records({str(name): rec for name, rec in records.items()})
+
+    def select(self, names):
+        """Return the elements of a subset of the objects
+
+        Parameters
+        ----------
+        names : ``list``
+            The object names wanted, in the order wanted
+
+        Returns
+        -------
+        :class:`OrbitalElements`
+            The elements of those objects
+        """
+        missing = [name for name in names if name not in self.names]
+        if missing:
+            raise KeyError(f"No orbital elements for {', '.join(missing)}")
+        idx = [self.names.index(name) for name in names]
+        return OrbitalElements(
+            names,
+            self.q[idx],
+            self.e[idx],
+            self.i[idx],
+            self.node[idx],
+            self.peri[idx],
+            self.tp[idx],
+        )
+
+
+def solve_kepler(mean_anomaly, e, tol=1e-13, max_iter=50):
+    """Solve Kepler's equation ``E - e sin E = M`` for elliptic orbits
+
+    Parameters
+    ----------
+    mean_anomaly : :obj:`numpy.ndarray`
+        Mean anomalies (radians)
+    e : :obj:`numpy.ndarray`
+        Eccentricities (< 1), broadcastable against ``mean_anomaly``
+    tol : ``float``, optional
+        Relative convergence tolerance.  (Default: 1e-13)
+    max_iter : ``int``, optional
+        Maximum number of Newton iterations.  (Default: 50)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Eccentric anomalies (radians)
+    """
+    # Reduce to (-pi, pi], leaving small values alone so none of their
+    # precision is lost
+    mean_anomaly = np.where(
+        np.abs(mean_anomaly) > np.pi,
+        np.remainder(mean_anomaly + np.pi, 2.0 * np.pi) - np.pi,
+        mean_anomaly,
+    )
+    mean_anomaly, e = np.broadcast_arrays(mean_anomaly, e)
+
+    # Starting values: Danby's, except near perihelion on very eccentric
+    # orbits, where the root of the cubic approximation
+    # (1 - e) E + e E^3 / 6 = M is far better
+    ecc_anom = np.array(mean_anomaly + 0.85 * e * np.sign(mean_anomaly))
+    cubic = (e > 0.8) & (np.abs(mean_anomaly) < 1.0)
+    if cubic.any():
+        mm, ee = mean_anomaly[cubic], e[cubic]
+        p_3 = 2.0 * (1.0 - ee) / ee
+        q_2 = 3.0 * np.abs(mm) / ee
+        # The cubic is odd in E: solve for |M|, where the root has no
+        # cancellation, and restore the sign
+        root = np.cbrt(q_2 + np.sqrt(q_2**2 + p_3**3))
+        ecc_anom[cubic] = np.where(
+            q_2 < 1e-3 * p_3**1.5,
+            mm / (1.0 - ee),
+            np.sign(mm) * (root - p_3 / root),
+        )
+
+    # Danby's quartic iteration; about three iterations to converge
+    for _ in range(max_iter):
+        e_sin = e * np.sin(ecc_anom)
+        e_cos = e * np.cos(ecc_anom)
+        func = ecc_anom - e_sin - mean_anomaly
+        deriv = 1.0 - e_cos
+        step = -func / deriv
+        step = -func / (deriv + 0.5 * step * e_sin)
+        step = -func / (deriv + 0.5 * step * e_sin + step**2 * e_cos / 6.0)
+        ecc_anom = ecc_anom + step
+        if np.all(np.abs(step) <= tol * np.maximum(np.abs(ecc_anom), 1e-300)):
+            break
+    return ecc_anom
+
+
+def orbit_plane_position(q, e, dt):
+    """Position in the orbital plane, from the time since perihelion
+
+    Parameters
+    ----------
+    q : :obj:`numpy.ndarray`
+        Perihelion distances (AU)
+    e : :obj:`numpy.ndarray`
+        Eccentricities
+    dt : :obj:`numpy.ndarray`
+        Times since perihelion (days); ``q``, ``e`` and ``dt`` are broadcast
+        against one another
+
+    Returns
+    -------
+    ``tuple``
+        The coordinates ``x`` (toward perihelion) and ``y`` (AU)
+    """
+    q, e, dt = np.broadcast_arrays(q, e, dt)
+    x = np.empty(dt.shape)
+    y = np.empty(dt.shape)
+
+    parabolic = np.abs(e - 1.0) < 1e-8
+    elliptic = (e < 1.0) & ~parabolic
+    hyperbolic = (e > 1.0) & ~parabolic
+
+    if elliptic.any():
+        qq, ee, tt = q[elliptic], e[elliptic], dt[elliptic]
+        a = qq / (1.0 - ee)
+        ecc_anom = solve_kepler(GAUSS_K * tt / a**1.5, ee)
+        # a (cos E - e), without cancellation when e is close to 1
+        x[elliptic] = qq - 2.0 * a * np.sin(0.5 * ecc_anom) ** 2
+        y[elliptic] = a * np.sqrt(1.0 - ee**2) * np.sin(ecc_anom)
+
+    if hyperbolic.any():
+        qq, ee, tt = q[hyperbolic], e[hyperbolic], dt[hyperbolic]
+        a = qq / (ee - 1.0)
+        mean_anomaly = GAUSS_K * tt / a**1.5
+        # Solve e sinh H - H = M
+        hyp_anom = np.sign(mean_anomaly) * np.log(2.0 * np.abs(mean_anomaly) / ee + 1.8)
+        for _ in range(50):
+            step = (ee * np.sinh(hyp_anom) - hyp_anom - mean_anomaly) / (
+                ee * np.cosh(hyp_anom) - 1.0
+            )
+            hyp_anom = hyp_anom - step
+            if np.all(np.abs(step) < 1e-13):
+                break
+        x[hyperbolic] = a * (ee - np.cosh(hyp_anom))
+        y[hyperbolic] = a * np.sqrt(ee**2 - 1.0) * np.sinh(hyp_anom)
+
+    if parabolic.any():
+        qq, tt = q[parabolic], dt[parabolic]
+        # Barker's equation, solved in closed form for s = tan(nu / 2)
+        w = 1.5 * GAUSS_K * tt / np.sqrt(2.0 * qq**3)
+        root = np.cbrt(w + np.sqrt(w**2 + 1.0))
+        s = root - 1.0 / root
+        x[parabolic] = qq * (1.0 - s**2)
+        y[parabolic] = 2.0 * qq * s
+
+    return x, y
+
+
+def orbit_to_ecliptic(x, y, incl, node, peri):
+    """Rotate orbital-plane coordinates to ecliptic coordinates
+
+    Parameters
+    ----------
+    x, y : :obj:`numpy.ndarray`
+        Orbital-plane coordinates (AU)
+    incl, node, peri : :obj:`numpy.ndarray`
+        Inclination, ascending node and argument of perihelion (deg)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Ecliptic coordinates, stacked along the first axis
+    """
+    incl, node, peri = np.radians(incl), np.radians(node), np.radians(peri)
+    cos_w, sin_w = np.cos(peri), np.sin(peri)
+    cos_n, sin_n = np.cos(node), np.sin(node)
+    cos_i, sin_i = np.cos(incl), np.sin(incl)
+    return np.stack(
+        (
+            x * (cos_w * cos_n - sin_w * sin_n * cos_i)
+            - y * (sin_w * cos_n + cos_w * sin_n * cos_i),
+            x * (cos_w * sin_n + sin_w * cos_n * cos_i)
+            + y * (cos_w * cos_n * cos_i - sin_w * sin_n),
+            x * sin_w * sin_i + y * cos_w * sin_i,
+        )
+    )
+
+
+def ecliptic_to_equatorial(xyz):
+    """Rotate J2000 ecliptic coordinates to J2000 equatorial coordinates"""
+    cos_e, sin_e = np.cos(OBLIQUITY_J2000), np.sin(OBLIQUITY_J2000)
+    return np.stack(
+        (xyz[0], xyz[1] * cos_e - xyz[2] * sin_e, xyz[1] * sin_e + xyz[2] * cos_e)
+    )
+
+
+def earth_position(jd_tt):
+    """Heliocentric equatorial J2000 position of the Earth
+
+    Parameters
+    ----------
+    jd_tt : :obj:`numpy.ndarray`
+        Julian dates (TT)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Positions (AU), shape ``(3,) + jd_tt.shape``
+    """
+    cent = (np.asarray(jd_tt, dtype=float) - 2451545.0) / 36525.0
+    # Earth-Moon barycenter elements (Standish, 1800-2050)
+    a = 1.00000261 + 0.00000562 * cent
+    e = 0.01671123 - 0.00004392 * cent
+    incl = -0.00001531 - 0.01294668 * cent
+    mean_long = 100.46457166 + 35999.37244981 * cent
+    long_peri = 102.93768193 + 0.32327364 * cent
+    ecc_anom = solve_kepler(np.radians(mean_long - long_peri), e)
+    emb = orbit_to_ecliptic(
+        a * (np.cos(ecc_anom) - e),
+        a * np.sqrt(1.0 - e**2) * np.sin(ecc_anom),
+        incl,
+        0.0,
+        long_peri,
+    )
+
+    # The Earth is offset from the barycenter, opposite the Moon
+    days = cent * 36525.0
+    moon_anom = np.radians(134.963 + 13.064993 * days)
+    moon_long = np.radians(218.316 + 13.176396 * days) + np.radians(6.289) * np.sin(
+        moon_anom
+    )
+    moon_lat = np.radians(5.128) * np.sin(np.radians(93.272 + 13.229350 * days))
+    moon_dist = (385001.0 - 20905.0 * np.cos(moon_anom)) / AU_KM
+    moon = moon_dist * np.stack(
+        (
+            np.cos(moon_lat) * np.cos(moon_long),
+            np.cos(moon_lat) * np.sin(moon_long),
+            np.sin(moon_lat),
+        )
+    )
+    return ecliptic_to_equatorial(emb - moon / (1.0 + EARTH_MOON_RATIO))
+
+
+def observer_position(jd_ut, latitude, longitude, elevation=0.0):
+    """Geocentric equatorial position of an observer
+
+    Parameters
+    ----------
+    jd_ut : :obj:`numpy.ndarray`
+        Julian dates (UT)
+    latitude : ``float``
+        Geodetic latitude (deg)
+    longitude : ``float``
+        Longitude (deg, east positive)
+    elevation : ``float``, optional
+        Height above the WGS84 ellipsoid (m).  (Default: 0.0)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Positions (AU), shape ``(3,) + jd_ut.shape``
+    """
+    lat = np.radians(latitude)
+    squash = (1.0 - WGS84_FLATTENING) ** 2
+    c_term = 1.0 / np.sqrt(np.cos(lat) ** 2 + squash * np.sin(lat) ** 2)
+    height = elevation / 1000.0 / WGS84_RADIUS_KM
+    rho_cos = (c_term + height) * np.cos(lat) * WGS84_RADIUS_KM / AU_KM
+    rho_sin = (squash * c_term + height) * np.sin(lat) * WGS84_RADIUS_KM / AU_KM
+
+    gmst = 280.46061837 + 360.98564736629 * (np.asarray(jd_ut, dtype=float) - 2451545.0)
+    lst = np.radians(gmst + longitude)
+    return np.stack(
+        (rho_cos * np.cos(lst), rho_cos * np.sin(lst), np.full(lst.shape, rho_sin))
+    )
+
+
+def heliocentric_position(elements, jd_tt):
+    """Heliocentric equatorial J2000 positions of the objects
+
+    Parameters
+    ----------
+    elements : :class:`OrbitalElements`
+        The objects
+    jd_tt : :obj:`numpy.ndarray`
+        Julian dates (TT), either shape ``(n_times,)`` or
+        ``(n_objects, n_times)``
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Positions (AU), shape ``(3, n_objects, n_times)``
+    """
+    column = np.newaxis
+    x, y = orbit_plane_position(
+        elements.q[:, column], elements.e[:, column], jd_tt - elements.tp[:, column]
+    )
+    return ecliptic_to_equatorial(
+        orbit_to_ecliptic(
+            x,
+            y,
+            elements.i[:, column],
+            elements.node[:, column],
+            elements.peri[:, column],
+        )
+    )
+
+
+def propagate(elements, jd_utc, latitude=None, longitude=None, elevation=0.0):
+    """Astrometric J2000 RA/Dec of the objects at the given times
+
+    The positions are topocentric if the site is given, else geocentric,
+    and corrected for light time.
+
+    Parameters
+    ----------
+    elements : :class:`OrbitalElements`
+        The objects
+    jd_utc : array_like
+        Julian dates (UTC)
+    latitude : ``float``, optional
+        Site geodetic latitude (deg).  (Default: None)
+    longitude : ``float``, optional
+        Site longitude (deg, east positive).  (Default: None)
+    elevation : ``float``, optional
+        Site height (m).  (Default: 0.0)
+
+    Returns
+    -------
+    ``tuple``
+        Arrays of RA (hours), Dec (deg) and distance from the observer (AU),
+        each of shape ``(n_objects, n_times)``
+    """
+    jd_utc = np.atleast_1d(np.asarray(jd_utc, dtype=float))
+    jd_tt = jd_utc + TT_MINUS_UTC_DAYS
+
+    observer = earth_position(jd_tt)
+    if latitude is not None and longitude is not None:
+        observer = observer + observer_position(jd_utc, latitude, longitude, elevation)
+    observer = observer[:, np.newaxis, :]
+
+    # Light time: the object is seen where it was when the light left it.
+    #  One correction is enough: the light time changes by a fraction v/c
+    #  (~1e-4) of itself, well under a second, between iterations.
+    light_time = 0.0
+    for _ in range(2):
+        rel = heliocentric_position(elements, jd_tt - light_time) - observer
+        dist = np.sqrt(np.sum(rel**2, axis=0))
+        light_time = dist / C_AU_PER_DAY
+
+    ra_hours = np.degrees(np.arctan2(rel[1], rel[0])) / 15.0 % 24.0
+    dec_degs = np.degrees(np.arcsin(rel[2] / dist))
+    return ra_hours, dec_degs, dist
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Satellite Pass Predictor
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Passes of Earth satellites over the site (rise, culmination and set times,
+and the maximum altitude) are predicted from two-line element sets (TLEs)
+for many satellites over a whole night in one set of NumPy array operations
+(satellites along the first axis, times along the second).
+
+The propagator follows the SGP4 recipe to first order: the TLE mean motion
+is converted to the Brouwer mean motion, and the node, argument of perigee
+and mean anomaly advance at their J2 secular rates, with the mean motion
+decaying at the TLE's first derivative.  Short-period terms and the full
+drag model are omitted, so positions are good to some tens of km within a
+few days of the TLE epoch: pass times to a few seconds, which is what
+scheduling needs.  Tracking itself is left to PWI4, which runs full SGP4
+from the same TLE (``mount_follow_tle``).
+
+Pass lists are cached per TLE epoch by :class:`PassPredictor`, so they are
+recomputed only for satellites whose elements have been updated.
+"""
+
+# Built-In Libraries
+import datetime
+
+# 3rd Party Libraries
+import numpy as np
+
+# Internal Imports
+from Astronomy.OrbitPropagator import earth_position, solve_kepler
+
+# WGS72 constants, as used by SGP4
+EARTH_RADIUS_KM = 6378.135
+J2 = 0.001082616
+# sqrt(GM) in Earth radii^1.5 per minute
+KE = 0.0743669161
+WGS84_FLATTENING = 1.0 / 298.257223563
+MINUTES_PER_DAY = 1440.0
+
+
+def tle_epoch_jd(field):
+    """Convert a TLE epoch field (YYDDD.DDDDDDDD) to a Julian date (UTC)
+
+    Parameters
+    ----------
+    field : ``str``
+        The epoch field, columns 19-32 of line 1
+
+    Returns
+    -------
+    ``float``
+        The Julian date
+    """
+    year = int(field[:2])
+    year += 2000 if year < 57 else 1900
+    jan_1 = (datetime.date(year, 1, 1) - datetime.date(2000, 1, 1)).days + 2451544.5
+    return jan_1 + float(field[2:]) - 1.0
+
+
+class TwoLineElements:
+    """Two-line element sets of one or more satellites
+
+    Parameters
+    ----------
+    tles : ``list``
+        List of ``(name, line1, line2)`` tuples
+    """
+
+    def __init__(self, tles):
+        self.tles = [tuple(line.rstrip() for line in tle) for tle in tles]
+        self.names = [tle[0].strip() for tle in self.tles]
+        try:
+            columns = [
+                (
+                    int(line1[2:7]),
+                    tle_epoch_jd(line1[18:32]),
+                    float(line1[33:43]),
+                    float(line2[8:16]),
+                    float(line2[17:25]),
+                    float("0." + line2[26:33].strip()),
+                    float(line2[34:42]),
+                    float(line2[43:51]),
+                    float(line2[52:63]),
+                )
+                for _, line1, line2 in self.tles
+            ]
+        except (IndexError, ValueError) as err:
+            raise ValueError(f"Malformed TLE: {err}") from err
+
+        (
+            self.catalog_number,
+            self.epoch,
+            self.ndot,
+            self.i,
+            self.node,
+            self.e,
+            self.peri,
+            self.mean_anomaly,
+            self.mean_motion,
+        ) = (
+            (np.array(col) for col in zip(*columns)) if columns else [np.empty(0)] * 9
+        )
+
+    def __len__(self):
+        return len(self.tles)
+
+    @classmethod
+    def load(cls, path):
+        """Read a file of three-line (name, line 1, line 2) element sets
+
+        Parameters
+        ----------
+        path : ``str`` or path-like
+            The TLE file
+
+        Returns
+        -------
+        :class:`TwoLineElements`
+            The element sets in the file
+        """
+        with open(path, "r", encoding="utf-8") as stream:
+            lines = [line for line in stream.read().splitlines() if line.strip()]
+        return cls([lines[k : k + 3] for k in range(0, len(lines) - 2, 3)])
+
+    def select(self, names):
+        """Return the element sets of a subset of the satellites
+
+        Parameters
+        ----------
+        names : ``list``
+            The satellite names wanted, in the order wanted
+
+        Returns
+        -------
+        :class:`TwoLineElements`
+            The element sets of those satellites
+        """
+        missing = [name for name in names if name not in self.names]
+        if missing:
+            raise KeyError(f"No TLE for {', '.join(missing)}")
+        return TwoLineElements([self.tles[self.names.index(name)] for name in names])
+
+
+def satellite_position(tles, jd_utc):
+    """Geocentric (TEME) positions of the satellites
+
+    Parameters
+    ----------
+    tles : :class:`TwoLineElements`
+        The satellites
+    jd_utc : :obj:`numpy.ndarray`
+        Julian dates (UTC)
+
+    Returns
+    -------
+    :obj:`numpy.ndarray`
+        Positions (km), shape ``(3, n_satellites, n_times)``
+    """
+    column = np.newaxis
+    incl = np.radians(tles.i)[:, column]
+    e = tles.e[:, column]
+    cos_i = np.cos(incl)
+
+    # Recover the Brouwer mean motion and semi-major axis from the TLE's
+    #  Kozai mean motion, as SGP4 does (Earth radii, radians per minute)
+    n_kozai = tles.mean_motion[:, column] * 2.0 * np.pi / MINUTES_PER_DAY
+    beta_3 = (1.0 - e**2) ** 1.5
+    shape = 0.75 * J2 * (3.0 * cos_i**2 - 1.0) / beta_3
+    a_1 = (KE / n_kozai) ** (2.0 / 3.0)
+    delta = shape / a_1**2
+    a_0 = a_1 * (1.0 - delta / 3.0 - delta**2 - 134.0 / 81.0 * delta**3)
+    delta = shape / a_0**2
+    n_0 = n_kozai / (1.0 + delta)
+    a_0 = a_0 / (1.0 - delta)
+
+    # J2 secular rates (radians per minute)
+    j2_p2 = 1.5 * J2 / (a_0 * (1.0 - e**2)) ** 2 * n_0
+    node_rate = -j2_p2 * cos_i
+    peri_rate = 0.5 * j2_p2 * (5.0 * cos_i**2 - 1.0)
+    anomaly_rate = n_0 + 0.5 * j2_p2 * np.sqrt(1.0 - e**2) * (3.0 * cos_i**2 - 1.0)
+
+    minutes = (jd_utc - tles.epoch[:, column]) * MINUTES_PER_DAY
+    # The TLE gives half the mean motion derivative, in revolutions / day^2
+    decay = tles.ndot[:, column] * 2.0 * np.pi / MINUTES_PER_DAY**2
+    mean_anomaly = (
+        np.radians(tles.mean_anomaly)[:, column]
+        + anomaly_rate * minutes
+        + decay * minutes**2
+    )
+    # The orbit shrinks as drag speeds it up (a ~ n^-2/3)
+    a = a_0 * (1.0 + 2.0 * decay * minutes / n_0) ** (-2.0 / 3.0)
+
+    ecc_anom = solve_kepler(mean_anomaly, e)
+    x = a * (np.cos(ecc_anom) - e)
+    y = a * np.sqrt(1.0 - e**2) * np.sin(ecc_anom)
+
+    node = np.radians(tles.node)[:, column] + node_rate * minutes
+    peri = np.radians(tles.peri)[:, column] + peri_rate * minutes
+    cos_w, sin_w = np.cos(peri), np.sin(peri)
+    cos_n, sin_n = np.cos(node), np.sin(node)
+    sin_i = np.sin(incl)
+    return EARTH_RADIUS_KM * np.stack(
+        (
+            x * (cos_w * cos_n - sin_w * sin_n * cos_i)
+            - y * (sin_w * cos_n + cos_w * sin_n * cos_i),
+            x * (cos_w * sin_n + sin_w * cos_n * cos_i)
+            + y * (cos_w * cos_n * cos_i - sin_w * sin_n),
+            x * sin_w * sin_i + y * cos_w * sin_i,
+        )
+    )
+
+
+def topocentric_frame(jd_utc, latitude, longitude, elevation=0.0):
+    """Site position and local east / north / up vectors in the TEME frame
+
+    Parameters
+    ----------
+    jd_utc : :obj:`numpy.ndarray`
+        Julian dates (UTC, taken as UT1)
+    latitude : ``float``
+        Geodetic latitude (deg)
+    longitude : ``float``
+        Longitude (deg, east positive)
+    elevation : ``float``, optional
+        Height above the ellipsoid (m).  (Default: 0.0)
+
+    Returns
+    -------
+    ``tuple``
+        Site position (km), and the east, north and up unit vectors, each of
+        shape ``(3, n_times)``
+    """
+    lat = np.radians(latitude)
+    gmst = 280.46061837 + 360.98564736629 * (jd_utc - 2451545.0)
+    lst = np.radians(gmst + longitude)
+    cos_l, sin_l = np.cos(lst), np.sin(lst)
+
+    squash = (1.0 - WGS84_FLATTENING) ** 2
+    c_term = 1.0 / np.sqrt(np.cos(lat) ** 2 + squash * np.sin(lat) ** 2)
+    height = elevation / 1000.0
+    rho_cos = (EARTH_RADIUS_KM * c_term + height) * np.cos(lat)
+    rho_sin = (EARTH_RADIUS_KM * squash * c_term + height) * np.sin(lat)
+
+    site = np.stack((rho_cos * cos_l, rho_cos * sin_l, np.full(lst.shape, rho_sin)))
+    east = np.stack((-sin_l, cos_l, np.zeros(lst.shape)))
+    north = np.stack(
+        (-np.sin(lat) * cos_l, -np.sin(lat) * sin_l, np.full(lst.shape, np.cos(lat)))
+    )
+    up = np.stack(
+        (np.cos(lat) * cos_l, np.cos(lat) * sin_l, np.full(lst.shape, np.sin(lat)))
+    )
+    return site, east, north, up
+
+
+def find_passes(
+    tles,
+    jd_start,
+    jd_end,
+    latitude,
+    longitude,
+    elevation=0.0,
+    min_altitude=10.0,
+    step_seconds=30.0,
+    max_sun_altitude=-6.0,
+):
+    """Find the passes of the satellites above ``min_altitude``
+
+    Altitudes are computed on a grid of ``step_seconds`` for all satellites
+    at once; rise and set times are interpolated between grid points, and
+    the culmination found from a parabola through the highest three.
+
+    Parameters
+    ----------
+    tles : :class:`TwoLineElements`
+        The satellites
+    jd_start, jd_end : ``float``
+        The time window (JD, UTC)
+    latitude, longitude : ``float``
+        Site geodetic latitude and east longitude (deg)
+    elevation : ``float``, optional
+        Site height (m).  (Default: 0.0)
+    min_altitude : ``float``, optional
+        Altitude a pass must exceed (deg).  (Default: 10.0)
+    step_seconds : ``float``, optional
+        Grid spacing; passes shorter than this may be missed.  (Default: 30.0)
+    max_sun_altitude : ``float``, optional
+        A pass is ``visible`` if the satellite is sunlit at some point while
+        the Sun is below this altitude (deg).  (Default: -6.0)
+
+    Returns
+    -------
+    ``list``
+        One dictionary per pass, in time order, with ``name``,
+        ``catalog_number``, ``tle_epoch``, ``rise_jd`` (``None`` if the
+        satellite is already up at ``jd_start``), ``culmination_jd``,
+        ``set_jd`` (``None`` if still up at ``jd_end``), ``max_altitude``,
+        ``culmination_azimuth`` and ``visible``
+    """
+    if not len(tles):
+        return []
+    step = step_seconds / 86400.0
+    jd = np.arange(jd_start, jd_end + step, step)
+
+    site, east, north, up = topocentric_frame(jd, latitude, longitude, elevation)
+    rel = satellite_position(tles, jd) - site[:, np.newaxis, :]
+    dist = np.sqrt(np.sum(rel**2, axis=0))
+    alt = np.degrees(np.arcsin(np.einsum("kst,kt->st", rel, up) / dist))
+    above = alt >= min_altitude
+    if not above.any():
+        return []
+
+    # Sunlight: Sun altitude at the site, and the Earth's cylindrical shadow,
+    #  evaluated only where the satellite is up
+    sun = -earth_position(jd)
+    sun = sun / np.sqrt(np.sum(sun**2, axis=0))
+    sun_alt = np.degrees(np.arcsin(np.sum(sun * up, axis=0)))
+    sat_idx, time_idx = np.nonzero(above)
+    sat = rel[:, sat_idx, time_idx] + site[:, time_idx]
+    along = np.sum(sat * sun[:, time_idx], axis=0)
+    perp = np.sqrt(np.maximum(np.sum(sat**2, axis=0) - along**2, 0.0))
+    observable = np.zeros(above.shape, dtype=bool)
+    observable[sat_idx, time_idx] = ((along > 0.0) | (perp > EARTH_RADIUS_KM)) & (
+        sun_alt[time_idx] < max_sun_altitude
+    )
+
+    # Rising and setting edges of each satellite's above-horizon intervals
+    padded = np.pad(above, ((0, 0), (1, 1))).astype(np.int8)
+    edges = np.diff(padded, axis=1)
+    rises = np.argwhere(edges == 1)
+    sets = np.argwhere(edges == -1)
+
+    def crossing(sat_idx, k):
+        # Time at which the altitude crosses min_altitude between k-1 and k
+        a_0, a_1 = alt[sat_idx, k - 1], alt[sat_idx, k]
+        return jd[k - 1] + step * (min_altitude - a_0) / (a_1 - a_0)
+
+    passes = []
+    for (sat_idx, first), (_, end) in zip(rises, sets):
+        peak = first + int(np.argmax(alt[sat_idx, first:end]))
+        peak_jd, peak_alt = jd[peak], alt[sat_idx, peak]
+        if 0 < peak < len(jd) - 1:
+            a_m, a_0, a_p = alt[sat_idx, peak - 1 : peak + 2]
+            curve = a_m - 2.0 * a_0 + a_p
+            if curve < 0.0:
+                shift = 0.5 * (a_m - a_p) / curve
+                peak_jd = jd[peak] + shift * step
+                peak_alt = a_0 - 0.25 * (a_m - a_p) * shift
+        azimuth = np.degrees(
+            np.arctan2(
+                np.dot(rel[:, sat_idx, peak], east[:, peak]),
+                np.dot(rel[:, sat_idx, peak], north[:, peak]),
+            )
+        )
+        passes.append(
+            {
+                "name": tles.names[sat_idx],
+                "catalog_number": int(tles.catalog_number[sat_idx]),
+                "tle_epoch": float(tles.epoch[sat_idx]),
+                "rise_jd": float(crossing(sat_idx, first)) if first > 0 else None,
+                "culmination_jd": float(peak_jd),
+                "set_jd": float(crossing(sat_idx, end)) if end < len(jd) else None,
+                "max_altitude": float(peak_alt),
+                "culmination_azimuth": float(azimuth % 360.0),
+                "visible": bool(observable[sat_idx, first:end].any()),
+            }
+        )
+    return sorted(passes, key=lambda p: p["culmination_jd"])
+
+
+class PassPredictor:
+    """Satellite pass lists for a site, cached per TLE epoch
+
+    Parameters
+    ----------
+    latitude, longitude : ``float``
+        Site geodetic latitude and east longitude (deg)
+    elevation : ``float``, optional
+        Site height (m).  (Default: 0.0)
+    min_altitude : ``float``, optional
+        Altitude a pass must exceed (deg).  (Default: 10.0)
+    step_seconds : ``float``, optional
+        Time grid spacing (s).  (Default: 30.0)
+    """
+
+    def __init__(
+        self, latitude, longitude, elevation=0.0, min_altitude=10.0, step_seconds=30.0
+    ):
+        self.site = (latitude, longitude, elevation)
+        self.min_altitude = min_altitude
+        self.step_seconds = step_seconds
+        # (catalog number, TLE epoch, window) -> list of passes
+        self.cache = {}
+
+    def passes(self, tles, jd_start, jd_end):
+        """Return the passes of the satellites in a time window
+
+        Only the satellites whose (TLE epoch, window) have not been seen
+        before are propagated, all in one call to :func:`find_passes`.
+
+        Parameters
+        ----------
+        tles : :class:`TwoLineElements`
+            The satellites
+        jd_start, jd_end : ``float``
+            The time window (JD, UTC)
+
+        Returns
+        -------
+        ``list``
+            The passes, in time order (see :func:`find_passes`)
+        """
+        window = (round(jd_start, 6), round(jd_end, 6))
+        keys = [
+            (int(num), float(epoch), window)
+            for num, epoch in zip(tles.catalog_number, tles.epoch)
+        ]
+        stale = [name for name, key in zip(tles.names, keys) if key not in self.cache]
+        if stale:
+            found = find_passes(
+                tles.select(stale),
+                jd_start,
+                jd_end,
+                *self.site,
+                min_altitude=self.min_altitude,
+                step_seconds=self.step_seconds,
+            )
+            for name, key in zip(tles.names, keys):
+                if name in stale:
+                    self.cache[key] = [p for p in found if p["name"] == name]
+
+        # Drop the lists computed from superseded element sets
+        current = set(keys)
+        numbers = {key[0] for key in keys}
+        for key in [k for k in self.cache if k[0] in numbers and k not in current]:
+            del self.cache[key]
+
+        return sorted(
+            (p for key in keys for p in self.cache[key]),
+            key=lambda p: p["culmination_jd"],
+        )
+
+    def current_pass(self, tles, jd_now, lookahead_hours=12.0):
+        """Return the pass in progress at ``jd_now``, else the next one
+
+        Parameters
+        ----------
+        tles : :class:`TwoLineElements`
+            The satellite (the first one is used)
+        jd_now : ``float``
+            The current time (JD, UTC)
+        lookahead_hours : ``float``, optional
+            How far ahead to look for the next pass.  (Default: 12.0)
+
+        Returns
+        -------
+        ``tuple``
+            Whether the satellite is up now, and the pass dictionary (or
+            ``None`` if there is no pass in the window)
+        """
+        # Align the window to the hour so that repeated calls hit the cache
+        start = np.floor(jd_now * 24.0) / 24.0 - 1.0 / 24.0
+        for p in self.passes(
+            tles.select(tles.names[:1]), start, start + lookahead_hours / 24.0
+        ):
+            rise = p["rise_jd"] if p["rise_jd"] is not None else start
+            end = p["set_jd"] if p["set_jd"] is not None else np.inf
+            if rise <= jd_now <= end:
+                return True, p
+            if rise > jd_now:
+                return False, p
+        return False, None
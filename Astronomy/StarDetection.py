@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Fast Star Detection
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Stars are found in a frame with whole-array NumPy operations: a robust
+background and noise estimate from a subsample of the pixels, a threshold,
+a 3x3 local-maximum test, and first-moment centroids computed for all peaks
+at once.  It is meant for acquisition and pointing work on short frames,
+where speed matters more than completeness, not for photometry.
+"""
+
+# Built-In Libraries
+
+# 3rd Party Libraries
+import numpy as np
+
+# Internal Imports
+
+
+def background(image, stride=4):
+    """Robust background level and noise of a frame
+
+    The median and the median absolute deviation of every ``stride``-th
+    pixel in each direction are used, so stars barely affect the estimate.
+
+    Parameters
+    ----------
+    image : :obj:`numpy.ndarray`
+        The frame
+    stride : ``int``, optional
+        Subsampling step.  (Default: 4)
+
+    Returns
+    -------
+    ``tuple``
+        The background level and the noise (standard deviation)
+    """
+    sample = np.asarray(image[::stride, ::stride], dtype=np.float32).ravel()
+    level = np.median(sample)
+    noise = 1.4826 * np.median(np.abs(sample - level))
+    if noise <= 0:
+        noise = float(np.std(sample)) or 1.0
+    return float(level), float(noise)
+
+
+def find_stars(image, nsigma=5.0, box=7, max_stars=50):
+    """Find the stars in a frame
+
+    Parameters
+    ----------
+    image : :obj:`numpy.ndarray`
+        The frame
+    nsigma : ``float``, optional
+        Detection threshold above the background, in noise units.
+        (Default: 5.0)
+    box : ``int``, optional
+        Size of the (odd) centroiding box, in pixels.  (Default: 7)
+    max_stars : ``int``, optional
+        Maximum number of stars returned.  (Default: 50)
+
+    Returns
+    -------
+    ``dict``
+        Arrays ``x``, ``y`` (centroids, in pixels, ``x`` along the last axis),
+        ``flux`` (background-subtracted, in the box) and ``snr``, brightest
+        first, plus the ``background`` and ``noise`` of the frame
+    """
+    level, noise = background(image)
+    data = np.asarray(image, dtype=np.float32) - level
+    half = box // 2
+    found = {
+        "x": np.empty(0),
+        "y": np.empty(0),
+        "flux": np.empty(0),
+        "snr": np.empty(0),
+        "background": level,
+        "noise": noise,
+    }
+    if data.shape[0] <= box or data.shape[1] <= box:
+        return found
+
+    # Pixels above threshold that are at least as bright as their 8 neighbors,
+    #  away from the edges
+    rows, cols = data.shape
+    core = data[1:-1, 1:-1]
+    peak = core > nsigma * noise
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                peak &= core >= data[1 + dy : rows - 1 + dy, 1 + dx : cols - 1 + dx]
+    ys, xs = np.nonzero(peak)
+    ys, xs = ys + 1, xs + 1
+    inside = (ys >= half) & (ys < rows - half) & (xs >= half) & (xs < cols - half)
+    ys, xs = ys[inside], xs[inside]
+    if not len(ys):
+        return found
+
+    # Brightest first; keep a margin for peaks dropped as duplicates below
+    order = np.argsort(data[ys, xs])[::-1][: 4 * max_stars]
+    ys, xs = ys[order], xs[order]
+
+    # First moments of all the boxes at once
+    offsets = np.arange(-half, half + 1)
+    patches = data[
+        ys[:, np.newaxis, np.newaxis] + offsets[np.newaxis, :, np.newaxis],
+        xs[:, np.newaxis, np.newaxis] + offsets[np.newaxis, np.newaxis, :],
+    ]
+    weights = np.clip(patches, 0.0, None)
+    total = weights.sum(axis=(1, 2))
+    total[total <= 0] = np.nan
+    y_c = ys + (weights.sum(axis=2) * offsets).sum(axis=1) / total
+    x_c = xs + (weights.sum(axis=1) * offsets).sum(axis=1) / total
+    flux = patches.sum(axis=(1, 2))
+
+    # Drop peaks (e.g. flat-topped or saturated cores) within a box of a
+    #  brighter one
+    keep = []
+    for k in range(len(ys)):
+        if np.isnan(x_c[k]):
+            continue
+        if any(abs(ys[k] - ys[j]) <= half and abs(xs[k] - xs[j]) <= half for j in keep):
+            continue
+        keep.append(k)
+        if len(keep) == max_stars:
+            break
+
+    found["x"] = x_c[keep]
+    found["y"] = y_c[keep]
+    found["flux"] = flux[keep]
+    found["snr"] = flux[keep] / (noise * box)
+    return found
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Astronomical Computation Module
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+The modules within this directory hold the hardware-independent computations
+(ephemerides, coordinates) used by the Agents.  They depend only on NumPy and
+need no network access.
+"""
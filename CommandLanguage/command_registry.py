@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 19-Oct-2026
+#
+#  @author: dlytle, tbowers
+
+"""Lorax Command Registry
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+Each SubAgent class declares the commands it accepts in a
+:class:`CommandRegistry`: the command name, the method that handles it, and
+a typed schema for its arguments.  A message is parsed with
+:func:`~CommandLanguage.parse_dscl.parse_command`, the command is found with a
+single dictionary lookup, and its arguments are checked and converted against
+the schema once, before the handler is called, so handlers receive clean,
+typed values.
+
+Registries inherit: a SubAgent's registry starts from a copy of its parent
+class's, and may add or replace commands.  Because a registry is plain data,
+it can be inspected (:meth:`CommandRegistry.describe`) and used to check a
+DTO command script before it is run (:func:`validate_script`).
+
+Example::
+
+    class FilterWheelSubAgent(SubAgent):
+        commands = CommandRegistry("filterwheel", parent=SubAgent.commands)
+
+        @commands.command("move", Arg("position", int))
+        def cmd_move(self, position):
+            ...
+"""
+
+# Built-In Libraries
+import importlib
+
+# 3rd Party Libraries
+
+# Internal Imports
+from CommandLanguage import parse_dscl
+
+# Marks an argument without a default value
+REQUIRED = object()
+
+# Readable names of the argument kinds
+KIND_NAMES = {float: "float", int: "int", str: "str", None: "any"}
+
+
+class CommandError(ValueError):
+    """An unknown command, arguments that do not fit its schema, or a command
+    that cannot be carried out"""
+
+
+class Arg:
+    """One argument of a command
+
+    Parameters
+    ----------
+    name : ``str``
+        Name of the argument (for messages and introspection)
+    kind : ``type``, optional
+        ``float``, ``int``, ``str``, or ``None`` to accept either a number or a
+        string.  (Default: float)
+    default : optional
+        Value used when the argument is not given; if not set, the argument
+        is required.
+    """
+
+    def __init__(self, name, kind=float, default=REQUIRED):
+        if kind not in KIND_NAMES:
+            raise TypeError(f"Unsupported argument kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.default = default
+
+    @property
+    def required(self):
+        """Whether the argument must be given"""
+        return self.default is REQUIRED
+
+    def convert(self, value):
+        """Check a parsed argument and convert it to this argument's kind
+
+        Parameters
+        ----------
+        value : ``float`` or ``str``
+            The argument, as parsed by :func:`parse_dscl.parse_command`
+
+        Returns
+        -------
+        ``float``, ``int`` or ``str``
+            The converted value
+
+        Raises
+        ------
+        CommandError
+            If the value cannot be converted
+        """
+        if self.kind is None:
+            return value
+        if self.kind is str:
+            # Numbers are parsed as floats; give back their shortest form
+            return f"{value:.15g}" if isinstance(value, float) else value
+        if not isinstance(value, float):
+            raise CommandError(f"{self.name} must be a number, not {value!r}")
+        if self.kind is int:
+            if not value.is_integer():
+                raise CommandError(f"{self.name} must be a whole number")
+            return int(value)
+        return value
+
+    def describe(self):
+        """Description of the argument, for introspection"""
+        description = {"name": self.name, "kind": KIND_NAMES[self.kind]}
+        if not self.required:
+            description["default"] = self.default
+        return description
+
+
+class Command:
+    """One command of a registry
+
+    Parameters
+    ----------
+    name : ``str``
+        The command, as sent by the DTO
+    method : ``str``
+        Name of the method that handles it, or ``None`` for a command that is
+        part of the API but not yet implemented
+    args : ``tuple``
+        The :class:`Arg` schema of the arguments, in order
+    varargs : :class:`Arg`, optional
+        Schema for any number of further arguments.  (Default: None)
+    target : ``str``, optional
+        Attribute of the agent that has the method, if it is not the agent
+        itself.  (Default: None)
+    waits : ``bool``, optional
+        Whether the command starts motion the DTO must wait for.
+        (Default: False)
+    doc : ``str``, optional
+        One-line description.  (Default: "")
+    """
+
+    def __init__(
+        self, name, method, args=(), varargs=None, target=None, waits=False, doc=""
+    ):
+        self.name = name
+        self.method = method
+        self.args = tuple(args)
+        self.varargs = varargs
+        self.target = target
+        self.waits = waits
+        self.doc = doc
+
+    def validate(self, arguments):
+        """Check parsed arguments against the schema and convert them
+
+        Parameters
+        ----------
+        arguments : ``list``
+            The arguments from :func:`parse_dscl.parse_command`
+
+        Returns
+        -------
+        ``list``
+            The converted arguments, with defaults filled in
+
+        Raises
+        ------
+        CommandError
+            If the arguments do not fit the schema
+        """
+        # parse_command gives [None] for no parentheses and [""] for "()"
+        given = [arg for arg in arguments if arg is not None]
+        if given == [""]:
+            given = []
+
+        if len(given) > len(self.args) and self.varargs is None:
+            raise CommandError(
+                f"{self.name} takes at most {len(self.args)} argument(s), "
+                f"{len(given)} given"
+            )
+
+        values = []
+        for i, arg in enumerate(self.args):
+            if i < len(given):
+                values.append(arg.convert(given[i]))
+            elif arg.required:
+                raise CommandError(f"{self.name} needs argument {arg.name}")
+            else:
+                values.append(arg.default)
+        if self.varargs is not None:
+            values += [self.varargs.convert(arg) for arg in given[len(self.args) :]]
+        return values
+
+    def describe(self):
+        """Description of the command, for introspection"""
+        return {
+            "args": [arg.describe() for arg in self.args],
+            "varargs": self.varargs.describe() if self.varargs else None,
+            "waits": self.waits,
+            "implemented": self.method is not None,
+            "doc": self.doc,
+        }
+
+
+class CommandRegistry:
+    """The commands a kind of SubAgent accepts
+
+    Parameters
+    ----------
+    agent_type : ``str``
+        The kind of agent (`e.g.`, ``camera``), used in messages
+    parent : :class:`CommandRegistry`, optional
+        Registry whose commands this one starts with.  (Default: None)
+    """
+
+    def __init__(self, agent_type, parent=None):
+        self.agent_type = agent_type
+        self.commands = dict(parent.commands) if parent is not None else {}
+
+    def __contains__(self, name):
+        return name in self.commands
+
+    def __iter__(self):
+        return iter(self.commands.values())
+
+    def add(self, command):
+        """Add (or replace) a :class:`Command`"""
+        self.commands[command.name] = command
+        return command
+
+    def command(self, name, *args, varargs=None, waits=False):
+        """Decorator registering a method as the handler of a command
+
+        Parameters
+        ----------
+        name : ``str``
+            The command
+        *args : :class:`Arg`
+            Schema of its arguments, in order; the method is called with the
+            converted values as positional arguments
+        varargs : :class:`Arg`, optional
+            Schema for any number of further arguments.  (Default: None)
+        waits : ``bool``, optional
+            Whether the command starts motion the DTO must wait for.
+            (Default: False)
+        """
+
+        def register(method):
+            doc = (method.__doc__ or "").strip().split("\n")[0]
+            self.add(Command(name, method.__name__, args, varargs, None, waits, doc))
+            return method
+
+        return register
+
+    def placeholder(self, *names):
+        """Register API commands that are not implemented yet
+
+        They are accepted (with any arguments) and reported as having no
+        effect.
+        """
+        for name in names:
+            self.add(Command(name, None, varargs=Arg("arguments", None)))
+
+    def include(self, other, target):
+        """Add the commands of another registry, handled by an attribute
+
+        Parameters
+        ----------
+        other : :class:`CommandRegistry`
+            The registry to include
+        target : ``str``
+            Attribute of the agent holding the object whose methods handle
+            those commands
+        """
+        for command in other:
+            self.add(
+                Command(
+                    command.name,
+                    command.method,
+                    command.args,
+                    command.varargs,
+                    target,
+                    command.waits,
+                    command.doc,
+                )
+            )
+
+    def lookup(self, name):
+        """The :class:`Command` of a name
+
+        Raises
+        ------
+        CommandError
+            If there is no such command
+        """
+        try:
+            return self.commands[name]
+        except KeyError:
+            raise CommandError(f"Unknown {self.agent_type} command: {name}") from None
+
+    def parse(self, message):
+        """Parse and validate a message
+
+        Parameters
+        ----------
+        message : ``str``
+            A command in Dyer's Simple Command Language
+
+        Returns
+        -------
+        ``tuple``
+            The :class:`Command` and its converted arguments
+
+        Raises
+        ------
+        CommandError
+            If the command is unknown or its arguments do not fit
+        """
+        name, arguments = parse_dscl.parse_command(message)
+        command = self.lookup(name)
+        return command, command.validate(arguments)
+
+    def run(self, agent, command, values):
+        """Call the handler of a parsed command
+
+        Parameters
+        ----------
+        agent : :class:`~AbstractAgents.SubAgent.SubAgent`
+            The agent the command was sent to
+        command : :class:`Command`
+            The command
+        values : ``list``
+            Its converted arguments
+        """
+        if command.method is None:
+            print(f"{self.agent_type}: {command.name} (no effect)")
+            return None
+        handler = agent if command.target is None else getattr(agent, command.target)
+        return getattr(handler, command.method)(*values)
+
+    def dispatch(self, agent, message):
+        """Parse, validate, and run a message
+
+        Raises
+        ------
+        CommandError
+            If the command is unknown or its arguments do not fit
+        """
+        command, values = self.parse(message)
+        return self.run(agent, command, values)
+
+    def describe(self):
+        """Description of every command, for introspection
+
+        Returns
+        -------
+        ``dict``
+            Command name: description (arguments, ``waits``, ``implemented``,
+            ``doc``)
+        """
+        return {
+            name: command.describe() for name, command in sorted(self.commands.items())
+        }
+
+
+def load_registry(path):
+    """Import the registry of a SubAgent class
+
+    Parameters
+    ----------
+    path : ``str``
+        Dotted path of the class (`e.g.`,
+        ``AbstractAgents.CameraSubAgent.CameraSubAgent``)
+
+    Returns
+    -------
+    :class:`CommandRegistry`
+        The ``commands`` registry of the class
+    """
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name).commands
+
+
+def validate_script(lines, registries):
+    """Check a DTO command script ahead of time
+
+    Parameters
+    ----------
+    lines : iterable of ``str``
+        The script, one ``target : command`` per line
+    registries : ``dict``
+        Target name: :class:`CommandRegistry`; lines for other targets
+        (`e.g.`, ``dto``, ``sleep``) are not checked
+
+    Returns
+    -------
+    ``list``
+        ``(line number, message)`` for each problem found (empty if none)
+    """
+    problems = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or ":" not in line:
+            continue
+        target, message = (part.strip() for part in line.split(":", 1))
+        registry = registries.get(target)
+        if registry is None:
+            continue
+        try:
+            registry.parse(message)
+        except CommandError as err:
+            problems.append((number, str(err)))
+    return problems
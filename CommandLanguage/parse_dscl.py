@@ -46,7 +46,8 @@ def parse_command(command: str) -> tuple:
 
     # Parse any arguments to the command
     if "(" in command:
-        args = command[command.find("(") + 1 : command.find(")")]
+        # (up to the last parenthesis, so arguments may contain parentheses)
+        args = command[command.find("(") + 1 : command.rfind(")")]
 
         # Get the command without the arguments
         command = command.removesuffix(f"({args})")
@@ -59,8 +60,8 @@ def parse_command(command: str) -> tuple:
             try:
                 arguments[i] = float(arg)
             except ValueError:
-                # Try stripping off any quotes
-                arguments[i] = arg.strip("'").strip('"')
+                # Try stripping off any whitespace and quotes
+                arguments[i] = arg.strip().strip("'").strip('"')
 
     return (command, arguments)
 
@@ -4,6 +4,7 @@ Created on Aept. 19, 2022
 
 """
 import logging
+import queue
 
 import stomp
 import yaml
@@ -29,15 +30,15 @@ class CompositeAgent:
 
     hosts = ""
     log_file = ""
-    current_message = ""
-    current_destination = ""
-    message_received = 0
     agents = []
     incoming_topics = []
 
     def __init__(self, config_file):
 
         print(" In CompositeAgent.__init__()")
+        # Incoming (destination, message, correlation ID), in order of arrival
+        self.messages = queue.Queue()
+
         # Read the config file.
         with open(config_file, "r", encoding="utf-8") as stream:
             try:
@@ -97,6 +98,14 @@ class CompositeAgent:
                 the_agent(self.logger, self.conn, list(agent.values())[0])
             )
 
+        # Let the SubAgents find each other by their configuration names
+        peers = {
+            list(agent.keys())[0]: sub_agent
+            for agent, sub_agent in zip(agent_list, self.agents)
+        }
+        for sub_agent in self.agents:
+            sub_agent.peers = peers
+
     def broker_subscribe(self, topic):
         """Subscribe to a broker topic
 
@@ -125,19 +134,46 @@ class CompositeAgent:
         for agent in self.agents:
             agent.get_status_and_broadcast()
 
-    def handle_message(self):
-        """Handle incoming messages from the broker
+    def handle_message(self, timeout=None):
+        """Handle the next incoming message from the broker
 
-        _extended_summary_
+        Waits for a message to arrive, and hands it to the SubAgent it is
+        addressed to.  The SubAgent is told the message's correlation ID, so
+        its "WAIT" / "GO" replies can be matched to the command by the DTO, and
+        replies "GO" for it if the command finished without replying.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            How long to wait for a message (s); wait indefinitely if ``None``.
+            (Default: None)
+
+        Returns
+        -------
+        bool
+            Whether a message was handled
         """
+        try:
+            destination, message, correlation_id = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return False
+
         # This is the message's destination agent
-        msg_destination = self.current_destination.rsplit(".", 1)[-1]
+        msg_destination = destination.rsplit(".", 1)[-1]
 
         # Loop through the list of "incoming topics" (i.e., "DTO -> Agent")
         # NOTE: Both self.incoming_topics and self.agents are lists in the same order
         for i, incoming_topic in enumerate(self.incoming_topics):
             if incoming_topic.rsplit(".", 1)[-1] == msg_destination:
-                self.agents[i].handle_message(self.current_message)
+                agent = self.agents[i]
+                agent.start_command(correlation_id)
+                try:
+                    agent.handle_message(message)
+                except Exception as err:
+                    agent.reply_to_dto(f"ERROR: {err}")
+                    raise
+                agent.finish_command()
+        return True
 
     class BrokerListener(stomp.ConnectionListener):
         """STOMP broker listener
@@ -160,6 +196,10 @@ class CompositeAgent:
             # print('received a message "%s"' % message)
 
             self.parent.logger.info('received a message "%s"', message.body)
-            self.parent.current_destination = message.headers["destination"]
-            self.parent.current_message = message.body
-            self.parent.message_received = 1
+            self.parent.messages.put(
+                (
+                    message.headers["destination"],
+                    message.body,
+                    message.headers.get("correlation-id"),
+                )
+            )
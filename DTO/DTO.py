@@ -7,27 +7,45 @@ Created on March 11, 2022
 
 import time
 import logging
+import os
+import sys
+import threading
+import uuid
 import stomp
 import yaml
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from CommandLanguage import parse_dscl
+from CommandLanguage.command_registry import load_registry, validate_script
+
 # Set stomp so it only logs WARNING and higher messages. (default is DEBUG)
 logging.getLogger("stomp").setLevel(logging.WARNING)
 
+# STOMP header tagging each command, echoed by the agent in its replies
+CORRELATION_HEADER = "correlation-id"
+
 
 class DTO:
     """Digital Telescope Operator Class
 
-    _extended_summary_
+    Runs a command script: each command is sent to its target agent tagged
+    with a correlation ID, and the next is sent as soon as that agent replies
+    "GO" with the same ID on its reply topic.  An agent replies "WAIT" first
+    if the command takes a while; a command fails if no reply arrives within
+    ``ack_timeout`` seconds, if it is not finished within its timeout, or if
+    the agent replies "ERROR".
     """
 
     hosts = ""
     log_file = ""
     command_input_file = ""
-    message_from_mount = ""
 
     def __init__(self):
 
-        self.message_from_mount = "Go"
+        # Latest reply ("WAIT", "GO" or "ERROR: ...") to each command sent,
+        #  by correlation ID; the condition is notified on every reply
+        self.replies = {}
+        self.reply_received = threading.Condition()
 
         # Read the config file.
         with open("DTO/configure.yaml", "r", encoding="utf-8") as stream:
@@ -35,6 +53,7 @@ class DTO:
                 self.config = yaml.safe_load(stream)
             except yaml.YAMLError as exc:
                 print(exc)
+        self.targets = self.config["targets"]
 
         # Get the log file name from the configuration.
         # Set up the logger.
@@ -68,33 +87,174 @@ class DTO:
             self.dto_logger.error("Connection to broker failed")
 
         self.dto_logger.info("connected to broker")
-        self.dto_logger.info("subscribing to topic: %s", self.config["mount_dto_topic"])
-
-        # Subscribe to messages from "mount_dto_topic"
-        # and "camera_dto_topic".
-        self.conn.subscribe(
-            id=1,
-            destination="/topic/" + self.config["mount_dto_topic"],
-            headers={},
-        )
 
-        self.dto_logger.info("subscribed to topic %s", self.config["mount_dto_topic"])
+        # Subscribe to the reply topic of every target (its agent's
+        # "dto_command_topic").
+        for sub_id, target in enumerate(self.targets.values(), start=1):
+            self.dto_logger.info("subscribing to topic: %s", target["reply_topic"])
+            self.conn.subscribe(
+                id=sub_id,
+                destination="/topic/" + target["reply_topic"],
+                headers={},
+            )
+            self.dto_logger.info("subscribed to topic %s", target["reply_topic"])
 
-        """     self.dto_logger.info(
-            "subscribing to topic: " + self.config["camera_incoming_topic"]
-        )
+        self.command_input_file = self.config["command_input_file"]
+
+    def check_script(self):
+        """Check the command script against the agents' command registries
+
+        The registries are named, per target, by ``command_registries`` in
+        the configuration (target: dotted path of the SubAgent class).
+        Targets without a registry are not checked.
+
+        Returns
+        -------
+        list
+            ``(line number, message)`` for each problem found
+        """
+        registries = {}
+        for target, path in self.config.get("command_registries", {}).items():
+            try:
+                registries[target] = load_registry(path)
+            except (ImportError, AttributeError) as exc:
+                print(f"Not checking {target} commands: {exc}")
+        with open(self.command_input_file, "r", encoding="utf-8") as fp:
+            return validate_script(fp, registries)
+
+    def command_timeout(self, target, command):
+        """How long a command may take before it is considered failed
+
+        Parameters
+        ----------
+        target : str
+            The target the command is sent to
+        command : str
+            The command
+
+        Returns
+        -------
+        float
+            The command's entry in the target's ``command_timeouts``, else the
+            target's ``timeout`` (seconds)
+        """
+        name = parse_dscl.parse_command(command)[0]
+        timeouts = self.targets[target].get("command_timeouts", {})
+        return float(timeouts.get(name, self.targets[target]["timeout"]))
 
-        self.conn.subscribe(
-            id=1,
-            destination="/topic/" + self.config["camera_incoming_topic"],
-            headers={},
+    def send_command(self, target, command):
+        """Send a command to a target, tagged with a new correlation ID
+
+        Parameters
+        ----------
+        target : str
+            The target the command is sent to
+        command : str
+            The command
+
+        Returns
+        -------
+        str
+            The correlation ID
+        """
+        correlation_id = str(uuid.uuid4())
+        with self.reply_received:
+            self.replies[correlation_id] = None
+        self.conn.send(
+            body=command,
+            destination="/topic/" + self.targets[target]["command_topic"],
+            headers={CORRELATION_HEADER: correlation_id},
         )
+        return correlation_id
 
-        self.dto_logger.info(
-            "subscribed to topic " + self.config["camera_incoming_topic"]
-        ) """
+    def wait_for_reply(self, correlation_id, timeout):
+        """Wait until the agent has finished a command
 
-        self.command_input_file = self.config["command_input_file"]
+        Parameters
+        ----------
+        correlation_id : str
+            The correlation ID of the command
+        timeout : float
+            How long the command may take (s)
+
+        Returns
+        -------
+        str
+            The final reply, "GO" or "ERROR: ..."
+
+        Raises
+        ------
+        TimeoutError
+            If the agent does not acknowledge the command within
+            ``ack_timeout`` seconds, or does not finish it within ``timeout``
+        """
+        start = time.monotonic()
+        ack_timeout = min(self.config.get("ack_timeout", 10.0), timeout)
+        with self.reply_received:
+            try:
+                while True:
+                    reply = self.replies[correlation_id]
+                    if reply is not None and reply != "WAIT":
+                        return reply
+                    # Until the first reply, the agent has ack_timeout to answer
+                    limit = timeout if reply == "WAIT" else ack_timeout
+                    remaining = start + limit - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"no reply within {limit:g} s"
+                            if reply is None
+                            else f"not finished within {limit:g} s"
+                        )
+                    self.reply_received.wait(remaining)
+            finally:
+                del self.replies[correlation_id]
+
+    def run_script(self, path):
+        """Run a command script, one command at a time
+
+        Parameters
+        ----------
+        path : str
+            The script, one ``target : command`` per line
+
+        Raises
+        ------
+        RuntimeError
+            If a command fails or times out; the script is stopped there
+        """
+        with open(path, "r", encoding="utf-8") as fp:
+            for number, line in enumerate(fp, start=1):
+                line = line.strip()
+                if not line or ":" not in line:
+                    continue
+                targ, comm = (part.strip() for part in line.split(":", 1))
+                print(line)
+
+                if targ == "sleep":
+                    time.sleep(float(comm))
+                    continue
+                if targ not in self.targets:
+                    self.dto_logger.info("line %d: no agent for %s", number, targ)
+                    continue
+
+                start = time.monotonic()
+                correlation_id = self.send_command(targ, comm)
+                try:
+                    reply = self.wait_for_reply(
+                        correlation_id, self.command_timeout(targ, comm)
+                    )
+                except TimeoutError as exc:
+                    raise RuntimeError(f"line {number}: {targ}: {comm}: {exc}") from exc
+                self.dto_logger.info(
+                    "line %d: %s: %s -> %s in %.2f s",
+                    number,
+                    targ,
+                    comm,
+                    reply,
+                    time.monotonic() - start,
+                )
+                if reply != "GO":
+                    raise RuntimeError(f"line {number}: {targ}: {comm}: {reply}")
 
     class MyListener(stomp.ConnectionListener):
         def __init__(self, parent):
@@ -104,62 +264,33 @@ class DTO:
             print(f'received an error "{message}"')
 
         def on_message(self, message):
-            topic = message.headers["destination"]
-            if self.parent.config["mount_dto_topic"] in topic:
-                print("message from mount: " + message.body)
-                self.parent.message_from_mount = message.body
+            correlation_id = message.headers.get(CORRELATION_HEADER)
+            reply = message.body.strip()
+            # Replies were once sent as "Wait" / "Go"
+            if reply.upper() in ("WAIT", "GO"):
+                reply = reply.upper()
+            print(f"reply from {message.headers['destination']}: {reply}")
+
+            # Replies to commands not sent (or no longer awaited) are ignored
+            with self.parent.reply_received:
+                if correlation_id in self.parent.replies:
+                    self.parent.replies[correlation_id] = reply
+                    self.parent.reply_received.notify_all()
             # self.parent.dto_logger.info('received a message "%s"' % message.body)
 
 
 if __name__ == "__main__":
     dto = DTO()
 
-    # print(dto.command_input_file)
-    with open(dto.command_input_file, "r", encoding="utf-8") as fp:
-        line = fp.readline()
-        cnt = 1
-        while line:
-            # print("Line {}: {}".format(cnt, line.strip()))
-            # Strip line, parse out target and command.
-            print(line)
-            comm = line.strip()
-            targ = comm[0 : comm.find(":")]
-            comm = comm[comm.find(":") + 2 :]
-
-            if "mount" in targ:
-                dto.conn.send(
-                    body=comm,
-                    destination="/topic/" + dto.config["mount_command_topic"],
-                )
-            if "camera" in targ:
-                dto.conn.send(
-                    body=comm,
-                    destination="/topic/" + dto.config["camera_command_topic"],
-                )
-            if "filterwheel" in targ:
-                dto.conn.send(
-                    body=comm,
-                    destination="/topic/" + dto.config["fw_command_topic"],
-                )
-            if "ccdcooler" in targ:
-                dto.conn.send(
-                    body=comm,
-                    destination="/topic/" + dto.config["ccdcooler_command_topic"],
-                )
-            if "sleep" in targ:
-                time.sleep(float(comm))
-            # if "allserv" in targ:
-            #     dto.conn.send(
-            #         body=comm,
-            #         destination="/topic/" + dto.config["camera_command_topic"],
-            #     )
-            #     dto.conn.send(
-            #         body=comm,
-            #         destination="/topic/" + dto.config["mount_command_topic"],
-            #     )
-            time.sleep(1.0)
-            while dto.message_from_mount != "Go":
-                time.sleep(0.1)
-            line = fp.readline()
-            time.sleep(1.0)
-            cnt += 1
+    # Catch mistakes in the script before anything moves
+    problems = dto.check_script()
+    for number, problem in problems:
+        print(f"{dto.command_input_file}, line {number}: {problem}")
+    if problems:
+        sys.exit(1)
+
+    try:
+        dto.run_script(dto.command_input_file)
+    except RuntimeError as exc:
+        print(f"Script stopped at {exc}")
+        sys.exit(1)
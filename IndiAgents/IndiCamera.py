@@ -31,14 +31,21 @@ The likely needed INDI API components for Lorax are:
     CCD_OFFSET - again, may need this
     CCD_DIRECTORY_LOCATION - where to dump the FITS files
     CCD_DIRECTORY_TOGGLE - on or off
+    CCD_COMPRESSION - compressed (``.fits.z``) or raw BLOBs
+
+Compressed BLOBs are requested when ``blob_compression`` is set in the camera
+configuration; the INDI client library inflates them as they arrive.  Frames
+are written in a pool of worker threads.
 """
 
 # Built-In Libraries
+import concurrent.futures
 import datetime
 import io
-import sys
+import threading
 import time
 import uuid
+import warnings
 
 # 3rd Party Libraries
 import astropy.io.fits
@@ -75,22 +82,48 @@ class IndiCamera(CameraSubAgent):
 
         # Get the host and port for the connection to camera.
         # "config", in this case, is just a dictionary.
-        self.indiclient = IndiClient(self, config)
+        self.indiclient = IndiClient(
+            self,
+            config,
+            config["camera_name"],
+            properties=[
+                "CONNECTION",
+                "ACTIVE_DEVICES",
+                "CCD_EXPOSURE",
+                "CCD_FRAME",
+                "CCD_COMPRESSION",
+                "CCD1",
+            ],
+            blob_modes={"CCD1": PyIndi.B_ALSO},
+        )
         # print(self.config)
         self.indiclient.setServer(
             self.config["camera_host"], self.config["camera_port"]
         )
         self.device_status = {}
 
+        # Exposure-end tracking for the pipelined "next filter" mode
+        self.exposure_in_progress = False
+        self.next_filter = None
+        self.next_filter_lock = threading.Lock()
+        # Whether to reconnect the device if the INDI server comes back
+        self.reconnect_device = False
+
+        # Worker pool for writing the received frames
+        self.blob_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.get("blob_workers", 2), thread_name_prefix="blob"
+        )
+        # Number of the last frame written, for the file names
+        self.frame_number = 0
+        # One frame at a time for acquire_frame()
+        self.frame_lock = threading.Lock()
+        self.exposure_end_time = None
+        self.indiclient.register_callback("CCD_EXPOSURE", self.ccd_exposure_updated)
+
         self.indiclient.connectServer()
 
         # Make the connection to the specified device
-        device_ccd = self.indiclient.getDevice(self.config["camera_name"])
-        while not device_ccd:
-            time.sleep(0.5)
-            device_ccd = self.indiclient.getDevice(self.config["camera_name"])
-
-        self.device_ccd = device_ccd
+        self.device_ccd = self.indiclient.wait_for_device()
 
         ##### The following is from SBIGCamera.py::
         # print(self.device_ccd)
@@ -169,38 +202,26 @@ class IndiCamera(CameraSubAgent):
             print(f"Warning: {self.ccd} not in the list of available INDI devices!")
             return
 
-        # Get the device from the INDI server
-        device_ccd = self.indiclient.getDevice(self.ccd)
-        while not device_ccd:
-            print("  Waiting on connection to the camera...")
-            time.sleep(0.5)
-            device_ccd = self.indiclient.getDevice(self.ccd)
-        self.device_ccd = device_ccd
-
-        # Make the connection -- exit if no connection
-        ccd_connect = self.device_ccd.getSwitch("CONNECTION")
-        while not ccd_connect:
-            print("not connected")
-            time.sleep(0.5)
-            ccd_connect = self.device_ccd.getSwitch("CONNECTION")
-        while not device_ccd.isConnected():
-            print("still not connected")
-            ccd_connect[0].s = PyIndi.ISS_ON  # the "CONNECT" switch
-            ccd_connect[1].s = PyIndi.ISS_OFF  # the "DISCONNECT" switch
-            self.indiclient.sendNewSwitch(ccd_connect)
-            time.sleep(0.5)
-        # print(f"Are we connected yet? {self.device_ccd.isConnected()}")
-        if not self.device_ccd.isConnected():
-            sys.exit()
+        # Get the device from the INDI server, and make the connection
+        try:
+            self.device_ccd = self.indiclient.wait_for_device(
+                self.ccd, self.indiclient.timeout
+            )
+            self.indiclient.connect_device(self.ccd, self.indiclient.timeout)
+        except (TimeoutError, ConnectionError) as err:
+            print(f"Warning: Could not connect to {self.ccd}: {err}")
+            return
+        self.reconnect_device = True
 
         # Print a happy acknowledgment
         print(f"The Agent is now connected to {self.ccd}")
 
-        # Tell the INDI server send the "CCD1" blob to this client
-        self.indiclient.setBLOBMode(PyIndi.B_ALSO, self.ccd, "CCD1")
+        # Ask for compressed BLOBs, if so configured
+        self.set_blob_compression(self.config.get("blob_compression", False))
 
     def disconnect_from_camera(self):
         print("INDI Camera: Disconnect from camera (no effect)")
+        self.reconnect_device = False
         return super().disconnect_from_camera()
 
     def expose(self, n_exp=1):
@@ -222,15 +243,18 @@ class IndiCamera(CameraSubAgent):
             Number of exposures to be taken.  (Default: 1)
         """
         if not self.check_camera_connection():
+            self.reply_to_dto(f"ERROR: {self.config['camera_name']} is not connected")
             return
         print("IndiCamera Expose...")
 
         # Check the required exposure properties
         if not self.exptime:
             print("WARNING: Must specify exposure time before exposing!")
+            self.reply_to_dto("ERROR: No exposure time set")
             return
         if not self.exptype:
             print("WARNING: Must specify exposure type before exposing!")
+            self.reply_to_dto("ERROR: No exposure type set")
             return
 
         # Say what we're going to do
@@ -241,10 +265,7 @@ class IndiCamera(CameraSubAgent):
             f"   +++> Sending 'WAIT' to {'/topic/' + self.config['dto_command_topic']}"
         )
 
-        self.conn.send(
-            body="WAIT",
-            destination="/topic/" + self.config["dto_command_topic"],
-        )
+        self.reply_to_dto("WAIT")
 
         # TODO: Need to figure out how to specify things like the exposure
         #       type, binning, and ROI to the INDI server.  Do those things
@@ -256,45 +277,81 @@ class IndiCamera(CameraSubAgent):
         #       Locutus is avaialable, this section will be replaced with code
         #       appropriate for pulling in the FITS header information from
         #       that source.
-        while not (ccd_active_devices := self.device_ccd.getText("ACTIVE_DEVICES")):
-            time.sleep(0.5)
+        try:
+            ccd_active_devices = self.indiclient.wait_for_property(
+                "ACTIVE_DEVICES", timeout=self.indiclient.timeout
+            ).handle
+
+            # Retrieve the CCD_EXPOSURE number vector property from the camera
+            ccd_exposure = self.indiclient.wait_for_property(
+                "CCD_EXPOSURE", timeout=self.indiclient.timeout
+            ).handle
+
+            # Retrieve the CCD1 vector blob property from the camera
+            ccd_ccd1 = self.indiclient.wait_for_property(
+                "CCD1", timeout=self.indiclient.timeout
+            ).handle
+        except (TimeoutError, ConnectionError) as err:
+            print(f"WARNING: Camera not ready to expose: {err}")
+            self.reply_to_dto(f"ERROR: Camera not ready to expose: {err}")
+            return
+        print(f"Got BLOB CCD1 from {self.ccd}")
+
         ccd_active_devices[0].text = "Telescope Simulator"
         self.indiclient.sendNewText(ccd_active_devices)
         # =====================================================================#
 
-        # Retrieve the CCD_EXPOSURE number vector property from the camera
-        while not (ccd_exposure := self.device_ccd.getNumber("CCD_EXPOSURE")):
-            time.sleep(0.5)
-
-        # Retrieve the CCD1 vector blob property from the camera
-        while not (ccd_ccd1 := self.device_ccd.getBLOB("CCD1")):
-            time.sleep(0.5)
-            sys.stderr.write(".")
-        print(f"Got BLOB CCD1 from {self.ccd}")
-
-        # Set up the list of desired exposure time(s)
-        exposures = [self.exptime for _ in range(n_exp)]
+        # Set up the list of desired exposure time(s), and the filter for each
+        #   if a filter sequence has been given
+        filterwheel = self.get_filterwheel()
+        if self.filter_sequence and filterwheel:
+            filters = [filt for filt in self.filter_sequence for _ in range(n_exp)]
+        else:
+            filters = [None] * n_exp
+        exposures = [self.exptime for _ in filters]
+
+        # Put the first filter in place before the first exposure
+        if filters[0] is not None:
+            failure = filterwheel.start_move(filters[0]) or self.wait_for_filter(
+                filterwheel
+            )
+            if failure is not None:
+                print(f"WARNING: {failure}")
+                self.reply_to_dto(f"ERROR: {failure}")
+                return
+        failure = None
 
         # Set up threading so that the next exposure can begin while the
         #   present one is being processed
         self.indiclient.blobEvent.clear()
+        self.exposure_end_time = None
+        processing = []
 
         # Set the ccd_exposure value to the first in the list and send it to
         #   the camera to begin taking the exposure.
-        ccd_exposure[0].value = exposures[0]
-        self.indiclient.sendNewNumber(ccd_exposure)
+        self.start_exposure(ccd_exposure, exposures[0], filters, 0)
 
         # Loop through the number of exposures to be taken
         for i in range(len(exposures)):
 
             # Wait for the ith exposure
             self.indiclient.blobEvent.wait()
-
-            # When it arrives, immediately start the next one
+            if not self.indiclient.is_ready():
+                failure = "INDI server lost during the exposure sequence"
+                print(f"WARNING: {failure}")
+                break
+            self.record_transfer_rate(ccd_ccd1)
+
+            # When it arrives, immediately start the next one (once any filter
+            #   change begun at the end of this exposure is complete)
             if i + 1 < len(exposures):
-                ccd_exposure[0].value = exposures[i + 1]
-                self.indiclient.blobEvent.clear()
-                self.indiclient.sendNewNumber(ccd_exposure)
+                if filters[i + 1] is not None:
+                    # In case the end of the exposure was not seen
+                    self.exposure_ended()
+                    failure = self.wait_for_filter(filterwheel)
+                if failure is None:
+                    self.indiclient.blobEvent.clear()
+                    self.start_exposure(ccd_exposure, exposures[i + 1], filters, i + 1)
 
             # Meanwhile, process the received exposure
             for blob in ccd_ccd1:
@@ -305,22 +362,279 @@ class IndiCamera(CameraSubAgent):
                     f"format: {blob.format}"
                 )
 
-                # Use the PyIndi-supplied getblobdata() method to access the contents of
-                #   the BLOB, which is a bytearray in Python.  Run it through io.BytesIO
-                #   and AstroPy to produce a fully functional FITS HDUList.
-                hdulist = astropy.io.fits.open(io.BytesIO(blob.getblobdata()))
-
-                # Write to disk
-                # TODO: Here is where we'd add the Locutus-supplied FITS header information
-                #       Also, figure out how to do some sort of incremental file numbering
-                #       or something.
-                hdulist.writeto("simimage.fits", overwrite=True)
-
-        # Send the DTO a "GO" message
-        self.conn.send(
-            body="GO",
-            destination="/topic/" + self.config["dto_command_topic"],
-        )
+                # Use the PyIndi-supplied getblobdata() method to copy the contents
+                #   of the BLOB (a bytearray in Python) before the next one arrives,
+                #   and hand it to the worker pool to write.
+                self.frame_number += 1
+                processing.append(
+                    self.blob_pool.submit(
+                        self.save_blob,
+                        blob.getblobdata(),
+                        f"simimage_{self.frame_number:04d}.fits",
+                    )
+                )
+
+            # Stop the sequence if the next filter could not be put in place
+            if failure is not None:
+                print(f"WARNING: {failure}; stopping after exposure {i + 1}")
+                break
+
+        # Wait for the frames to be written
+        for future in concurrent.futures.as_completed(processing):
+            if (err := future.exception()) is not None:
+                warnings.warn(f"Could not save the exposure: {err}")
+
+        # Send the DTO a "GO" message (or why the sequence stopped)
+        self.reply_to_dto("GO" if failure is None else f"ERROR: {failure}")
+
+    def acquire_frame(self, exptime, roi=None):
+        """CameraAgent: Take a single frame and return the image
+
+        The frame is not written to disk, and the DTO is not involved.  The
+        region read out is put back as it was afterwards, so later exposures
+        are not left reading out the region of interest.
+
+        Parameters
+        ----------
+        exptime : ``float``
+            Exposure time in seconds
+        roi : ``tuple``, optional
+            Region of interest ``(x, y, width, height)`` in unbinned pixels;
+            the full frame if not given.  (Default: None)
+
+        Returns
+        -------
+        ``tuple``
+            The image (:obj:`numpy.ndarray`), and the ``(x, y)`` origin of the
+            region read out
+
+        Raises
+        ------
+        ConnectionError
+            If the camera is not connected, or the INDI server is lost
+        TimeoutError
+            If the frame does not arrive in time
+        """
+        if not self.check_camera_connection():
+            raise ConnectionError(f"{self.config['camera_name']} is not connected")
+        timeout = self.indiclient.timeout
+
+        with self.frame_lock:
+            ccd_exposure = self.indiclient.wait_for_property(
+                "CCD_EXPOSURE", timeout=timeout
+            ).handle
+            ccd_frame = self.indiclient.wait_for_property(
+                "CCD_FRAME", timeout=timeout
+            ).handle
+            ccd_ccd1 = self.indiclient.wait_for_property("CCD1", timeout=timeout).handle
+
+            # Set the region read out: X, Y, WIDTH, HEIGHT
+            previous = tuple(elem.value for elem in ccd_frame)
+            if roi is None:
+                roi = (0, 0, ccd_frame[2].max, ccd_frame[3].max)
+            changed = previous != tuple(roi)
+            try:
+                if changed:
+                    for elem, value in zip(ccd_frame, roi):
+                        elem.value = value
+                    self.indiclient.sendNewNumber(ccd_frame)
+
+                self.indiclient.blobEvent.clear()
+                ccd_exposure[0].value = exptime
+                self.indiclient.sendNewNumber(ccd_exposure)
+                if not self.indiclient.blobEvent.wait(exptime + timeout):
+                    raise TimeoutError(f"No frame from {self.ccd} after {exptime}s")
+                if not self.indiclient.is_ready():
+                    raise ConnectionError("INDI server lost during the exposure")
+
+                blob = ccd_ccd1[0]
+                data = blob.getblobdata()
+            finally:
+                # Put the region read out back for the exposures that follow
+                if changed and self.indiclient.is_ready():
+                    for elem, value in zip(ccd_frame, previous):
+                        elem.value = value
+                    self.indiclient.sendNewNumber(ccd_frame)
+
+        image = astropy.io.fits.getdata(io.BytesIO(data))
+        return image, (int(roi[0]), int(roi[1]))
+
+    def set_blob_compression(self, enable):
+        """Ask the driver for compressed (or raw) BLOBs
+
+        Parameters
+        ----------
+        enable : ``bool``
+            Whether the ``CCD1`` BLOBs should be sent compressed
+        """
+        compression = self.indiclient.get_property("CCD_COMPRESSION")
+        if compression is None:
+            if enable:
+                warnings.warn(f"{self.ccd} does not offer compressed BLOBs")
+            return
+        switch = compression.handle
+        switch[0].s = PyIndi.ISS_ON if enable else PyIndi.ISS_OFF  # compressed
+        switch[1].s = PyIndi.ISS_OFF if enable else PyIndi.ISS_ON  # raw
+        self.indiclient.sendNewSwitch(switch)
+        print(f"Requested {'compressed' if enable else 'raw'} BLOBs from {self.ccd}")
+
+    def record_transfer_rate(self, ccd_ccd1):
+        """Record the size and transfer rate of the BLOB just received
+
+        The rate is measured from the end of the exposure to the arrival of
+        the BLOB, so includes the readout, and is put in the device status
+        for the telemetry.
+
+        Parameters
+        ----------
+        ccd_ccd1 : _type_
+            The ``CCD1`` BLOB vector property
+        """
+        size = sum(blob.size for blob in ccd_ccd1) / 1024**2
+        self.device_status["BLOB_SIZE"] = size
+        if self.exposure_end_time is not None and self.indiclient.blob_time:
+            elapsed = self.indiclient.blob_time - self.exposure_end_time
+            if elapsed > 0:
+                self.device_status["BLOB_TRANSFER_RATE"] = size / elapsed
+        self.exposure_end_time = None
+
+    def save_blob(self, data, filename):
+        """Write a frame to disk
+
+        Runs in the worker pool; each frame has a file of its own, so frames
+        may be written concurrently.
+
+        Parameters
+        ----------
+        data : ``bytearray``
+            The BLOB contents
+        filename : ``str``
+            The file to write
+        """
+        # Run it through io.BytesIO and AstroPy to produce a fully functional
+        #   FITS HDUList.
+        hdulist = astropy.io.fits.open(io.BytesIO(data))
+
+        # Write to disk
+        # TODO: Here is where we'd add the Locutus-supplied FITS header information
+        hdulist.writeto(filename, overwrite=True)
+
+    def indi_server_changed(self, connected):
+        """IndiClient callback: the INDI server connection was lost or regained
+
+        Parameters
+        ----------
+        connected : ``bool``
+            Whether the connection (and the property cache) is back
+        """
+        if not connected:
+            self.device_ccd = None
+            # Release an exposure sequence waiting on a BLOB that won't come
+            self.indiclient.blobEvent.set()
+            return
+        self.device_ccd = self.indiclient.getDevice(self.config["camera_name"])
+        if self.reconnect_device:
+            self.connect_to_camera()
+
+    def start_exposure(self, ccd_exposure, exptime, filters, index):
+        """Start one exposure of a sequence
+
+        If the following exposure of the sequence needs a different filter,
+        it is queued so that the filter wheel starts moving as soon as this
+        exposure ends, overlapping the move with the readout and BLOB
+        transfer.
+
+        Parameters
+        ----------
+        ccd_exposure : _type_
+            The ``CCD_EXPOSURE`` number vector property
+        exptime : ``float``
+            Exposure time in seconds
+        filters : ``list``
+            The filter for each exposure of the sequence (``None`` for no
+            filter change)
+        index : ``int``
+            Index of this exposure in the sequence
+        """
+        upcoming = filters[index + 1] if index + 1 < len(filters) else None
+        with self.next_filter_lock:
+            self.next_filter = upcoming if upcoming != filters[index] else None
+            self.exposure_in_progress = True
+        ccd_exposure[0].value = exptime
+        self.indiclient.sendNewNumber(ccd_exposure)
+
+    def ccd_exposure_updated(self, nvp):
+        """Callback for ``CCD_EXPOSURE`` updates from the INDI server
+
+        The exposure has ended (shutter closed, readout beginning) when the
+        countdown reaches zero or the property leaves the Busy state.
+
+        Parameters
+        ----------
+        nvp : _type_
+            The ``CCD_EXPOSURE`` number vector property
+        """
+        if self.exposure_in_progress and (
+            nvp.s != PyIndi.IPS_BUSY or nvp[0].value <= 0
+        ):
+            self.exposure_ended()
+
+    def exposure_ended(self):
+        """Start moving to the next filter of the sequence, if one is queued
+
+        Called from the INDI client thread when the exposure ends; also from
+        :meth:`expose` in case the end of the exposure was not seen.  Only
+        the first call for each exposure has any effect.
+        """
+        # Hold the lock through the (non-blocking) move, so that a concurrent
+        #   caller cannot wait on the filter wheel before the move has begun
+        with self.next_filter_lock:
+            if self.exposure_in_progress:
+                self.exposure_end_time = time.time()
+            self.exposure_in_progress = False
+            next_filter, self.next_filter = self.next_filter, None
+            if next_filter is not None:
+                print(f"Exposure ended, moving to filter {next_filter} during readout")
+                # A failure is left in ``move_error``, for :meth:`wait_for_filter`
+                self.get_filterwheel().start_move(next_filter)
+
+    def wait_for_filter(self, filterwheel):
+        """Wait for the filter wheel to finish its move
+
+        Waits at most ``filter_move_timeout`` seconds (from the configuration,
+        default 60 s).
+
+        Parameters
+        ----------
+        filterwheel : :class:`~AbstractAgents.FilterWheelSubAgent.FilterWheelSubAgent`
+            The filter wheel
+
+        Returns
+        -------
+        ``str``
+            Why the filter is not in place, or ``None`` if it is
+        """
+        timeout = self.config.get("filter_move_timeout", 60.0)
+        if not filterwheel.move_complete.wait(timeout):
+            return f"Filter wheel move not finished after {timeout}s"
+        return filterwheel.move_error
+
+    def get_filterwheel(self):
+        """Return the filter wheel SubAgent named in the configuration
+
+        Returns
+        -------
+        :class:`~AbstractAgents.FilterWheelSubAgent.FilterWheelSubAgent`
+            The filter wheel SubAgent in this CompositeAgent, or ``None`` if
+            there is none (a warning is issued if a filter sequence is set)
+        """
+        filterwheel = self.peers.get(self.config.get("filterwheel_agent"))
+        if filterwheel is None and self.filter_sequence:
+            warnings.warn(
+                "A filter sequence requires `filterwheel_agent` in the camera "
+                "configuration; ignoring the sequence."
+            )
+        return filterwheel
 
     def pause_exposure(self):
         """CameraAgent: Pause an in-progress exposure"""
@@ -22,7 +22,6 @@ interface, contained in the IndiClient module.
 
 # Built-In Libraries
 import datetime
-import sys
 import time
 import uuid
 
@@ -60,7 +59,18 @@ class IndiCcdCooler(CcdCoolerSubAgent):
         super().__init__(logger, conn, config)
         # Get the host and port for the connection to cooler.
         # "config", in this case, is just a dictionary.
-        self.indiclient = IndiClient(self, config)
+        self.indiclient = IndiClient(
+            self,
+            config,
+            config["cooler_name"],
+            properties=[
+                "CONNECTION",
+                "CCD_TEMPERATURE",
+                "CCD_COOLER",
+                "CCD_COOLER_POWER",
+                "CCD_TEMP_RAMP",
+            ],
+        )
         # print(self.config)
         self.indiclient.setServer(
             self.config["cooler_host"], self.config["cooler_port"]
@@ -70,15 +80,12 @@ class IndiCcdCooler(CcdCoolerSubAgent):
         self.indiclient.connectServer()
 
         # Make the connection to the specified device
-        device_cooler = self.indiclient.getDevice(self.config["cooler_name"])
-        while not device_cooler:
-            time.sleep(0.5)
-            device_cooler = self.indiclient.getDevice(self.config["cooler_name"])
-
-        self.device_cooler = device_cooler
+        self.device_cooler = self.indiclient.wait_for_device()
 
         # Define other instance attributes for later population
         self.cooler = None
+        # Whether to reconnect the device if the INDI server comes back
+        self.reconnect_device = False
 
     def connect_to_cooler(self):
         """Connect to the cooler
@@ -95,29 +102,16 @@ class IndiCcdCooler(CcdCoolerSubAgent):
             print(f"Warning: {self.cooler} not in the list of available INDI devices!")
             return
 
-        # Get the device from the INDI server
-        device_cooler = self.indiclient.getDevice(self.cooler)
-        while not device_cooler:
-            print("  Waiting on connection to the cooler...")
-            time.sleep(0.5)
-            device_cooler = self.indiclient.getDevice(self.cooler)
-        self.device_cooler = device_cooler
-
-        # Make the connection -- exit if no connection
-        cooler_connect = self.device_cooler.getSwitch("CONNECTION")
-        while not cooler_connect:
-            print("not connected")
-            time.sleep(0.5)
-            cooler_connect = self.device_cooler.getSwitch("CONNECTION")
-        while not self.device_cooler.isConnected():
-            print("still not connected")
-            cooler_connect[0].s = PyIndi.ISS_ON  # the "CONNECT" switch
-            cooler_connect[1].s = PyIndi.ISS_OFF  # the "DISCONNECT" switch
-            self.indiclient.sendNewSwitch(cooler_connect)
-            time.sleep(0.5)
-        # print(f"Are we connected yet? {self.device_cooler.isConnected()}")
-        if not self.device_cooler.isConnected():
-            sys.exit()
+        # Get the device from the INDI server, and make the connection
+        try:
+            self.device_cooler = self.indiclient.wait_for_device(
+                self.cooler, self.indiclient.timeout
+            )
+            self.indiclient.connect_device(self.cooler, self.indiclient.timeout)
+        except (TimeoutError, ConnectionError) as err:
+            print(f"Warning: Could not connect to {self.cooler}: {err}")
+            return
+        self.reconnect_device = True
 
         # Print a happy acknowledgment
         print(f"The Agent is now connected to {self.cooler}")
@@ -131,6 +125,7 @@ class IndiCcdCooler(CcdCoolerSubAgent):
         self.power_off()
         # Reset parameters
         self.reset_parameters()
+        self.reconnect_device = False
 
     def set_temperature(self, cool_temp, tolerance=1.0):
         """Set the cooler temperature
@@ -147,27 +142,21 @@ class IndiCcdCooler(CcdCoolerSubAgent):
             a "Go" command to the DTO.
         """
         if not self.check_cooler_connection():
+            self.reply_to_dto("ERROR: The cooler is not connected")
             return
         print(f"Setting Cooler Temperature to {cool_temp:.1f}ºC")
 
-        # Get the number vector property, set the new value, and send it back
-        temp = self.device_cooler.getNumber("CCD_TEMPERATURE")
+        # Get the cached number vector property, set the new value, send it back
+        temp = self.indiclient.get_property("CCD_TEMPERATURE").handle
         temp[0].value = float(cool_temp)  ### new temperature to reach
         self.indiclient.sendNewNumber(temp)
 
         # NOTE: This should probably also send a "Wait" command back to the DTO
         #       and should quietly loop until either the temperature reaches
         #       the requested value or a timeout is reached.
-        self.conn.send(
-            body="WAIT", destination="/topic/" + self.config["dto_command_topic"]
-        )
-
-        print(f"Device Status Keys: {list(self.device_status.keys())}")
-        print(f"Device Status: {self.device_status}")
+        self.reply_to_dto("WAIT")
 
-        ccd_cooler_temp = self.device_status["CCD_TEMPERATURE_VALUE"]
-        ccd_cooler_powr = self.device_status["CCD_COOLER_VALUE"]
-        ccd_cooler_ramp = self.device_status["RAMP_SLOPE"]
+        ccd_cooler_temp, ccd_cooler_powr, ccd_cooler_ramp = self.cooler_values()
 
         print(
             f"Temperature difference: {np.abs(ccd_cooler_temp - cool_temp):.1f}Cº  "
@@ -177,7 +166,10 @@ class IndiCcdCooler(CcdCoolerSubAgent):
         )
 
         while np.abs(ccd_cooler_temp - cool_temp) > tolerance:
-            temp = self.device_cooler.getNumber("CCD_TEMPERATURE")
+            if not self.indiclient.is_ready():
+                print("WARNING: INDI server lost while cooling")
+                self.reply_to_dto("ERROR: INDI server lost while cooling")
+                return
             temp[0].value = float(cool_temp)  ### new temperature to reach
             self.indiclient.sendNewNumber(temp)
 
@@ -185,21 +177,61 @@ class IndiCcdCooler(CcdCoolerSubAgent):
             # Broadcast the status while we're waiting
             self.get_status_and_broadcast()
 
-            ccd_cooler_temp = self.device_status["CCD_TEMPERATURE_VALUE"]
-            ccd_cooler_powr = self.device_status["CCD_COOLER_VALUE"]
-            ccd_cooler_ramp = self.device_status["RAMP_SLOPE"]
+            ccd_cooler_temp, ccd_cooler_powr, ccd_cooler_ramp = self.cooler_values()
+            cooler_on = self.indiclient.get_value("CCD_COOLER", "COOLER_ON")
             print(
                 f"CCD Temp: {ccd_cooler_temp:.1f}ºC  "
                 f"Set point: {cool_temp:.1f}ºC  "
                 f"Cooler Ramp: {ccd_cooler_ramp:.3f}Cº/min  "
-                f"Cooler State: {'ON' if self.device_status['COOLER_ON'] else 'OFF'}  "
+                f"Cooler State: {'ON' if cooler_on else 'OFF'}  "
                 f"Cooler Power: {ccd_cooler_powr:.0f}%"
             )
         print(
             f"Cooler is stable at {ccd_cooler_temp:.1f}ºC, cooler power: {ccd_cooler_powr:.0f}%"
         )
-        self.conn.send(
-            body="GO", destination="/topic/" + self.config["dto_command_topic"]
+        self.reply_to_dto("GO")
+
+    def set_cooler_setpoint(self, cool_temp):
+        """Send a new cooler set point
+
+        Unlike :meth:`set_temperature`, this does not wait for the CCD to
+        reach the set point, nor does it message the DTO.
+
+        Parameters
+        ----------
+        cool_temp : ``float``
+            The desired cooler set point in degrees Celsius
+        """
+        if not self.check_cooler_connection():
+            return
+        temp = self.indiclient.get_property("CCD_TEMPERATURE").handle
+        temp[0].value = float(cool_temp)
+        self.indiclient.sendNewNumber(temp)
+
+    def get_temperature(self):
+        """Return the present CCD temperature
+
+        Returns
+        -------
+        ``float``
+            The CCD temperature in degrees Celsius, or ``None`` if it has not
+            been received
+        """
+        return self.indiclient.get_value("CCD_TEMPERATURE", "CCD_TEMPERATURE_VALUE")
+
+    def cooler_values(self):
+        """Return the cached CCD temperature, cooler power and ramp slope
+
+        Returns
+        -------
+        ``tuple``
+            Temperature (ºC), cooler power (%), and temperature ramp slope
+            (ºC/min; 0 if the driver has no ramp property)
+        """
+        return (
+            self.indiclient.get_value("CCD_TEMPERATURE", "CCD_TEMPERATURE_VALUE"),
+            self.indiclient.get_value("CCD_COOLER_POWER", "CCD_COOLER_VALUE"),
+            self.indiclient.get_value("CCD_TEMP_RAMP", "RAMP_SLOPE") or 0.0,
         )
 
     def power_off(self):
@@ -207,11 +239,29 @@ class IndiCcdCooler(CcdCoolerSubAgent):
 
         _extended_summary_
         """
-        cooler_power = self.device_cooler.getSwitch("CCD_COOLER")
+        if not self.check_cooler_connection():
+            self.reply_to_dto("ERROR: The cooler is not connected")
+            return
+        cooler_power = self.indiclient.get_property("CCD_COOLER").handle
         cooler_power[0].s = PyIndi.ISS_OFF  # the "COOLER_ON" switch
         cooler_power[1].s = PyIndi.ISS_ON  # the "COOLER_OFF" switch
         self.indiclient.sendNewSwitch(cooler_power)
         print("INDI CCD Cooler: Power switched off")
 
+    def indi_server_changed(self, connected):
+        """IndiClient callback: the INDI server connection was lost or regained
+
+        Parameters
+        ----------
+        connected : ``bool``
+            Whether the connection (and the property cache) is back
+        """
+        if not connected:
+            self.device_cooler = None
+            return
+        self.device_cooler = self.indiclient.getDevice(self.config["cooler_name"])
+        if self.reconnect_device:
+            self.connect_to_cooler()
+
     def reset_parameters(self):
         pass
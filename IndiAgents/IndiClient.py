@@ -16,7 +16,9 @@ INDI Client -- for communication with INDI-based devices
 """
 
 # Built-In Libraries
+import asyncio
 import threading
+import time
 
 # 3rd Party Libraries
 import PyIndi
@@ -24,6 +26,86 @@ import PyIndi
 # Internal Imports
 
 
+# How to read the element values of each kind of vector property
+ELEMENT_VALUE = {
+    "number": lambda elem: elem.value,
+    "switch": lambda elem: elem.s,
+    "text": lambda elem: elem.text,
+    "light": lambda elem: elem.s,
+    "blob": lambda elem: elem.size,
+}
+
+# INDI property type code -> (kind, accessor for the vector property)
+PROPERTY_KINDS = {
+    PyIndi.INDI_NUMBER: ("number", lambda prop: prop.getNumber()),
+    PyIndi.INDI_SWITCH: ("switch", lambda prop: prop.getSwitch()),
+    PyIndi.INDI_TEXT: ("text", lambda prop: prop.getText()),
+    PyIndi.INDI_LIGHT: ("light", lambda prop: prop.getLight()),
+    PyIndi.INDI_BLOB: ("blob", lambda prop: prop.getBLOB()),
+}
+
+
+def resolve_future(future, result):
+    """Set the result of an asyncio future unless it is already done
+
+    Parameters
+    ----------
+    future : :class:`asyncio.Future`
+        The future to resolve (on its own event loop)
+    result : _type_
+        The result
+    """
+    if not future.done():
+        future.set_result(result)
+
+
+def fail_future(future, exc):
+    """Set the exception of an asyncio future unless it is already done
+
+    Parameters
+    ----------
+    future : :class:`asyncio.Future`
+        The future to fail (on its own event loop)
+    exc : :exc:`Exception`
+        The exception
+    """
+    if not future.done():
+        future.set_exception(exc)
+
+
+class CachedProperty:
+    """An INDI vector property as last reported by the INDI server
+
+    Parameters
+    ----------
+    device : str
+        Name of the INDI device
+    name : str
+        Name of the INDI property
+    kind : str
+        One of ``number``, ``switch``, ``text``, ``light``, ``blob``
+    """
+
+    def __init__(self, device, name, kind):
+        self.device = device
+        self.name = name
+        self.kind = kind
+        # The PyIndi vector property, suitable for ``sendNew*()``
+        self.handle = None
+        # Element name -> value, replaced wholesale on each update
+        self.values = {}
+        self.state = None
+        # Incremented on every update; ``timestamp`` is the Unix time of it
+        self.version = 0
+        self.timestamp = None
+
+    def __repr__(self):
+        return (
+            f"CachedProperty({self.device}.{self.name}, v{self.version}, "
+            f"state={self.state}, {self.values})"
+        )
+
+
 class IndiClient(PyIndi.BaseClient):
     """The INDI client needed for communication with the INDI server
 
@@ -54,16 +136,414 @@ class IndiClient(PyIndi.BaseClient):
         passing information from the client back up to the parent.
     config : dict
         The configuration dictionary
+    device_name : str, optional
+        The INDI device of interest, used as the default device when reading
+        the property cache.  If given, the server is asked to send only this
+        device.  (Default: None)
+    properties : list, optional
+        Properties the SubAgent uses beyond its configured ``status`` list.
+        With ``device_name``, the server is asked to send only these and the
+        ``status`` properties.  (Default: None)
+    blob_modes : dict, optional
+        BLOB policy as ``{property: PyIndi.B_*}``; BLOBs of all other
+        properties of the device are refused (``B_NEVER``).  (Default: None)
     """
 
-    def __init__(self, parent, config):
+    def __init__(
+        self, parent, config, device_name=None, properties=None, blob_modes=None
+    ):
         super().__init__()
 
         # Define various instance attributes
         self.parent = parent
         self.config = config
+        self.device_name = device_name
         self.blobEvent = threading.Event()
+        self.blob_time = None
         self.device = None
+        # Functions to call when a given property is updated
+        self.callbacks = {}
+        # Property cache keyed by (device, property), and the status set
+        self.properties = {}
+        self.status_props = frozenset(config["status"])
+        # Waiters on the cache: threads wait on the condition, asyncio tasks
+        #   register (loop, future, key, predicate) tuples
+        self.cache_updated = threading.Condition()
+        self.async_waiters = []
+        # Default timeout (seconds) for the bounded waits of the SubAgents
+        self.timeout = config.get("indi_timeout", 10.0)
+        # Server-side filtering: the properties to watch, and the BLOB policy
+        self.watched = self.status_props | frozenset(properties or [])
+        self.blob_modes = dict(blob_modes or {})
+        # Reconnection: the generation counts server connections lost, and
+        #   new properties are staged here while the cache is being rebuilt
+        self.generation = 0
+        self.staging = None
+        self.reconnect_thread = None
+        self.reconnect_delays = (
+            config.get("indi_reconnect_min", 1.0),
+            config.get("indi_reconnect_max", 60.0),
+        )
+
+    def connectServer(self):
+        """Connect to the INDI server, subscribing only to what is used
+
+        The device and property watches must be in place before the
+        connection is made, since the server is asked for properties as the
+        connection opens.
+
+        Returns
+        -------
+        bool
+            Whether the connection succeeded
+        """
+        self.subscribe()
+        return super().connectServer()
+
+    def is_ready(self):
+        """Whether the server is connected and the property cache is current
+
+        Returns
+        -------
+        bool
+            ``False`` while the connection is down or being resynchronized
+        """
+        return self.staging is None and self.isServerConnected()
+
+    def subscribe(self):
+        """Ask the server for only the device and properties of interest"""
+        if not self.device_name:
+            return
+        self.watchDevice(self.device_name)
+        for prop_name in sorted(self.watched):
+            self.watchProperty(self.device_name, prop_name)
+
+    def apply_blob_modes(self):
+        """Send the BLOB policy for the device to the server"""
+        if not self.device_name:
+            return
+        self.setBLOBMode(PyIndi.B_NEVER, self.device_name)
+        for prop_name, mode in self.blob_modes.items():
+            self.setBLOBMode(mode, self.device_name, prop_name)
+
+    def register_callback(self, prop_name, func):
+        """Register a function to be called when a property is updated
+
+        The function is called (from the INDI client thread) with the vector
+        property each time a new value arrives from the INDI server, whether
+        or not the property is in the configured ``status`` list.  It must
+        not block.
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property (`e.g.`, ``FILTER_SLOT``)
+        func : callable
+            Function taking the vector property as its only argument
+        """
+        self.callbacks[prop_name] = func
+
+    def get_property(self, prop_name, device=None):
+        """Return a property from the cache
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property (`e.g.`, ``CCD_TEMPERATURE``)
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The cached property, or ``None`` if the server has not sent it
+        """
+        return self.properties.get((device or self.device_name, prop_name))
+
+    def get_value(self, prop_name, element, device=None):
+        """Return the cached value of a single property element
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property (`e.g.`, ``CCD_TEMPERATURE``)
+        element : str
+            Name of the element (`e.g.`, ``CCD_TEMPERATURE_VALUE``)
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+
+        Returns
+        -------
+        The element value, or ``None`` if it has not been received
+        """
+        prop = self.get_property(prop_name, device)
+        return prop.values.get(element) if prop else None
+
+    def update_cache(self, vp, kind, device=None):
+        """Record a new vector property value in the cache
+
+        Parameters
+        ----------
+        vp : _type_
+            The PyIndi vector property
+        kind : str
+            One of ``number``, ``switch``, ``text``, ``light``, ``blob``
+        device : str, optional
+            The device name, if already known.  (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The updated cache entry
+        """
+        key = (device or vp.device, vp.name)
+        with self.cache_updated:
+            # While resynchronizing, build the new cache off to the side
+            cache = self.properties if self.staging is None else self.staging
+            if (entry := cache.get(key)) is None:
+                entry = cache[key] = CachedProperty(*key, kind)
+
+            value_of = ELEMENT_VALUE[kind]
+            entry.handle = vp
+            entry.values = {elem.name: value_of(elem) for elem in vp}
+            entry.state = vp.s
+            entry.timestamp = time.time()
+            entry.version += 1
+            self.notify_waiters(entry)
+        return entry
+
+    def notify_waiters(self, entry=None):
+        """Wake anything waiting on the cache
+
+        Parameters
+        ----------
+        entry : :class:`CachedProperty`, optional
+            The entry just updated, if any.  (Default: None)
+        """
+        with self.cache_updated:
+            self.cache_updated.notify_all()
+            if entry is None:
+                return
+            for waiter in list(self.async_waiters):
+                loop, future, key, predicate = waiter
+                if key == (entry.device, entry.name) and predicate(entry):
+                    self.async_waiters.remove(waiter)
+                    loop.call_soon_threadsafe(resolve_future, future, entry)
+
+    def wait_for_device(self, device=None, timeout=None):
+        """Wait until the INDI server has announced a device
+
+        Parameters
+        ----------
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait before raising :exc:`TimeoutError`; ``None`` waits
+            forever.  (Default: None)
+
+        Returns
+        -------
+        _type_
+            The PyIndi device
+        """
+        device = device or self.device_name
+        with self.cache_updated:
+            if not self.cache_updated.wait_for(lambda: self.getDevice(device), timeout):
+                raise TimeoutError(f"INDI device {device} did not appear")
+        return self.getDevice(device)
+
+    def wait_for_property(self, prop_name, device=None, timeout=None):
+        """Wait until a property is in the cache
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait before raising :exc:`TimeoutError`; ``None`` waits
+            forever.  (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The cached property
+        """
+        return self.wait_for_state(prop_name, lambda prop: True, device, timeout)
+
+    def wait_for_state(self, prop_name, predicate, device=None, timeout=None):
+        """Wait until a cached property satisfies a condition
+
+        The wait wakes on the INDI callback that updates the property; there
+        is no polling.
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property
+        predicate : callable
+            Function taking the :class:`CachedProperty` and returning ``True``
+            when the wait is over (`e.g.`, ``lambda p: p.state ==
+            PyIndi.IPS_OK``)
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait before raising :exc:`TimeoutError`; ``None`` waits
+            forever.  (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The cached property
+
+        Raises
+        ------
+        ConnectionError
+            If the connection to the INDI server is lost during the wait
+        """
+        generation = self.generation
+
+        def ready():
+            if self.generation != generation:
+                raise ConnectionError(f"INDI server lost waiting on {prop_name}")
+            prop = self.get_property(prop_name, device)
+            return prop is not None and predicate(prop)
+
+        with self.cache_updated:
+            if not self.cache_updated.wait_for(ready, timeout):
+                raise TimeoutError(f"Timed out waiting on INDI property {prop_name}")
+        return self.get_property(prop_name, device)
+
+    def connect_device(self, device=None, timeout=None):
+        """Connect the INDI device, waiting for the driver to confirm
+
+        Parameters
+        ----------
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait (for each of the ``CONNECTION`` property and the
+            connection itself) before raising :exc:`TimeoutError`; ``None``
+            waits forever.  (Default: None)
+        """
+
+        def connected(prop):
+            return (
+                prop.values.get("CONNECT") == PyIndi.ISS_ON
+                and prop.state == PyIndi.IPS_OK
+            )
+
+        connection = self.wait_for_property("CONNECTION", device, timeout)
+        if connected(connection):
+            return
+        connection.handle[0].s = PyIndi.ISS_ON  # the "CONNECT" switch
+        connection.handle[1].s = PyIndi.ISS_OFF  # the "DISCONNECT" switch
+        self.sendNewSwitch(connection.handle)
+        self.wait_for_state("CONNECTION", connected, device, timeout)
+
+    async def async_wait_for_property(self, prop_name, device=None, timeout=None):
+        """Asyncio version of :meth:`wait_for_property`
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait before raising :exc:`TimeoutError`; ``None`` waits
+            forever.  (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The cached property
+        """
+        return await self.async_wait_for_state(
+            prop_name, lambda prop: True, device, timeout
+        )
+
+    async def async_wait_for_state(
+        self, prop_name, predicate, device=None, timeout=None
+    ):
+        """Asyncio version of :meth:`wait_for_state`
+
+        The future is resolved on the event loop by the INDI callback thread,
+        so the event loop is never blocked.
+
+        Parameters
+        ----------
+        prop_name : str
+            Name of the INDI property
+        predicate : callable
+            Function taking the :class:`CachedProperty` and returning ``True``
+            when the wait is over; it is called on the INDI client thread
+        device : str, optional
+            Name of the INDI device; ``self.device_name`` if not given.
+            (Default: None)
+        timeout : float, optional
+            Seconds to wait before raising :exc:`TimeoutError`; ``None`` waits
+            forever.  (Default: None)
+
+        Returns
+        -------
+        :class:`CachedProperty`
+            The cached property
+
+        Raises
+        ------
+        ConnectionError
+            If the connection to the INDI server is lost during the wait
+        """
+        key = (device or self.device_name, prop_name)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future, key, predicate)
+
+        with self.cache_updated:
+            prop = self.properties.get(key)
+            if prop is not None and predicate(prop):
+                return prop
+            self.async_waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError as err:
+            raise TimeoutError(
+                f"Timed out waiting on INDI property {prop_name}"
+            ) from err
+        finally:
+            with self.cache_updated:
+                if waiter in self.async_waiters:
+                    self.async_waiters.remove(waiter)
+
+    def property_updated(self, vp, kind, broadcast=True):
+        """Handle a property update: cache, status, and callbacks
+
+        Parameters
+        ----------
+        vp : _type_
+            The PyIndi vector property
+        kind : str
+            One of ``number``, ``switch``, ``text``, ``light``, ``blob``
+        broadcast : bool, optional
+            Broadcast the status if the property is a ``status`` property.
+            (Default: True)
+        """
+        entry = self.update_cache(vp, kind)
+        if entry.name in self.status_props:
+            self.parent.device_status.update(entry.values)
+            if broadcast:
+                self.parent.get_status_and_broadcast()
+        if entry.name in self.callbacks:
+            self.callbacks[entry.name](vp)
 
     def newDevice(self, dp):
         """Emmited when a new device is created from INDI server
@@ -76,6 +556,9 @@ class IndiClient(PyIndi.BaseClient):
         print(f"Receiving Device... {dp.getDeviceName()}")
         self.device = dp
         self.parent.device = dp
+        if dp.getDeviceName() == self.device_name:
+            self.apply_blob_modes()
+        self.notify_waiters()
 
     def newProperty(self, p):
         """Emmited when a new property is created for an INDI driver
@@ -85,14 +568,8 @@ class IndiClient(PyIndi.BaseClient):
         p : _type_
             Pointer to the Property Container
         """
-        # print(dir(p))
-        # print("new property " + p.getName() + " for device " + p.getDeviceName())
-        # print("type = " + str(p.getType()))
-        # Go store the property in the appropriate status dictionary.
-        prop_name = p.getName()
-        if prop_name in self.config["status"]:
-            print(f"Storing property: {p.getName()}")
-            self.store_prop(p)
+        # Go store the property in the cache and the status dictionary.
+        self.store_prop(p)
 
     def removeProperty(self, p):
         """Emmited when a property is deleted for an INDI driver
@@ -102,6 +579,9 @@ class IndiClient(PyIndi.BaseClient):
         p : _type_
             Pointer to the Property Container to remove
         """
+        with self.cache_updated:
+            cache = self.properties if self.staging is None else self.staging
+            cache.pop((p.getDeviceName(), p.getName()), None)
 
     def newBLOB(self, bp):
         """Emmited when a new BLOB value arrives from INDI server
@@ -112,6 +592,7 @@ class IndiClient(PyIndi.BaseClient):
             Pointer to filled and process BLOB
         """
         # print("new BLOB ", bp.name)
+        self.blob_time = time.time()
         self.blobEvent.set()
 
     def newSwitch(self, svp):
@@ -122,11 +603,7 @@ class IndiClient(PyIndi.BaseClient):
         svp : _type_
             Pointer to a switch vector property
         """
-        prop_name = svp.name
-        if prop_name in self.config["status"]:
-            for val in svp:
-                self.parent.device_status[val.name] = val.s
-            self.parent.get_status_and_broadcast()
+        self.property_updated(svp, "switch")
 
     def newNumber(self, nvp):
         """Emmited when a new number value arrives from INDI server
@@ -136,11 +613,7 @@ class IndiClient(PyIndi.BaseClient):
         nvp : _type_
             Pointer to a number vector property
         """
-        prop_name = nvp.name
-        if prop_name in self.config["status"]:
-            for val in nvp:
-                self.parent.device_status[val.name] = val.value
-            self.parent.get_status_and_broadcast()
+        self.property_updated(nvp, "number")
 
     def newText(self, tvp):
         """Emmited when a device is deleted from INDI server
@@ -150,11 +623,7 @@ class IndiClient(PyIndi.BaseClient):
         tvp : _type_
             Pointer to a text vector property
         """
-        prop_name = tvp.name
-        if prop_name in self.config["status"]:
-            for val in tvp:
-                self.parent.device_status[val.name] = val.text
-            self.parent.get_status_and_broadcast()
+        self.property_updated(tvp, "text")
 
     def newLight(self, lvp):
         """Emmited when a new light value arrives from INDI server
@@ -164,6 +633,7 @@ class IndiClient(PyIndi.BaseClient):
         lvp : _type_
             Pointer to a light vector property
         """
+        self.property_updated(lvp, "light")
 
     def newMessage(self, dp, messageID):
         """Emmited when a new message arrives from INDI server
@@ -183,6 +653,10 @@ class IndiClient(PyIndi.BaseClient):
     def serverDisconnected(self, exit_code):
         """Emmited when the server gets disconnected
 
+        Unless the disconnection was requested, pending waits are failed with
+        :exc:`ConnectionError`, the parent SubAgent is told, and a background
+        thread reconnects.
+
         Parameters
         ----------
         exit_code : _type_
@@ -190,45 +664,82 @@ class IndiClient(PyIndi.BaseClient):
             -1 if connection to server is terminated due to remote server
                disconnection
         """
+        if exit_code == 0:
+            return
+        print(f"INDI server connection lost (exit code {exit_code})")
+
+        with self.cache_updated:
+            # The old property handles die with the connection
+            self.generation += 1
+            self.properties = {}
+            self.staging = {}
+            self.device = None
+            self.parent.device_status.clear()
+            error = ConnectionError("INDI server connection lost")
+            for loop, future, _, _ in self.async_waiters:
+                loop.call_soon_threadsafe(fail_future, future, error)
+            self.async_waiters.clear()
+            self.cache_updated.notify_all()
+
+        self.parent.indi_server_changed(False)
+
+        # Reconnect from a thread of our own, not the dying listener thread
+        if not (self.reconnect_thread and self.reconnect_thread.is_alive()):
+            self.reconnect_thread = threading.Thread(target=self.reconnect, daemon=True)
+            self.reconnect_thread.start()
+
+    def reconnect(self):
+        """Reconnect to the INDI server with exponential backoff
+
+        The device and property watches are re-sent by :meth:`connectServer`
+        and the BLOB policy when the device reappears; once the server has
+        finished sending the device's properties, the rebuilt cache replaces
+        the old one in one step.
+        """
+        delay, max_delay = self.reconnect_delays
+        while True:
+            print(f"Reconnecting to the INDI server in {delay:.1f}s...")
+            time.sleep(delay)
+            if self.connectServer():
+                break
+            delay = min(2 * delay, max_delay)
+
+        # Let the initial burst of property definitions arrive
+        try:
+            self.wait_for_device(timeout=self.timeout)
+        except TimeoutError as err:
+            print(f"Warning: {err} after reconnecting")
+        with self.cache_updated:
+            deadline = time.monotonic() + self.timeout
+            while time.monotonic() < deadline and self.cache_updated.wait(
+                self.config.get("indi_resync_quiet", 0.5)
+            ):
+                pass
+            self.properties, self.staging = self.staging, None
+            # The status follows the cache: only what the server sent anew
+            self.parent.device_status.clear()
+            for entry in self.properties.values():
+                if entry.name in self.status_props:
+                    self.parent.device_status.update(entry.values)
+            self.cache_updated.notify_all()
+        print(f"INDI server reconnected; {len(self.properties)} properties cached")
+
+        self.parent.indi_server_changed(True)
 
     def store_prop(self, prop):
         """Store a property
 
-        _extended_summary_
+        The property is added to the cache, and to the parent's status
+        dictionary if it is one of the configured ``status`` properties.
 
         Parameters
         ----------
         prop : _type_
-            _description_
-        """
-        prop_name = prop.getName()
-        print(f"Property Name: {prop_name}")
-        prop_type = prop.getType()
-        if prop_name in self.config["status"]:
-            if prop_type == 0:
-                # Number Type
-                temp = prop.getNumber()
-                for val in temp:
-                    # if val.name in self.config["status"]:
-                    self.parent.device_status[val.name] = val.value
-
-            elif prop_type == 1:
-                # Switch type
-                temp = prop.getSwitch()
-                for val in temp:
-                    # if val.name in self.config["status"]:
-                    self.parent.device_status[val.name] = val.s
-
-            elif prop_type == 2:
-                # Text type
-                temp = prop.getText()
-                for val in temp:
-                    # if val.name in self.config["status"]:
-                    self.parent.device_status[val.name] = val.text
-
-            elif prop_type == 3:
-                # Light type
-                temp = prop.getLight()
-                for val in temp:
-                    # if val.name in self.config["status"]:
-                    self.parent.device_status[val.name] = val.text
+            Pointer to the Property Container
+        """
+        if (kind_accessor := PROPERTY_KINDS.get(prop.getType())) is None:
+            return
+        kind, accessor = kind_accessor
+        entry = self.update_cache(accessor(prop), kind, prop.getDeviceName())
+        if entry.name in self.status_props:
+            self.parent.device_status.update(entry.values)
@@ -1,11 +1,32 @@
+# -*- coding: utf-8 -*-
+#
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+#  Created on 21-Oct-2022
+#
+#  @author: dlytle, tbowers
+
+"""Lorax FilterWheel Agent for INDI-based filter wheels
+
+This module is part of the Lorax-TNG package, written at Lowell Observatory.
+
+This Filter Wheel Agent concerns itself with the filter wheel aspects of the
+INDI device.  This agent is called from the CompositeAgent class by
+instruction from the instrument-specific configuration file.
+
+Hardware control of the filter wheel is accomplished through an INDI
+interface, contained in the IndiClient module.  Moves are sent without
+polling; completion is signalled to the DTO when the ``FILTER_SLOT`` property
+returns to the Ok state at the requested slot.
+"""
+
 # Built-In Libraries
-import datetime
-import time
-import uuid
+import warnings
 
 # 3rd Party Libraries
-import numpy as np
-import xmltodict
+import PyIndi
 
 # Internal Imports
 from AbstractAgents.FilterWheelSubAgent import FilterWheelSubAgent
@@ -13,9 +34,11 @@ from IndiAgents.IndiClient import IndiClient
 
 
 class IndiFilterWheel(FilterWheelSubAgent):
-    """SBIG Filter Wheel SubAgent
+    """INDI Filter Wheel Agent (SubAgent to CompositeAgent)
 
-    _extended_summary_
+    This class handles all of the hardware-specific portions of the
+    FilterWheelAgent implementation, leaving the more general, generic methods
+    for the abstract parent class.
 
     Parameters
     ----------
@@ -28,53 +51,256 @@ class IndiFilterWheel(FilterWheelSubAgent):
     """
 
     def __init__(self, logger, conn, config):
-        print("in SBIGFilterWheel.init")
+        print(
+            f"   ---> Initializing the INDI Filter Wheel SubAgent for {config['fw_name']}"
+        )
         super().__init__(logger, conn, config)
 
         # Get the host and port for the connection to filter wheel.
         # "config", in this case, is just a dictionary.
-        self.indiclient = IndiClient(self, config)
+        self.indiclient = IndiClient(
+            self,
+            config,
+            config["fw_name"],
+            properties=["CONNECTION", "FILTER_SLOT", "FILTER_NAME"],
+        )
         self.indiclient.setServer(self.config["fw_host"], self.config["fw_port"])
         self.device_status = {}
 
+        # Cached property handles and the name <-> slot maps
+        self.slot_property = None
+        self.name_property = None
+        self.filter_slots = {}
+        self.filter_names = {}
+
+        # Move bookkeeping, updated from the INDI client thread; the
+        #  correlation ID is that of the command that started the move, and
+        #  moves started by a peer (the camera) send the DTO no replies
+        self.target_slot = None
+        self.move_correlation_id = None
+        self.move_replies = False
+        # Whether to reconnect the device if the INDI server comes back
+        self.reconnect_device = False
+
+        # Watch the slot for move completion, and the names for the maps
+        self.indiclient.register_callback("FILTER_SLOT", self.filter_slot_updated)
+        self.indiclient.register_callback("FILTER_NAME", self.filter_names_updated)
+
         self.indiclient.connectServer()
 
-        device_ccd = self.indiclient.getDevice(self.config["fw_name"])
-        while not device_ccd:
-            time.sleep(0.5)
-            device_ccd = self.indiclient.getDevice(self.config["fw_name"])
+        # Make the connection to the specified device
+        self.filterwheel = self.config["fw_name"]
+        self.device_filterwheel = self.indiclient.wait_for_device()
+
+    def connect_to_filterwheel(self):
+        """Connect to the filter wheel
 
-        self.device_ccd = device_ccd
+        Connect to the filter wheel and cache the ``FILTER_SLOT`` and
+        ``FILTER_NAME`` property handles.
+        """
+        # Make the connection, and cache the property handles; these remain
+        #  valid while connected
+        timeout = self.indiclient.timeout
+        try:
+            self.indiclient.connect_device(timeout=timeout)
+            self.slot_property = self.indiclient.wait_for_property(
+                "FILTER_SLOT", timeout=timeout
+            ).handle
+            self.name_property = self.indiclient.wait_for_property(
+                "FILTER_NAME", timeout=timeout
+            ).handle
+        except (TimeoutError, ConnectionError) as err:
+            print(f"Warning: Could not connect to {self.filterwheel}: {err}")
+            return
+        self.reconnect_device = True
+        self.filter_names_updated(self.name_property)
+
+        # Print a happy acknowledgment
+        print(
+            f"The Agent is now connected to {self.filterwheel}, "
+            f"filters: {self.filter_names}"
+        )
 
-        # slot = self.device_ccd.getNumber("FILTER_SLOT")
-        # print(slot)
-        # slot[0].value = np.int(0)  # new position to reach
-        # self.indiclient.sendNewNumber(slot)
+    def disconnect_from_filterwheel(self):
+        """Disconnect from the filter wheel"""
+        if self.device_filterwheel is None:
+            print(f"Warning: {self.filterwheel} is not available from the INDI server")
+        else:
+            fw_connect = self.device_filterwheel.getSwitch("CONNECTION")
+            fw_connect[0].s = PyIndi.ISS_OFF  # the "CONNECT" switch
+            fw_connect[1].s = PyIndi.ISS_ON  # the "DISCONNECT" switch
+            self.indiclient.sendNewSwitch(fw_connect)
 
-        # ---------
+        self.slot_property = None
+        self.name_property = None
+        # Fail any move in progress rather than leave the DTO waiting
+        if self.target_slot is not None:
+            self.move_error = f"Disconnected moving to slot {self.target_slot}"
+            self.reply_to_move("ERROR: disconnected")
+            self.target_slot = None
+        self.move_complete.set()
+        self.reconnect_device = False
+        print("INDI Filter Wheel: Disconnected")
 
-        # List out the devices available from the INDI server
-        devlist = [d.getDeviceName() for d in self.indiclient.getDevices()]
-        print(f"This is the list of connected devices: {devlist}")
+    def indi_server_changed(self, connected):
+        """IndiClient callback: the INDI server connection was lost or regained
 
-        # Check that the desired CCD is in the list of devices on the INDI server
-        self.ccd = self.config["fw_name"]
-        if self.ccd not in devlist:
-            print(f"Warning: {self.ccd} not in the list of available INDI devices!")
+        Parameters
+        ----------
+        connected : ``bool``
+            Whether the connection (and the property cache) is back
+        """
+        if connected:
+            self.device_filterwheel = self.indiclient.getDevice(self.filterwheel)
+            if self.reconnect_device:
+                self.connect_to_filterwheel()
             return
 
-        # Get the device from the INDI server
-        device_ccd = self.indiclient.getDevice(self.ccd)
-        while not device_ccd:
-            print("  Waiting on connection to the CCD Camera...")
-            time.sleep(0.5)
-            device_ccd = self.indiclient.getDevice(self.ccd)
-        self.device_ccd = device_ccd
-        # ----------
-
-    def move(self, position):
-        """Move the filter wheel"""
-        print(f"Setting filter wheel position to {position}")
-        slot = self.device_filterwheel.getNumber("FILTER_SLOT")
-        slot[0].value = int(position)  # new position to reach
-        self.indiclient.sendNewNumber(slot)
+        self.device_filterwheel = None
+        self.slot_property = None
+        self.name_property = None
+        # Fail any move in progress rather than leave the DTO waiting
+        if self.target_slot is not None:
+            warnings.warn(f"INDI server lost moving to slot {self.target_slot}")
+            self.move_error = f"INDI server lost moving to slot {self.target_slot}"
+            self.reply_to_move(f"ERROR: {self.move_error}")
+            self.target_slot = None
+            self.move_complete.set()
+
+    def home(self):
+        """Home the filter wheel
+
+        INDI filter wheels have no homing command; move to the first slot.
+        """
+        self.move(1)
+
+    def move(self, slot):
+        """Move the filter wheel
+
+        The move is sent and this method returns immediately; the DTO is sent
+        "WAIT" now and "GO" from :meth:`filter_slot_updated` when the wheel
+        reports it has arrived, or "ERROR" if the move cannot be made.
+
+        Parameters
+        ----------
+        slot : ``int``, ``float``, or ``str``
+            The slot number (1-based) or filter name to move to
+
+        Returns
+        -------
+        ``bool``
+            Whether the move was started (if not, ``move_error`` says why)
+        """
+        if (failure := self.start_move(slot, replies=True)) is not None:
+            warnings.warn(failure)
+            self.reply_to_dto(f"ERROR: {failure}")
+            return False
+        return True
+
+    def start_move(self, slot, replies=False):
+        """Start a move of the filter wheel
+
+        Used by peers (`e.g.`, a camera running a filter sequence), which
+        wait on ``move_complete`` and report ``move_error`` on their own
+        command; by default, the DTO is sent no replies for the move.
+
+        Parameters
+        ----------
+        slot : ``int``, ``float``, or ``str``
+            The slot number (1-based) or filter name to move to
+        replies : ``bool``, optional
+            Whether to send the DTO "WAIT" now and "GO" or "ERROR" when the
+            move ends, for the command being handled.  (Default: False)
+
+        Returns
+        -------
+        ``str``
+            Why the move cannot be made (also put in ``move_error``), or
+            ``None`` if it was started
+        """
+        if not self.check_filterwheel_connection() or not self.slot_property:
+            self.move_error = f"{self.filterwheel} is not connected"
+            return self.move_error
+
+        # Translate a filter name through the cached map
+        if isinstance(slot, str):
+            if slot not in self.filter_slots:
+                self.move_error = (
+                    f"Unknown filter {slot}; available: {list(self.filter_slots)}"
+                )
+                return self.move_error
+            slot = self.filter_slots[slot]
+        slot = int(slot)
+
+        if not self.slot_property[0].min <= slot <= self.slot_property[0].max:
+            self.move_error = f"Filter slot {slot} is out of range"
+            return self.move_error
+
+        print(
+            f"Setting filter wheel position to {slot} "
+            f"({self.filter_names.get(slot, 'unnamed')})"
+        )
+        # Any move still in progress is superseded by this one
+        if self.target_slot is not None:
+            self.reply_to_move(f"ERROR: Move to slot {self.target_slot} superseded")
+        if replies:
+            self.reply_to_dto("WAIT")
+        self.move_replies = replies
+        self.move_correlation_id = self.correlation_id if replies else None
+        self.target_slot = slot
+        self.move_error = None
+        self.move_complete.clear()
+        self.slot_property[0].value = slot
+        self.indiclient.sendNewNumber(self.slot_property)
+        return None
+
+    def reply_to_move(self, reply):
+        """Send the DTO the final reply to a move, if it was a DTO command
+
+        Parameters
+        ----------
+        reply : ``str``
+            "GO" or "ERROR: ..."
+        """
+        if self.move_replies:
+            self.reply_from_thread(reply, self.move_correlation_id)
+
+    def filter_slot_updated(self, nvp):
+        """Callback for ``FILTER_SLOT`` updates from the INDI server
+
+        When a move is pending and the property leaves the Busy state, the
+        move is finished: tell the DTO to go.
+
+        Parameters
+        ----------
+        nvp : _type_
+            The ``FILTER_SLOT`` number vector property
+        """
+        if self.target_slot is None or nvp.s == PyIndi.IPS_BUSY:
+            return
+
+        if nvp.s == PyIndi.IPS_ALERT:
+            warnings.warn(f"Filter wheel move to slot {self.target_slot} failed")
+            self.move_error = f"Filter wheel move to slot {self.target_slot} failed"
+            reply = f"ERROR: {self.move_error}"
+        elif int(nvp[0].value) != self.target_slot:
+            # A stale update from before the move was accepted
+            return
+        else:
+            print(f"Filter wheel arrived at slot {self.target_slot}")
+            reply = "GO"
+
+        self.target_slot = None
+        self.move_complete.set()
+        self.reply_to_move(reply)
+
+    def filter_names_updated(self, tvp):
+        """Callback for ``FILTER_NAME`` updates: rebuild the name <-> slot maps
+
+        Parameters
+        ----------
+        tvp : _type_
+            The ``FILTER_NAME`` text vector property
+        """
+        self.filter_names = {i + 1: val.text for i, val in enumerate(tvp)}
+        self.filter_slots = {name: slot for slot, name in self.filter_names.items()}
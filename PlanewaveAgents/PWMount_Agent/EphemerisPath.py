@@ -0,0 +1,140 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Non-sidereal tracking from an ephemeris table, through the PWI4 custom path.
+
+An ephemeris table has one row per epoch: Julian date, J2000 RA (hours),
+J2000 Dec (degrees), separated by whitespace or commas, with "#" comments.
+The table is resampled to an even spacing (NumPy, all points at once) and
+sent to PWI4 in chunks of many points per POST, rather than one HTTP call
+per point as with mount_radecpath_add_point.
+
+Moving targets with cached orbital elements can be tracked the same way,
+with the path computed locally by Astronomy.OrbitPropagator.
+"""
+
+import time
+
+import numpy as np
+
+from Astronomy.OrbitPropagator import OrbitalElements, propagate
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def julian_date_now():
+    return time.time() / 86400.0 + UNIX_EPOCH_JD
+
+
+def load_ephemeris(path):
+    """
+    Read an ephemeris table, returning arrays of jd, ra_hours, dec_degs
+    sorted by time.
+    """
+    with open(path) as f:
+        text = f.read().replace(",", " ")
+    table = np.loadtxt(text.splitlines(), ndmin=2)
+    if table.shape[1] < 3 or len(table) < 2:
+        raise ValueError("%s: need at least 2 rows of jd, ra_hours, dec_degs" % path)
+    order = np.argsort(table[:, 0])
+    return table[order, 0], table[order, 1], table[order, 2]
+
+
+def resample_ephemeris(jd, ra_hours, dec_degs, step_seconds, start=None, end=None):
+    """
+    Resample an ephemeris to points step_seconds apart between start and
+    end (Julian dates, defaulting to the ends of the table).
+
+    The positions are interpolated as unit vectors, so the result is
+    correct across RA = 0h and near the poles.
+    """
+    jd = np.asarray(jd, dtype=float)
+    start = jd[0] if start is None else max(start, jd[0])
+    end = jd[-1] if end is None else min(end, jd[-1])
+    if end <= start:
+        raise ValueError("Ephemeris does not cover the requested time range")
+
+    step = step_seconds / 86400.0
+    new_jd = np.arange(start, end, step)
+    if new_jd[-1] < end:
+        new_jd = np.append(new_jd, end)
+
+    ra = np.radians(np.asarray(ra_hours, dtype=float) * 15.0)
+    dec = np.radians(np.asarray(dec_degs, dtype=float))
+    xyz = np.stack((np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)))
+    x, y, z = (np.interp(new_jd, jd, component) for component in xyz)
+
+    new_ra = np.degrees(np.arctan2(y, x)) / 15.0 % 24.0
+    new_dec = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    return new_jd, new_ra, new_dec
+
+
+def upload_path(pwi4, jd, ra_hours, dec_degs, coord_type="raj2000", chunk_points=1000):
+    """
+    Replace the PWI4 custom path with the given points, sent chunk_points
+    per request, and start following it. Returns the PWI4 status from the
+    apply request.
+    """
+    pwi4.mount_custom_path_new(coord_type)
+    for i in range(0, len(jd), chunk_points):
+        pwi4.mount_custom_path_add_point_list(
+            zip(
+                jd[i : i + chunk_points].tolist(),
+                ra_hours[i : i + chunk_points].tolist(),
+                dec_degs[i : i + chunk_points].tolist(),
+            )
+        )
+    return pwi4.mount_custom_path_apply()
+
+
+def track_ephemeris(
+    pwi4, path, step_seconds=10.0, coord_type="raj2000", chunk_points=1000
+):
+    """
+    Load an ephemeris table, resample it from now (less one step) to its
+    end, and have the mount follow it. Returns the PWI4 status.
+    """
+    jd, ra_hours, dec_degs = load_ephemeris(path)
+    now = julian_date_now()
+    if now > jd[-1]:
+        raise ValueError("%s: ephemeris ended at JD %.5f" % (path, jd[-1]))
+    if now < jd[0]:
+        print("Warning: %s starts in the future, at JD %.5f" % (path, jd[0]))
+
+    new_jd, new_ra, new_dec = resample_ephemeris(
+        jd, ra_hours, dec_degs, step_seconds, start=now - step_seconds / 86400.0
+    )
+    print(
+        "Uploading %d ephemeris points (%d requests)"
+        % (len(new_jd), -(-len(new_jd) // chunk_points))
+    )
+    return upload_path(pwi4, new_jd, new_ra, new_dec, coord_type, chunk_points)
+
+
+def track_orbit(
+    pwi4,
+    elements_path,
+    name,
+    hours=12.0,
+    step_seconds=10.0,
+    site=None,
+    coord_type="raj2000",
+    chunk_points=1000,
+):
+    """
+    Compute the topocentric path of the named object over the next hours
+    from its cached orbital elements, and have the mount follow it.
+    site is (latitude, east longitude, elevation in m); the path is
+    geocentric if it is not given. Returns the PWI4 status.
+    """
+    elements = OrbitalElements.load(elements_path).select([name])
+    step = step_seconds / 86400.0
+    jd = julian_date_now() - step + np.arange(0.0, hours / 24.0 + 2 * step, step)
+    ra_hours, dec_degs, _ = propagate(elements, jd, *(site or ()))
+    print(
+        "Uploading %d points for %s (%d requests)"
+        % (len(jd), name, -(-len(jd) // chunk_points))
+    )
+    return upload_path(pwi4, jd, ra_hours[0], dec_degs[0], coord_type, chunk_points)
@@ -0,0 +1,108 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Starting PWI4 and waiting for it to be ready.
+
+Whether PWI4 is up is decided by asking it: if its HTTP /status endpoint
+answers, it is running, whoever started it. Otherwise PWI4 is launched,
+the launched process is kept (so we know at once if it dies), and /status
+is polled, at short intervals that grow to a maximum, until it answers.
+Startup then takes only as long as PWI4 needs, and no scan of the host's
+processes is made.
+"""
+
+import os
+import subprocess
+import time
+
+
+class PWI4Process(object):
+    """
+    The PWI4 process, if we launched it.
+    """
+
+    def __init__(
+        self,
+        command="./run-pwi4",
+        directory="/home/lorax/PWI4/pwi-4.0.11beta10",
+        display=":6.1",
+    ):
+        self.command = command
+        self.directory = directory
+        self.display = display
+        self.process = None
+
+    @property
+    def pid(self):
+        return None if self.process is None else self.process.pid
+
+    def running(self):
+        """
+        True if the PWI4 we launched is still running.
+        """
+        return self.process is not None and self.process.poll() is None
+
+    @staticmethod
+    def probe(get_status):
+        """
+        Ask PWI4 for its status; returns it, or None if PWI4 doesn't answer.
+        """
+        try:
+            return get_status()
+        except Exception:
+            # Connection refused or reset, or an error while PWI4 starts up
+            return None
+
+    def start(self):
+        """
+        Launch PWI4 as a separate process.
+        """
+        env = dict(os.environ)
+        if self.display:
+            # A "virtual" display so X will work without a screen.
+            env["DISPLAY"] = self.display
+        self.process = subprocess.Popen(
+            self.command, cwd=self.directory, env=env, start_new_session=True
+        )
+        print("Started PWI4, pid %d" % self.process.pid)
+
+    def wait_until_ready(
+        self, get_status, timeout=60.0, min_interval=0.1, max_interval=2.0
+    ):
+        """
+        Poll PWI4's status until it answers, doubling the interval between
+        polls from min_interval up to max_interval. Returns the first status.
+        Raises RuntimeError if the launched process exits, or TimeoutError if
+        PWI4 has not answered after timeout seconds.
+        """
+        start = time.monotonic()
+        interval = min_interval
+        while True:
+            status = self.probe(get_status)
+            if status is not None:
+                print("PWI4 ready after %.1f s" % (time.monotonic() - start))
+                return status
+            if self.process is not None and self.process.poll() is not None:
+                raise RuntimeError(
+                    "PWI4 exited with code %d during startup" % self.process.returncode
+                )
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                raise TimeoutError("PWI4 did not answer within %.0f s" % timeout)
+            time.sleep(min(interval, remaining))
+            interval = min(2.0 * interval, max_interval)
+
+    def stop(self, timeout=10.0):
+        """
+        Stop the PWI4 we launched (nothing is done to one we didn't).
+        """
+        if not self.running():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
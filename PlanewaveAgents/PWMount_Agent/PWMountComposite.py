@@ -2,7 +2,6 @@
 import inspect
 import os
 import sys
-import time
 
 # 3rd Party Libraries
 
@@ -28,21 +27,12 @@ class PWMountComposite(CompositeAgent):
         CompositeAgent.__init__(self, config_file)
         print("in PWMountComposite.init")
 
-    def get_status_and_broadcast(self):
-        # Send "get_status_and_broadcast" to each of the sub_agents.
-        for agent in self.agents:
-            agent.get_status_and_broadcast()
-        time.sleep(self.config["message_wait_time"])
-
 
 if __name__ == "__main__":
     print(" in main ")
     PWMount_comp = PWMountComposite("PWMount_Agent/PWMountConfig.yaml")
     print(" in main after instantiate ")
     while True:
-        if PWMount_comp.message_received:
-            PWMount_comp.handle_message()
-            PWMount_comp.message_received = 0
-        else:
+        # Handle commands as they arrive; broadcast status when idle
+        if not PWMount_comp.handle_message(PWMount_comp.config["message_wait_time"]):
             PWMount_comp.get_status_and_broadcast()
-        time.sleep(PWMount_comp.config["message_wait_time"])
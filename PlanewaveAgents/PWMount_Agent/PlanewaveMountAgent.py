@@ -5,7 +5,6 @@ Created on Feb 3, 2022
 
 """
 
-import time
 import logging
 from typing_extensions import Self
 import stomp
@@ -17,12 +16,21 @@ import xmltodict
 import uuid
 import datetime
 
-from PlanewaveMountTalk import PlanewaveMountTalk
-
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parentdir = os.path.dirname(currentdir)
 sys.path.insert(0, parentdir)
+# The sibling modules, also when imported from elsewhere (e.g. the DTO
+# checking a script against the command registry)
+sys.path.insert(0, currentdir)
+
+from PlanewaveMountTalk import PlanewaveMountTalk
+from SlewTracker import SlewTracker
+from SlewTimeModel import SlewTimeModel, load_slew_log, record_slew
+from PointingModelRun import PointingModelRun
+from SpiralAcquisition import SpiralAcquisition
 from AbstractAgents.SubAgent import SubAgent
+from Astronomy.Coordinates import julian_date, radec_to_altaz
+from CommandLanguage.command_registry import Arg, CommandError, CommandRegistry
 
 # Set stomp so it only logs WARNING and higher messages. (default is DEBUG)
 logging.getLogger("stomp").setLevel(logging.WARNING)
@@ -36,7 +44,11 @@ class PlanewaveMountAgent(SubAgent):
     current_message = ""
     message_received = 0
     mount_status = ""
-    wait_list = ["gotoAltAz", "gotoRaDecJ2000", "homeMount", "parkMount"]
+
+    # The agent's own commands, plus the mount commands (those flagged
+    # waits hold the DTO until the mount has settled)
+    commands = CommandRegistry("mount", parent=SubAgent.commands)
+    commands.include(PlanewaveMountTalk.commands, "planewave_mount_talk")
 
     def __init__(self, logger, conn, config):
         print("in PlanewaveMountAgent.init")
@@ -56,7 +68,10 @@ class PlanewaveMountAgent(SubAgent):
 
     def get_status_and_broadcast(self):
         self.planewave_mount_talk.send_command_to_mount("status")
-        time.sleep(0.01)
+        self.broadcast_mount_status()
+
+    def broadcast_mount_status(self, extra=None):
+        # Broadcast self.mount_status, plus any extra fields (e.g. slew progress)
         mydict = {
             "mount_status": {
                 "message_id": uuid.uuid4(),
@@ -72,6 +87,9 @@ class PlanewaveMountAgent(SubAgent):
                 "rotator-angle": self.mount_status.rotator.field_angle_degs,
             }
         }
+        if extra:
+            mydict["mount_status"].update(extra)
+        self.history.record(mydict["mount_status"])
         xml_format = xmltodict.unparse(mydict, pretty=True)
         # print("/topic/" + pwma.config["broadcast_topic"])
         self.conn.send(
@@ -79,6 +97,189 @@ class PlanewaveMountAgent(SubAgent):
             destination="/topic/" + self.config["broadcast_topic"],
         )
 
+    def track_slew(self):
+        # Wait for the slew in progress to finish, broadcasting throttled
+        # progress, then broadcast the final status with the settle time.
+        self.slew_tracker = SlewTracker(
+            self.planewave_mount_talk.get_status,
+            min_interval=self.config.get("slew_poll_min", 0.05),
+            max_interval=self.config.get("slew_poll_max", 1.0),
+            progress_interval=self.config.get("slew_progress_interval", 1.0),
+            timeout=self.config.get("slew_timeout", 600.0),
+            arrival_arcsec=self.config.get("slew_arrival_arcsec", 10.0),
+        )
+
+        def on_progress(status, progress):
+            self.mount_status = status
+            self.broadcast_mount_status(progress)
+
+        result = self.slew_tracker.track(on_progress)
+        self.mount_status = result["status"]
+        self.broadcast_mount_status(
+            {
+                "slew_settle_time": result["settle_time"],
+                "slew_settle_time_uncertainty": result["settle_time_uncertainty"],
+            }
+        )
+
+        # Keep the slew for fitting the slew-time model
+        slew_log = self.config.get("slew_log_file")
+        if slew_log and result["completed"] and result["polls"] > 1:
+            try:
+                record_slew(slew_log, result)
+            except OSError as e:
+                print("Cannot record slew:", e)
+        return result
+
+    @commands.command("fitSlewModel")
+    def fit_slew_model(self):
+        # fitSlewModel: fit the slew-time model to the recorded slews and
+        # save it where schedulers (and pointing runs) will find it.
+        try:
+            model = SlewTimeModel.fit(load_slew_log(self.config["slew_log_file"]))
+            model.save(self.config["slew_model_file"])
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Cannot fit slew model: {e}") from e
+        for k, (accel, max_rate) in enumerate(model.axes):
+            print(
+                "  axis%d: accel %.2f deg/s^2, max rate %.2f deg/s"
+                % (k, accel, max_rate)
+            )
+        print("  settle %.2f s" % model.settle)
+
+    def mount_pointing(self):
+        # Where the telescope points and whether it is moving, for peers
+        # (e.g. the dome) that follow the mount.
+        status = self.planewave_mount_talk.get_status()
+        return {
+            "alt_degs": status.mount.altitude_degs,
+            "az_degs": status.mount.azimuth_degs,
+            "ra_j2000_hours": status.mount.ra_j2000_hours,
+            "dec_j2000_degs": status.mount.dec_j2000_degs,
+            "is_tracking": status.mount.is_tracking,
+            "is_slewing": status.mount.is_slewing,
+        }
+
+    @commands.command("slewAltAzWithDome", Arg("alt"), Arg("az"))
+    def slew_alt_az_with_dome(self, alt, az):
+        # slewAltAzWithDome(45.0, 200.0)
+        goto = self.planewave_mount_talk.pwi4.mount_goto_alt_az
+        self.slew_with_dome(goto, (alt, az), alt, az)
+
+    @commands.command("slewRaDecJ2000WithDome", Arg("ra"), Arg("dec"))
+    def slew_ra_dec_j2000_with_dome(self, ra, dec):
+        # slewRaDecJ2000WithDome(10.5, 20.0)
+        alt, az = radec_to_altaz(
+            ra,
+            dec,
+            julian_date(),
+            self.config["site_latitude"],
+            self.config["site_longitude"],
+        )
+        goto = self.planewave_mount_talk.pwi4.mount_goto_ra_dec_j2000
+        self.slew_with_dome(goto, (ra, dec), alt, az, ra, dec)
+
+    def slew_with_dome(self, goto, arguments, alt, az, ra=None, dec=None):
+        # Start the dome (the peer named by mount_dome_agent) and the mount
+        # (goto(*arguments)) moving together, the dome to its azimuth for the
+        # final position, and send "Go" to the DTO only when both have settled
+        # ("ERROR" if either did not arrive).
+        dome = self.peers.get(self.config.get("mount_dome_agent", "dome"))
+
+        self.reply_to_dto("WAIT")
+        dome_target = None
+        if dome is None:
+            print("No dome agent; slewing the mount alone")
+        elif alt < 0.0:
+            print("Target is below the horizon; not moving the dome")
+        else:
+            dome_target = dome.start_slew(alt, az, ra, dec)
+        self.mount_status = self.planewave_mount_talk.command(goto, *arguments)
+
+        # Both are moving; wait for the mount, then for whatever the dome
+        # has left to do
+        result = self.track_slew()
+        dome_time = dome.wait_for_slew() if dome_target is not None else None
+        if dome_target is None:
+            dome_note = "not moved"
+        elif dome_time is None:
+            dome_note = "did not arrive"
+        else:
+            dome_note = "in %.2f s" % dome_time
+        print(
+            "Coordinated slew %s: mount settled in %.2f s, dome %s"
+            % (
+                "complete" if result["completed"] else "NOT complete",
+                result["settle_time"] or 0.0,
+                dome_note,
+            )
+        )
+        self.broadcast_mount_status(
+            {"dome_target": dome_target, "dome_settle_time": dome_time}
+        )
+        if not result["completed"]:
+            self.reply_to_dto("ERROR: slew did not complete")
+        elif dome_target is not None and dome_time is None:
+            self.reply_to_dto("ERROR: dome did not reach its azimuth")
+        else:
+            self.reply_to_dto("GO")
+
+    @commands.command("acquireTarget", Arg("max_steps", int, None))
+    def acquire_target(self, max_steps=None):
+        # acquireTarget(49): search up to 49 spiral positions for the target
+        # with the camera, and center it, with the DTO waiting until done.
+        if max_steps is None:
+            max_steps = self.config.get("acquire_max_steps", 49)
+        self.reply_to_dto("WAIT")
+        try:
+            result = SpiralAcquisition(self).run(max_steps)
+        except (KeyError, ValueError, ConnectionError, TimeoutError) as e:
+            print("Acquisition failed:", e)
+            self.reply_to_dto(f"ERROR: Acquisition failed: {e}")
+            return
+        if result["found"]:
+            print(
+                'Target acquired at step %d (SNR %.0f, offset %.1f" E %.1f" N) '
+                "in %.1f s"
+                % (
+                    result["steps"],
+                    result["snr"],
+                    result["offset_arcsec"][0],
+                    result["offset_arcsec"][1],
+                    result["elapsed"],
+                )
+            )
+        else:
+            print(
+                "Target not found in %d steps (%.1f s)"
+                % (result["steps"], result["elapsed"])
+            )
+        self.broadcast_mount_status(
+            {
+                "acquired": result["found"],
+                "acquire_steps": result["steps"],
+                "acquire_time": result["elapsed"],
+            }
+        )
+        self.reply_to_dto(
+            "GO"
+            if result["found"]
+            else "ERROR: target not found in %d steps" % result["steps"]
+        )
+
+    @commands.command("buildPointingModel", Arg("n_points", int, 100))
+    def build_pointing_model(self, n_points=100):
+        # buildPointingModel(100): run a pointing model of about 100 points,
+        # with the DTO waiting until it is done.
+        self.reply_to_dto("WAIT")
+        try:
+            PointingModelRun(self).run(n_points)
+        except (OSError, KeyError, ValueError) as e:
+            print("Cannot run a pointing model:", e)
+            self.reply_to_dto(f"ERROR: Cannot run a pointing model: {e}")
+            return
+        self.reply_to_dto("GO")
+
     class MyListener(stomp.ConnectionListener):
         def __init__(self, parent):
             self.parent = parent
@@ -102,26 +303,38 @@ class PlanewaveMountAgent(SubAgent):
         #     os._exit(0)
         # else:
         #     pwma.planewave_mount_talk.send_command_to_mount(pwma.current_message)
-        self.planewave_mount_talk.send_command_to_mount(message)
 
-        # If command in wait_list, send "Wait" to DTO, check status
+        # One lookup finds the command, whether the agent (e.g. history,
+        # buildPointingModel) or the mount carries it out. A command that
+        # cannot be carried out raises CommandError before the mount moves,
+        # so there is no slew to wait for.
+        try:
+            command, values = self.commands.parse(message)
+            self.commands.run(self, command, values)
+        except CommandError as e:
+            print(e)
+            self.reply_to_dto(f"ERROR: {e}")
+            return
+
+        # If the command moves the mount, send "Wait" to DTO, check status
         # until is_slewing is false, then send "Go" to DTO.
-        if any(s in message for s in self.wait_list):
+        if command.waits:
             # print("we are in a wait loop")
             # Send mount status back to DTO.
-            self.conn.send(
-                body="Wait",
-                destination="/topic/" + self.config["dto_command_topic"],
+            self.reply_to_dto("WAIT")
+            # Follow the slew, polling faster as the mount nears the target
+            result = self.track_slew()
+            print(
+                "Slew %s: settled in %.2f +/- %.2f s (%d polls)"
+                % (
+                    "complete" if result["completed"] else "NOT complete",
+                    result["settle_time"] or 0.0,
+                    result["settle_time_uncertainty"] or 0.0,
+                    result["polls"],
+                )
             )
-            # time.sleep(0.5)
-            while True:
-                self.get_status_and_broadcast()
-                # print("is_slewing: ", pwma.mount_status.mount.is_slewing)
-                if not self.mount_status.mount.is_slewing:
-                    break
-
-            self.conn.send(
-                body="Go",
-                destination="/topic/" + self.config["dto_command_topic"],
+
+            self.reply_to_dto(
+                "GO" if result["completed"] else "ERROR: slew did not complete"
             )
             # time.sleep(0.5)
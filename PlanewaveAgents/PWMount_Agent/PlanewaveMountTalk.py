@@ -5,10 +5,25 @@ Created on Feb 7, 2022
 """
 
 from pwi4_client import PWI4
-import psutil
-import subprocess
+from EphemerisPath import julian_date_now, track_ephemeris, track_orbit
+from Astronomy.SatellitePasses import PassPredictor, TwoLineElements
+from PWI4Process import PWI4Process
+from CommandLanguage.command_registry import Arg, CommandError, CommandRegistry
+import threading
 import time
-import os
+
+
+class StatusFlight(object):
+    """
+    One in-flight status request, shared by every caller that arrives
+    while it is outstanding.
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+        self.status = None
+        self.error = None
 
 
 class PlanewaveMountTalk(object):
@@ -16,106 +31,297 @@ class PlanewaveMountTalk(object):
     Communications with PlaneWave Mount.
     """
 
+    # The mount commands, and the methods that carry them out
+    commands = CommandRegistry("pwi4")
+
     def __init__(self, parent, host, port):
         self.parent = parent
         self.mount_status = ""
 
-        # Check to see if PWI4 is running, if not, start it.
-        if self.checkIfProcessRunning("run-pwi4"):
+        # Status cache: reuse a status younger than status_max_age seconds,
+        # and share one request among concurrent readers. The generation
+        # changes whenever a command may have changed the mount state.
+        self.status_max_age = self.parent.config.get("status_max_age", 0.25)
+        self.status_lock = threading.Lock()
+        self.cached_status = None
+        self.cached_status_time = 0.0
+        self.status_flight = None
+        self.status_generation = 0
+
+        # Satellite pass predictions, made on first use
+        self.pass_predictor = None
+
+        # Check to see if PWI4 is running (answers a status request), if not,
+        # start it and poll its status until it answers.
+        config = self.parent.config
+        self.pwi4 = self.make_client(host, port)
+        self.pwi4_process = PWI4Process(
+            command=config.get("pwi4_command", "./run-pwi4"),
+            directory=config.get("pwi4_directory", "/home/lorax/PWI4/pwi-4.0.11beta10"),
+            display=config.get("pwi4_display", ":6.1"),
+        )
+        if self.pwi4_process.probe(self.pwi4.status) is not None:
             print("PWI4 already running.")
-            # Connect to PWI4.
-            self.pwi4 = PWI4(host=host, port=port)
         else:
             print("PWI4 not running, starting...")
-            # Set the display to a "virtual" display so X will work
-            # without screen.
-            os.environ["DISPLAY"] = ":6.1"
-            # Call the routine that will start PWI4 as a seperate process.
-            subprocess.Popen("./run-pwi4", cwd="/home/lorax/PWI4/pwi-4.0.11beta10")
-            # Sleep 10 seconds to let PWI4 start up.
-            time.sleep(10)
-            # Connect to PWI4.
-            self.pwi4 = PWI4(host=host, port=port)
-        self.parent.mount_status = self.pwi4.status()
+            self.pwi4_process.start()
+            self.pwi4_process.wait_until_ready(
+                self.pwi4.status,
+                timeout=config.get("pwi4_start_timeout", 60.0),
+                min_interval=config.get("pwi4_probe_min", 0.1),
+                max_interval=config.get("pwi4_probe_max", 2.0),
+            )
+        self.parent.mount_status = self.get_status()
         print("PlaneWaveMountTalk: finished initialization")
 
-    def checkIfProcessRunning(self, processName):
+    def make_client(self, host, port):
+        # Keep-alive connection pool settings come from the agent config.
+        return PWI4(
+            host=host,
+            port=port,
+            pool_size=self.parent.config.get("pwi4_pool_size", 4),
+            idle_timeout=self.parent.config.get("pwi4_idle_timeout", 30.0),
+        )
 
-        # Iterate over the all the running process
-        for proc in psutil.process_iter():
+    def get_status(self, max_age=None):
+        """
+        Return the mount status, from the cache if it is recent enough.
+        Otherwise one request is made to PWI4, and any other callers that
+        arrive before it completes wait for and share its result.
+        """
+        max_age = self.status_max_age if max_age is None else max_age
+        with self.status_lock:
+            if (
+                self.cached_status is not None
+                and time.monotonic() - self.cached_status_time <= max_age
+            ):
+                return self.cached_status
+            flight = self.status_flight
+            leader = flight is None
+            if leader:
+                flight = self.status_flight = StatusFlight(self.status_generation)
+
+        if leader:
+            requested = time.monotonic()
             try:
-                # Check if process name contains the given name string.
-                if processName in proc.name():
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        return False
+                flight.status = self.pwi4.status()
+            except Exception as e:
+                flight.error = e
+            with self.status_lock:
+                if self.status_flight is flight:
+                    self.status_flight = None
+                # Don't cache a status requested before a command was sent
+                if flight.error is None and flight.generation == self.status_generation:
+                    self.cached_status = flight.status
+                    self.cached_status_time = requested
+            flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.status
+
+    def invalidate_status(self, status=None):
+        """
+        Drop the cached status (and detach any request in flight) because
+        the mount state may have changed. If given, status is the response
+        to the command that changed it, and is cached in its place.
+        """
+        with self.status_lock:
+            self.status_generation += 1
+            self.status_flight = None
+            self.cached_status = status
+            self.cached_status_time = time.monotonic()
+
+    def command(self, method, *args, **kwargs):
+        """
+        Send a command that changes the mount state, returning the status
+        PWI4 sends back; the status cache is refreshed with it. Keyword
+        arguments (e.g. for mount_offset) are passed on to the method.
+        """
+        self.invalidate_status()
+        status = method(*args, **kwargs)
+        self.invalidate_status(status)
+        return status
+
+    def satellite_passes(self, name=None):
+        """
+        Return the satellite TLEs from the configured TLE file (only the
+        named one if given), and the pass predictor for the site. Pass
+        lists are cached per TLE epoch, so only updated TLEs are propagated.
+        """
+        config = self.parent.config
+        if self.pass_predictor is None:
+            self.pass_predictor = PassPredictor(
+                config["site_latitude"],
+                config["site_longitude"],
+                config.get("site_elevation", 0.0),
+                min_altitude=config.get("tle_min_altitude", 10.0),
+            )
+        tles = TwoLineElements.load(config["tle_file"])
+        if name is not None:
+            tles = tles.select([name])
+        return tles, self.pass_predictor
 
     def send_command_to_mount(self, mount_command):
-        # s = self.pwi4.status()
-        # s = self.pwi4.mount_connect()
-        # Strip off everything up to the first parenthesis
-        if "(" in mount_command:
-            mcom = mount_command[0 : mount_command.find("(")]
-        else:
-            mcom = mount_command
-        # print(mcom)
-
-        if mcom == "enableMount":
-            print("Enable the Mount")
-            self.parent.mount_status = self.pwi4.mount_enable(0)
-            self.parent.mount_status = self.pwi4.mount_enable(1)
-
-        elif mcom == "disableMount":
-            print("Disable the Mount")
-
-        elif mcom == "connectMount":
-            print("Connect the Mount")
-            self.mount_status = self.pwi4.status()
-            if not self.mount_status.mount.is_connected:
-                print("Connecting to mount...")
-                self.mount_status = self.pwi4.mount_connect()
-                print("Mount connected:", self.mount_status.mount.is_connected)
-            print(
-                "  RA/Dec: %.4f, %.4f"
-                % (
-                    self.mount_status.mount.ra_j2000_hours,
-                    self.mount_status.mount.dec_j2000_degs,
-                )
+        # Look the command up in the registry, check its arguments and run it
+        try:
+            self.commands.dispatch(self, mount_command)
+        except CommandError as e:
+            print(e)
+        return ()
+
+    @commands.command("enableMount")
+    def enable_mount(self):
+        print("Enable the Mount")
+        self.parent.mount_status = self.command(self.pwi4.mount_enable, 0)
+        self.parent.mount_status = self.command(self.pwi4.mount_enable, 1)
+
+    @commands.command("disableMount")
+    def disable_mount(self):
+        print("Disable the Mount")
+
+    @commands.command("connectMount")
+    def connect_mount(self):
+        print("Connect the Mount")
+        self.mount_status = self.get_status()
+        if not self.mount_status.mount.is_connected:
+            print("Connecting to mount...")
+            self.mount_status = self.command(self.pwi4.mount_connect)
+            print("Mount connected:", self.mount_status.mount.is_connected)
+        print(
+            "  RA/Dec: %.4f, %.4f"
+            % (
+                self.mount_status.mount.ra_j2000_hours,
+                self.mount_status.mount.dec_j2000_degs,
             )
-            self.parent.mount_status = self.mount_status
-
-        elif mcom == "disconnectMount":
-            print("Disconnecting from mount...")
-            self.parent.mount_status = self.pwi4.mount_disconnect()
-
-        elif mcom == "homeMount":
-            print("Home the Mount")
-            self.parent.mount_status = self.pwi4.mount_find_home()
-
-        elif mcom == "parkMount":
-            print("Park the Mount")
-            self.parent.mount_status = self.pwi4.mount_park()
-
-        elif mcom == "status":
-            # print("doing status")
-            self.parent.mount_status = self.pwi4.status()
-            # print(self.parent.mount_status.mount.is_slewing)
-
-        elif mcom == "gotoAltAz":
-            # Get the arguments.
-            # gotoAltAz(45.0, 200.0)
-            alt = float(
-                mount_command[mount_command.find("(") + 1 : mount_command.find(",")]
+        )
+        self.parent.mount_status = self.mount_status
+
+    @commands.command("disconnectMount")
+    def disconnect_mount(self):
+        print("Disconnecting from mount...")
+        self.parent.mount_status = self.command(self.pwi4.mount_disconnect)
+
+    @commands.command("homeMount", waits=True)
+    def home_mount(self):
+        print("Home the Mount")
+        self.parent.mount_status = self.command(self.pwi4.mount_find_home)
+
+    @commands.command("parkMount", waits=True)
+    def park_mount(self):
+        print("Park the Mount")
+        self.parent.mount_status = self.command(self.pwi4.mount_park)
+
+    @commands.command("status")
+    def status(self):
+        self.parent.mount_status = self.get_status()
+
+    @commands.command("gotoAltAz", Arg("alt"), Arg("az"), waits=True)
+    def goto_alt_az(self, alt, az):
+        # gotoAltAz(45.0, 200.0)
+        print("Slewing to alt %.4f, az %.4f..." % (alt, az))
+        self.parent.mount_status = self.command(self.pwi4.mount_goto_alt_az, alt, az)
+
+    @commands.command("gotoRaDecJ2000", Arg("ra"), Arg("dec"), waits=True)
+    def goto_ra_dec_j2000(self, ra, dec):
+        # gotoRaDecJ2000(10.5, 20.0): RA in hours, Dec in degrees
+        print("Slewing to RA %.5f, Dec %.4f..." % (ra, dec))
+        self.parent.mount_status = self.command(
+            self.pwi4.mount_goto_ra_dec_j2000, ra, dec
+        )
+
+    @commands.command("trackEphemeris", Arg("path", str), waits=True)
+    def follow_ephemeris(self, path):
+        # trackEphemeris(/path/to/ephemeris.txt)
+        print("Tracking ephemeris", path)
+        config = self.parent.config
+        try:
+            self.parent.mount_status = self.command(
+                track_ephemeris,
+                self.pwi4,
+                path,
+                config.get("ephemeris_step", 10.0),
+                config.get("ephemeris_coord_type", "raj2000"),
+                config.get("ephemeris_chunk_points", 1000),
             )
-            az = float(
-                mount_command[mount_command.find(",") + 2 : mount_command.find(")")]
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot track ephemeris: {e}") from e
+
+    @commands.command("trackOrbit", Arg("name", str), waits=True)
+    def follow_orbit(self, name):
+        # trackOrbit(28P): follow an object from the cached orbital elements
+        print("Tracking orbit of", name)
+        config = self.parent.config
+        try:
+            site = (
+                config["site_latitude"],
+                config["site_longitude"],
+                config.get("site_elevation", 0.0),
             )
-            print(mount_command)
-            print("Slewing...")
-            self.parent.mount_status = self.pwi4.mount_goto_alt_az(alt, az)
+            self.parent.mount_status = self.command(
+                track_orbit,
+                self.pwi4,
+                config["orbit_elements_file"],
+                name,
+                config.get("orbit_track_hours", 12.0),
+                config.get("ephemeris_step", 10.0),
+                site,
+                config.get("ephemeris_coord_type", "raj2000"),
+                config.get("ephemeris_chunk_points", 1000),
+            )
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Cannot track orbit: {e}") from e
 
-        else:
-            print("Unknown command")
+    @commands.command("trackTle", Arg("name", str), waits=True)
+    def follow_tle(self, name):
+        # trackTle(ISS (ZARYA)): follow a satellite if it is up now
+        hours = self.parent.config.get("tle_search_hours", 12.0)
+        try:
+            tles, predictor = self.satellite_passes(name)
+            now = julian_date_now()
+            up, sat_pass = predictor.current_pass(tles, now, hours)
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Cannot track satellite: {e}") from e
+        if not up:
+            if sat_pass is None:
+                raise CommandError("%s: no pass in the next %g hours" % (name, hours))
+            raise CommandError(
+                "%s is down; next pass culminates at %.1f deg in %.1f min"
+                % (
+                    name,
+                    sat_pass["max_altitude"],
+                    (sat_pass["culmination_jd"] - now) * 1440.0,
+                )
+            )
+        print(
+            "Following %s, culminating at %.1f deg" % (name, sat_pass["max_altitude"])
+        )
+        self.parent.mount_status = self.command(
+            self.pwi4.mount_follow_tle, *tles.tles[0]
+        )
 
-        return ()
+    @commands.command("listPasses")
+    def list_passes(self):
+        # listPasses: satellite passes over the next tle_search_hours
+        hours = self.parent.config.get("tle_search_hours", 12.0)
+        try:
+            tles, predictor = self.satellite_passes()
+        except (OSError, KeyError, ValueError) as e:
+            raise CommandError(f"Cannot predict passes: {e}") from e
+        now = julian_date_now()
+        start = int(now * 24.0) / 24.0
+        for sat_pass in predictor.passes(tles, start, start + hours / 24.0):
+            if sat_pass["set_jd"] is not None and sat_pass["set_jd"] < now:
+                continue
+            print(
+                "  %-24s culminates in %7.1f min at %5.1f deg, az %5.1f%s"
+                % (
+                    sat_pass["name"],
+                    (sat_pass["culmination_jd"] - now) * 1440.0,
+                    sat_pass["max_altitude"],
+                    sat_pass["culmination_azimuth"],
+                    " (visible)" if sat_pass["visible"] else "",
+                )
+            )
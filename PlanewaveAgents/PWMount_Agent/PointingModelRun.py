@@ -0,0 +1,269 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Automated pointing-model runs for the PlaneWave mount.
+
+A grid of sky positions, equally spaced in solid angle above a minimum
+altitude, is visited in serpentine order (altitude rings, alternating in
+azimuth), which keeps each slew short; if a slew-time model has been fitted
+(slew_model_file), the grid is instead visited in the order it predicts is
+quickest from where the mount is. At each grid position the nearest
+unused bright star from the catalog is picked, the mount slews to it, the
+camera SubAgent takes a short frame, the star is centroided, and the J2000
+position of the image center (the star's catalog position less its measured
+offset) is sent to PWI4 with mount_model_add_point.
+
+PWI4 ties each model point to the mount's position when the point is
+added, so each frame is measured before the mount moves on. The slew to the
+next star is started as soon as the point is added, and the bookkeeping for
+the point just taken (logging, progress) runs while the mount slews.
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+
+from Astronomy.Coordinates import altaz_to_vector, julian_date, radec_to_altaz
+from Astronomy.StarDetection import find_stars
+from SlewTimeModel import SlewTimeModel, order_targets, sequence_time
+
+
+def sky_grid(n_points, min_alt=20.0, max_alt=85.0):
+    """
+    Return the altitudes and azimuths (deg) of about n_points grid
+    positions, equally spaced in solid angle, in serpentine order.
+    """
+    n_rings = max(1, int(round(math.sqrt(n_points / 4.0))))
+    # Equal-area rings: evenly spaced in sin(altitude)
+    edges = np.linspace(
+        math.sin(math.radians(min_alt)), math.sin(math.radians(max_alt)), n_rings + 1
+    )
+    ring_alt = np.degrees(np.arcsin(0.5 * (edges[:-1] + edges[1:])))
+
+    # Points per ring in proportion to the ring's circumference
+    weights = np.cos(np.radians(ring_alt))
+    counts = np.floor(n_points * weights / weights.sum()).astype(int)
+    remainder = n_points * weights / weights.sum() - counts
+    counts[np.argsort(remainder)[::-1][: n_points - counts.sum()]] += 1
+
+    alts, azs = [], []
+    for ring, (alt, count) in enumerate(zip(ring_alt, counts)):
+        if count < 1:
+            continue
+        az = (np.arange(count) + 0.5 * (ring % 2)) * 360.0 / count
+        if ring % 2:
+            az = az[::-1]
+        alts.append(np.full(count, alt))
+        azs.append(az)
+    return np.concatenate(alts), np.concatenate(azs)
+
+
+def detector_to_sky(dx, dy, plate_scale, camera_angle, camera_flip=False):
+    """
+    Convert a pixel offset on the detector to an offset on the sky: returns
+    (east, north) in arcsec. camera_angle (radians) is the position angle of
+    detector +y; +x is 90 degrees clockwise from it on the sky (west, for
+    north up) unless camera_flip is set.
+    """
+    if camera_flip:
+        dx = -dx
+    sin_a, cos_a = math.sin(camera_angle), math.cos(camera_angle)
+    east = plate_scale * (dy * sin_a - dx * cos_a)
+    north = plate_scale * (dy * cos_a + dx * sin_a)
+    return east, north
+
+
+def load_star_catalog(path):
+    """
+    Read a catalog of pointing stars: one star per line with J2000 RA
+    (hours), Dec (deg) and magnitude, whitespace separated, "#" comments.
+    """
+    catalog = np.loadtxt(path, usecols=(0, 1, 2), ndmin=2)
+    return catalog[:, 0], catalog[:, 1], catalog[:, 2]
+
+
+class PointingModelRun(object):
+    """
+    One pointing-model run, driven from the mount agent.
+
+    agent is the PlanewaveMountAgent; the camera is the SubAgent named by
+    pointing_camera_agent in its configuration.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.talk = agent.planewave_mount_talk
+        self.config = agent.config
+        camera_name = self.config.get("pointing_camera_agent")
+        self.camera = agent.peers.get(camera_name)
+        if self.camera is None:
+            raise ValueError(
+                "A pointing model run needs pointing_camera_agent (%s) in the "
+                "same CompositeAgent" % camera_name
+            )
+
+        self.site = (self.config["site_latitude"], self.config["site_longitude"])
+        self.exptime = self.config.get("pointing_exptime", 2.0)
+        self.min_alt = self.config.get("pointing_min_alt", 20.0)
+        self.max_mag = self.config.get("pointing_max_mag", 6.0)
+        self.plate_scale = self.config["pointing_plate_scale"]
+        self.camera_angle = math.radians(self.config.get("pointing_camera_angle", 0.0))
+        self.camera_flip = self.config.get("pointing_camera_flip", False)
+        self.detector_center = self.config.get("pointing_detector_center")
+        self.min_snr = self.config.get("pointing_min_snr", 20.0)
+
+        self.ra, self.dec, mag = load_star_catalog(self.config["pointing_star_catalog"])
+        self.bright = mag <= self.max_mag
+        self.used = np.zeros(len(self.ra), dtype=bool)
+        self.results = []
+
+    def pick_star(self, alt, az):
+        """
+        Index of the unused catalog star nearest the given alt/az, now.
+        """
+        star_alt, star_az = radec_to_altaz(self.ra, self.dec, julian_date(), *self.site)
+        usable = self.bright & ~self.used & (star_alt > self.min_alt)
+        if not usable.any():
+            return None
+        closeness = altaz_to_vector(star_alt, star_az) @ altaz_to_vector(alt, az)
+        closeness[~usable] = -2.0
+        return int(np.argmax(closeness))
+
+    def slew_to(self, star):
+        self.used[star] = True
+        self.agent.mount_status = self.talk.command(
+            self.talk.pwi4.mount_goto_ra_dec_j2000, self.ra[star], self.dec[star]
+        )
+
+    def measure(self, star):
+        """
+        Take a frame and find the star. Returns the J2000 RA (hours) and
+        Dec (deg) of the detector center, and the star's offset and SNR,
+        or None if no star was found.
+        """
+        image, (x0, y0) = self.camera.acquire_frame(self.exptime)
+        stars = find_stars(image, max_stars=1)
+        if not len(stars["x"]) or stars["snr"][0] < self.min_snr:
+            return None
+
+        # Offset of the star from the detector center, in pixels
+        if self.detector_center is None:
+            center_x, center_y = 0.5 * (image.shape[1] - 1), 0.5 * (image.shape[0] - 1)
+        else:
+            center_x, center_y = (
+                self.detector_center[0] - x0,
+                self.detector_center[1] - y0,
+            )
+        east, north = detector_to_sky(
+            stars["x"][0] - center_x,
+            stars["y"][0] - center_y,
+            self.plate_scale,
+            self.camera_angle,
+            self.camera_flip,
+        )
+
+        dec = self.dec[star] - north / 3600.0
+        ra = self.ra[star] - east / 3600.0 / 15.0 / math.cos(math.radians(dec))
+        return ra % 24.0, dec, math.hypot(east, north), float(stars["snr"][0])
+
+    def ordered_grid(self, n_points):
+        """
+        The grid positions, in the quickest order the slew-time model knows.
+        """
+        alts, azs = sky_grid(n_points, self.min_alt)
+        model_file = self.config.get("slew_model_file")
+        if not model_file or not os.path.exists(model_file):
+            return alts, azs
+
+        model = SlewTimeModel.load(model_file)
+        status = self.talk.get_status()
+        here = (status.mount.altitude_degs, status.mount.azimuth_degs)
+        order = order_targets(model, alts, azs, start=here)
+        print(
+            "Grid order: %.0f s of slewing (serpentine %.0f s)"
+            % (
+                sequence_time(model, alts[order], azs[order], here),
+                sequence_time(model, alts, azs, here),
+            )
+        )
+        return alts[order], azs[order]
+
+    def run(self, n_points):
+        """
+        Build a pointing model of about n_points points. Returns the
+        number of points added.
+        """
+        alts, azs = self.ordered_grid(n_points)
+        if self.config.get("pointing_clear_model", True):
+            self.talk.command(self.talk.pwi4.mount_model_clear_points)
+
+        start = time.time()
+        added = 0
+        star = self.pick_star(alts[0], azs[0])
+        if star is not None:
+            self.slew_to(star)
+        for k in range(len(alts)):
+            if star is None:
+                print(
+                    "No usable pointing star near alt %.1f az %.1f" % (alts[k], azs[k])
+                )
+                star = (
+                    self.pick_star(alts[k + 1], azs[k + 1])
+                    if k + 1 < len(alts)
+                    else None
+                )
+                if star is not None:
+                    self.slew_to(star)
+                continue
+
+            slew = self.agent.track_slew()
+            try:
+                measured = self.measure(star) if slew["completed"] else None
+            except (ConnectionError, TimeoutError) as e:
+                print("Pointing run stopped:", e)
+                break
+            if measured is not None:
+                self.talk.command(
+                    self.talk.pwi4.mount_model_add_point, measured[0], measured[1]
+                )
+                added += 1
+
+            # Start the next slew, then log this point while the mount moves
+            this_star = star
+            star = (
+                self.pick_star(alts[k + 1], azs[k + 1]) if k + 1 < len(alts) else None
+            )
+            if star is not None:
+                self.slew_to(star)
+            self.record(k, len(alts), this_star, slew, measured)
+
+        model_file = self.config.get("pointing_model_file")
+        if model_file and added:
+            self.talk.command(self.talk.pwi4.mount_model_save, model_file)
+        print(
+            "Pointing model: %d of %d points in %.1f min"
+            % (added, len(alts), (time.time() - start) / 60.0)
+        )
+        return added
+
+    def record(self, index, total, star, slew, measured):
+        result = {
+            "index": index,
+            "ra_hours": float(self.ra[star]),
+            "dec_degs": float(self.dec[star]),
+            "slew_time": slew["settle_time"],
+            "offset_arcsec": measured[2] if measured else None,
+            "snr": measured[3] if measured else None,
+        }
+        self.results.append(result)
+        if measured is None:
+            print("  point %d/%d: star not found" % (index + 1, total))
+        else:
+            print(
+                "  point %d/%d: offset %.1f arcsec, SNR %.0f"
+                % (index + 1, total, measured[2], measured[3])
+            )
@@ -0,0 +1,211 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Slew-time model for the PlaneWave mount, and slew-optimal target ordering.
+
+Each axis is modelled as accelerating at a constant rate up to a maximum
+rate, coasting, and decelerating (a trapezoidal velocity profile), so an
+axis moving d degrees takes 2 sqrt(d / accel) if it never reaches
+max_rate, and d / max_rate + max_rate / accel if it does. The axes move
+together, so a slew takes as long as the slower axis, plus a settle time.
+
+The parameters are fitted from the slews the mount agent records (the
+travel and arrival time of each axis, from SlewTracker) by a least-squares
+grid search per axis; the settle time is the median time from the last
+axis arriving to the mount reporting it has stopped slewing.
+
+Target positions are altitude / azimuth (axis1 / axis0 of the alt-az
+mount); azimuth travel is taken the short way round, so a slew the cable
+wrap sends the long way takes longer than predicted.
+"""
+
+import numpy as np
+import yaml
+
+
+def axis_time(distance, accel, max_rate):
+    """
+    Time (s) for one axis to move distance degrees (array), with the
+    trapezoidal velocity profile.
+    """
+    distance = np.abs(np.asarray(distance, dtype=float))
+    short = distance < max_rate * max_rate / accel
+    return np.where(
+        short,
+        2.0 * np.sqrt(distance / accel),
+        distance / max_rate + max_rate / accel,
+    )
+
+
+def fit_axis(distance, duration):
+    """
+    Least-squares fit of (accel, max_rate) to the times an axis took to
+    move the given distances, by a coarse grid search refined once.
+    """
+    distance = np.asarray(distance, dtype=float)[:, np.newaxis, np.newaxis]
+    duration = np.asarray(duration, dtype=float)[:, np.newaxis, np.newaxis]
+    accels = np.logspace(-2, 2, 41)
+    rates = np.logspace(-1, 1.5, 41)
+    for _ in range(2):
+        model = axis_time(distance, accels[np.newaxis, :, np.newaxis], rates)
+        cost = np.sum((model - duration) ** 2, axis=0)
+        i, j = np.unravel_index(np.argmin(cost), cost.shape)
+        accel, max_rate = accels[i], rates[j]
+        # Refine around the best point, one coarse step either side
+        accels = accel * np.logspace(-0.1, 0.1, 41)
+        rates = max_rate * np.logspace(-0.0625, 0.0625, 41)
+    return float(accel), float(max_rate)
+
+
+def load_slew_log(path):
+    """
+    Read the slews recorded by the mount agent: one per line, the travel
+    of axis0 and axis1 (deg), their arrival times and the settle time (s).
+    """
+    return np.loadtxt(path, ndmin=2)
+
+
+def record_slew(path, result):
+    """
+    Append a slew (a completed SlewTracker result) to the slew log.
+    """
+    travel, arrival = result["axis_travel_degs"], result["axis_arrival_time"]
+    if None in travel or None in arrival:
+        return
+    with open(path, "a", encoding="utf-8") as stream:
+        stream.write(
+            "%.5f %.5f %.3f %.3f %.3f\n"
+            % (travel[0], travel[1], arrival[0], arrival[1], result["settle_time"])
+        )
+
+
+class SlewTimeModel(object):
+    """
+    Slew time between alt/az positions.
+
+    axes is ((accel, max_rate) for axis0 (azimuth), the same for axis1
+    (altitude)), in deg/s^2 and deg/s; settle is in seconds.
+    """
+
+    def __init__(self, axes=((2.0, 10.0), (2.0, 10.0)), settle=2.0):
+        self.axes = tuple(tuple(float(p) for p in axis) for axis in axes)
+        self.settle = float(settle)
+
+    def slew_time(self, alt0, az0, alt1, az1):
+        """
+        Time (s) to slew from (alt0, az0) to (alt1, az1), in degrees;
+        arrays broadcast.
+        """
+        d_az = (np.asarray(az1) - az0 + 180.0) % 360.0 - 180.0
+        d_alt = np.asarray(alt1) - alt0
+        moving = axis_time(d_az, *self.axes[0]), axis_time(d_alt, *self.axes[1])
+        slowest = np.maximum(*moving)
+        return np.where(slowest > 0, slowest + self.settle, 0.0)
+
+    def cost_matrix(self, alts, azs):
+        """
+        Slew times between every pair of the positions.
+        """
+        alts, azs = np.asarray(alts, dtype=float), np.asarray(azs, dtype=float)
+        return self.slew_time(
+            alts[:, np.newaxis], azs[:, np.newaxis], alts[np.newaxis], azs[np.newaxis]
+        )
+
+    @classmethod
+    def fit(cls, records):
+        """
+        Fit a model to recorded slews: rows of (axis0 travel, axis1 travel,
+        axis0 arrival, axis1 arrival, settle time), degrees and seconds.
+        """
+        records = np.asarray(records, dtype=float)
+        if len(records) < 3:
+            raise ValueError("At least 3 recorded slews are needed for a model")
+        axes = []
+        for k in range(2):
+            moved = records[:, k] > 0.01
+            if np.count_nonzero(moved) < 2:
+                raise ValueError("Too few recorded slews move axis%d" % k)
+            axes.append(fit_axis(records[moved, k], records[moved, 2 + k]))
+        settle = np.median(records[:, 4] - np.max(records[:, 2:4], axis=1))
+        return cls(axes, max(float(settle), 0.0))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as stream:
+            model = yaml.safe_load(stream)
+        return cls((model["axis0"], model["axis1"]), model["settle"])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as stream:
+            yaml.safe_dump(
+                {
+                    "axis0": list(self.axes[0]),
+                    "axis1": list(self.axes[1]),
+                    "settle": self.settle,
+                },
+                stream,
+            )
+
+
+def sequence_time(model, alts, azs, start=None):
+    """
+    Total slew time (s) to visit the positions in order, beginning from the
+    start (alt, az) if given.
+    """
+    alts, azs = np.asarray(alts, dtype=float), np.asarray(azs, dtype=float)
+    if start is not None:
+        alts, azs = np.r_[start[0], alts], np.r_[start[1], azs]
+    return float(np.sum(model.slew_time(alts[:-1], azs[:-1], alts[1:], azs[1:])))
+
+
+def order_targets(model, alts, azs, start=None, max_passes=20):
+    """
+    Order in which to visit the positions for a short total slew time:
+    nearest neighbour from the start (or the first position), improved by
+    2-opt (reversing stretches of the route while that shortens it).
+    Returns the indices of the positions in visiting order.
+    """
+    alts, azs = np.asarray(alts, dtype=float), np.asarray(azs, dtype=float)
+    n = len(alts)
+    if n < 2:
+        return np.arange(n)
+
+    # Node 0 is the start; the route ends anywhere
+    if start is None:
+        start = (alts[0], azs[0])
+    cost = model.cost_matrix(np.r_[start[0], alts], np.r_[start[1], azs])
+
+    # Nearest neighbour
+    route = [0]
+    unvisited = np.ones(n + 1, dtype=bool)
+    unvisited[0] = False
+    for _ in range(n):
+        here = cost[route[-1]]
+        step = np.where(unvisited, here, np.inf)
+        nxt = int(np.argmin(step))
+        route.append(nxt)
+        unvisited[nxt] = False
+    route = np.array(route)
+
+    # 2-opt: reversing route[i:j+1] replaces edges (i-1, i) and (j, j+1)
+    # with (i-1, j) and (i, j+1); an open route has no edge after the end
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n):
+            a, b = route[i - 1], route[i]
+            js = np.arange(i + 1, n + 1)
+            c = route[js]
+            d = np.append(route[js[:-1] + 1], -1)
+            old_edge = np.where(d >= 0, cost[c, np.maximum(d, 0)], 0.0)
+            new_edge = np.where(d >= 0, cost[b, np.maximum(d, 0)], 0.0)
+            gain = cost[a, b] + old_edge - cost[a, c] - new_edge
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                j = js[best]
+                route[i : j + 1] = route[i : j + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return route[1:] - 1
@@ -0,0 +1,198 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Slew completion tracking for the PlaneWave mount.
+
+Rather than polling PWI4 as fast as possible while the mount slews, the
+tracker estimates the time to arrival from the remaining distance to the
+target (mount.axis0/axis1.dist_to_target_arcsec) and how fast it is
+shrinking, and sleeps a fraction of that between polls: slowly while the
+mount is far away, quickly as it arrives. The settle time is taken from
+PWI4's own timestamps for the last poll still slewing and the first poll
+not slewing, so its uncertainty is the (short) final poll interval.
+
+The tracker also notes how far each axis travelled and when each came
+within arrival_arcsec of its target, which is what the slew-time model
+(SlewTimeModel) is fitted from.
+"""
+
+import math
+import threading
+import time
+
+
+class SlewTracker(object):
+    """
+    Tracks one slew to completion.
+
+    get_status is a function taking a maximum cache age (seconds) and
+    returning a PWI4Status.
+    """
+
+    def __init__(
+        self,
+        get_status,
+        min_interval=0.05,
+        max_interval=1.0,
+        progress_interval=1.0,
+        timeout=600.0,
+        arrival_arcsec=10.0,
+    ):
+        self.get_status = get_status
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.progress_interval = progress_interval
+        self.timeout = timeout
+        self.arrival_arcsec = arrival_arcsec
+        self.abort = threading.Event()
+
+    @staticmethod
+    def distance(status):
+        """
+        Remaining distance to the target in arcsec (None if not reported)
+        """
+        axis0 = status.mount.axis0.dist_to_target_arcsec
+        axis1 = status.mount.axis1.dist_to_target_arcsec
+        if axis0 is None or axis1 is None:
+            return None
+        return math.hypot(axis0, axis1)
+
+    @staticmethod
+    def status_time(status):
+        """
+        PWI4's time of the status in seconds (local time if not reported)
+        """
+        if status.mount.julian_date is not None:
+            return status.mount.julian_date * 86400.0
+        return time.time()
+
+    @staticmethod
+    def axes(status):
+        return (status.mount.axis0, status.mount.axis1)
+
+    def note_arrivals(self, status, t_start, axis_busy, axis_arrival):
+        """
+        Update the time each axis was last seen away from its target, and
+        when it arrived (seconds from t_start; None while it is away).
+        """
+        t = self.status_time(status)
+        for k, axis in enumerate(self.axes(status)):
+            distance = axis.dist_to_target_arcsec
+            if distance is not None and abs(distance) > self.arrival_arcsec:
+                axis_busy[k] = t
+                axis_arrival[k] = None
+            elif axis_arrival[k] is None:
+                axis_arrival[k] = 0.5 * (axis_busy[k] + t) - t_start
+
+    def next_interval(self, distance, speed):
+        """
+        Time to wait before the next poll: a quarter of the estimated time
+        to arrival, within [min_interval, max_interval]. Until the speed is
+        known, poll quickly to measure it.
+        """
+        if speed is None:
+            return self.min_interval
+        if distance is None or speed <= 0:
+            return self.max_interval
+        return min(max(distance / speed / 4.0, self.min_interval), self.max_interval)
+
+    def track(self, on_progress=None):
+        """
+        Poll until the mount stops slewing, the timeout passes, or abort
+        is set. on_progress(status, progress) is called at most once per
+        progress_interval, where progress is a dictionary of
+        slew_distance_arcsec, slew_speed_arcsec_per_sec and slew_eta_sec.
+
+        Returns a dictionary with the final status, completed (bool),
+        settle_time (seconds from the first poll to arrival),
+        settle_time_uncertainty (seconds), polls, and for each axis its
+        travel (axis_travel_degs) and arrival time (axis_arrival_time,
+        seconds from the first poll).
+        """
+        start = self.get_status(0)
+        t_start = last_busy = self.status_time(start)
+        axis_busy = [t_start, t_start]
+        axis_arrival = [None, None]
+        self.note_arrivals(start, t_start, axis_busy, axis_arrival)
+        last_distance, last_time = self.distance(start), time.monotonic()
+        first_distance = last_distance
+        speed = None
+        last_progress = 0.0
+        polls = 1
+        deadline = time.monotonic() + self.timeout
+        status = start
+
+        while status.mount.is_slewing:
+            interval = self.next_interval(last_distance, speed)
+            if self.abort.wait(interval) or time.monotonic() > deadline:
+                return {
+                    "status": status,
+                    "completed": False,
+                    "settle_time": None,
+                    "settle_time_uncertainty": None,
+                    "polls": polls,
+                }
+
+            status = self.get_status(self.min_interval)
+            polls += 1
+            self.note_arrivals(status, t_start, axis_busy, axis_arrival)
+            now = time.monotonic()
+            distance = self.distance(status)
+            if not status.mount.is_slewing:
+                break
+            last_busy = self.status_time(status)
+
+            # Smooth the approach speed, which is what sets the poll rate
+            if distance is not None and last_distance is not None:
+                sample = (last_distance - distance) / max(now - last_time, 1e-3)
+                speed = sample if speed is None else 0.5 * (speed + sample)
+            last_distance, last_time = distance, now
+
+            if (
+                on_progress is not None
+                and now - last_progress >= self.progress_interval
+            ):
+                last_progress = now
+                on_progress(
+                    status,
+                    {
+                        "slew_distance_arcsec": distance,
+                        "slew_progress": (
+                            1.0 - distance / first_distance
+                            if distance is not None and first_distance
+                            else None
+                        ),
+                        "slew_speed_arcsec_per_sec": speed,
+                        "slew_eta_sec": (
+                            distance / speed
+                            if distance is not None and speed and speed > 0
+                            else None
+                        ),
+                    },
+                )
+
+        # The mount arrived between the last busy poll and this one
+        done = self.status_time(status)
+        settle_time = 0.5 * (last_busy + done) - t_start if polls > 1 else 0.0
+        travel = [
+            (
+                abs(end.position_degs - begin.position_degs)
+                if end.position_degs is not None and begin.position_degs is not None
+                else None
+            )
+            for begin, end in zip(self.axes(start), self.axes(status))
+        ]
+        return {
+            "status": status,
+            "completed": True,
+            "settle_time": settle_time,
+            "settle_time_uncertainty": 0.5 * (done - last_busy) if polls > 1 else 0.0,
+            "polls": polls,
+            "axis_travel_degs": travel,
+            "axis_arrival_time": [
+                settle_time if arrival is None else min(arrival, settle_time)
+                for arrival in axis_arrival
+            ],
+        }
@@ -0,0 +1,138 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Blind target acquisition with PWI4's spiral offsets.
+
+When the target is not in the acquisition region after a slew, the mount
+is stepped around a square spiral (mount_spiral_offset_new / next) while
+the camera SubAgent takes short frames of the acquisition region of
+interest. Each frame is searched with the vectorized star finder, and the
+search stops at the first frame with a source above acquire_min_snr; the
+mount is then offset to put the source on the center of the region.
+
+PWI4 moves the mount on its own once a step is commanded, so the next step
+is sent as soon as a frame has been read out, and the frame is searched
+while the mount moves. If the target is found, the mount is stepped back
+(mount_spiral_offset_previous) to the frame it was found in.
+"""
+
+import math
+import time
+
+from Astronomy.StarDetection import find_stars
+from PointingModelRun import detector_to_sky
+
+
+class SpiralAcquisition(object):
+    """
+    One spiral search, driven from the mount agent.
+
+    agent is the PlanewaveMountAgent; the camera is the SubAgent named by
+    acquire_camera_agent (or pointing_camera_agent) in its configuration.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.talk = agent.planewave_mount_talk
+        self.config = agent.config
+        camera_name = self.config.get(
+            "acquire_camera_agent", self.config.get("pointing_camera_agent")
+        )
+        self.camera = agent.peers.get(camera_name)
+        if self.camera is None:
+            raise ValueError(
+                "Acquisition needs acquire_camera_agent (%s) in the same "
+                "CompositeAgent" % camera_name
+            )
+
+        self.exptime = self.config.get("acquire_exptime", 1.0)
+        self.roi = self.config.get("acquire_roi")
+        self.min_snr = self.config.get("acquire_min_snr", 10.0)
+        self.nsigma = self.config.get("acquire_nsigma", 5.0)
+        self.plate_scale = self.config["pointing_plate_scale"]
+        self.camera_angle = math.radians(self.config.get("pointing_camera_angle", 0.0))
+        self.camera_flip = self.config.get("pointing_camera_flip", False)
+        # Spiral steps a bit smaller than the region, so the frames overlap
+        self.step_arcsec = self.config.get("acquire_step_arcsec")
+        if self.step_arcsec is None and self.roi is not None:
+            self.step_arcsec = 0.8 * min(self.roi[2], self.roi[3]) * self.plate_scale
+        if self.step_arcsec is None:
+            raise ValueError("Acquisition needs acquire_step_arcsec or acquire_roi")
+
+    def wait_for_mount(self):
+        """
+        Wait until the mount has finished the last offset.
+        """
+        return self.agent.track_slew()["completed"]
+
+    def search(self, image, origin):
+        """
+        Look for the target in a frame. Returns its (x, y) offset from the
+        center of the region in pixels and its SNR, or None.
+        """
+        stars = find_stars(image, nsigma=self.nsigma, max_stars=1)
+        if not len(stars["x"]) or stars["snr"][0] < self.min_snr:
+            return None
+        if self.roi is None:
+            center_x = 0.5 * (image.shape[1] - 1)
+            center_y = 0.5 * (image.shape[0] - 1)
+        else:
+            center_x = self.roi[0] + 0.5 * (self.roi[2] - 1) - origin[0]
+            center_y = self.roi[1] + 0.5 * (self.roi[3] - 1) - origin[1]
+        return (
+            stars["x"][0] - center_x,
+            stars["y"][0] - center_y,
+            float(stars["snr"][0]),
+        )
+
+    def run(self, max_steps=49):
+        """
+        Search up to max_steps spiral positions (the first is where the
+        mount is now). Returns a dictionary with found (bool), steps, the
+        target's offset from the region center (east, north arcsec, before
+        centering), its snr and the elapsed time.
+        """
+        start = time.monotonic()
+        self.talk.command(
+            self.talk.pwi4.mount_spiral_offset_new, self.step_arcsec, self.step_arcsec
+        )
+        result = {"found": False, "steps": 0, "offset_arcsec": None, "snr": None}
+
+        for step in range(max_steps):
+            if step and not self.wait_for_mount():
+                break
+            image, origin = self.camera.acquire_frame(self.exptime, self.roi)
+            result["steps"] = step + 1
+
+            # Start the next step, then search this frame while the mount moves
+            moving = step + 1 < max_steps
+            if moving:
+                self.agent.mount_status = self.talk.command(
+                    self.talk.pwi4.mount_spiral_offset_next
+                )
+            found = self.search(image, origin)
+            if found is None:
+                continue
+
+            # Back to the frame the target is in, and center it
+            if moving:
+                self.wait_for_mount()
+                self.talk.command(self.talk.pwi4.mount_spiral_offset_previous)
+            east, north = detector_to_sky(
+                found[0],
+                found[1],
+                self.plate_scale,
+                self.camera_angle,
+                self.camera_flip,
+            )
+            self.agent.mount_status = self.talk.command(
+                self.talk.pwi4.mount_offset, ra_add_arcsec=east, dec_add_arcsec=north
+            )
+            self.wait_for_mount()
+            result.update(found=True, offset_arcsec=(east, north), snr=found[2])
+            break
+
+        result["elapsed"] = time.monotonic() - start
+        return result
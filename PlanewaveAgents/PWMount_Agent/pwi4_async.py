@@ -0,0 +1,224 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+asyncio variant of the PWI4 client.
+
+AsyncPWI4 has the same methods as PWI4 (mount_goto_alt_az, status,
+mount_offset, ...), but each returns a coroutine, so mount status polling
+and commands can interleave with other work on one event loop instead of
+blocking it while PWI4 responds:
+
+    pwi4 = AsyncPWI4("localhost", 8220)
+    status = await pwi4.status()
+    await pwi4.mount_goto_alt_az(45.0, 200.0)
+
+Requests go over a pool of keep-alive connections opened with asyncio
+streams; the pool behaves like that of PWI4HttpCommunicator.
+"""
+
+import asyncio
+import time
+
+from pwi4_client import PWI4, PWI4HttpCommunicator
+
+
+class AsyncPWI4(PWI4):
+    """
+    asyncio client to the PWI4 telescope control application.
+
+    All of the high-level methods of PWI4 are inherited; since they return
+    the result of request() or request_with_status(), which are coroutines
+    here, they are awaitable.
+    """
+
+    def __init__(self, host="localhost", port=8220, pool_size=4, idle_timeout=30.0):
+        self.host = host
+        self.port = port
+        self.comm = AsyncPWI4HttpCommunicator(host, port, pool_size, idle_timeout)
+
+    async def virtualcamera_take_image_and_save(self, filename):
+        """
+        Request a fake FITS image from PWI4.
+        Save the contents to the specified filename
+        """
+
+        contents = await self.virtualcamera_take_image()
+        with open(filename, "wb") as f:
+            f.write(contents)
+
+    async def close(self):
+        await self.comm.close()
+
+    ### Low-level methods for issuing requests ##################
+
+    async def request(self, command, **kwargs):
+        return await self.comm.request(command, **kwargs)
+
+    async def request_with_status(self, command, **kwargs):
+        response_text = await self.request(command, **kwargs)
+        return self.parse_status(response_text)
+
+
+class AsyncPWI4HttpCommunicator(PWI4HttpCommunicator):
+    """
+    Manages communication with PWI4 via HTTP, without blocking the event loop.
+
+    Pooled connections are (reader, writer) stream pairs. The pool's
+    semaphore is created on first use, so that it belongs to the running
+    event loop.
+    """
+
+    def __init__(self, host="localhost", port=8220, pool_size=4, idle_timeout=30.0):
+        super().__init__(host, port, pool_size, idle_timeout)
+        self.pool_slots = None
+
+    def new_connection(self):
+        return asyncio.open_connection(self.host, self.port)
+
+    async def get_connection(self):
+        """
+        Take the most recently used idle connection from the pool, closing any
+        that have been idle too long, or open a new one.
+        Returns the connection, and whether it was reused.
+        """
+        now = time.monotonic()
+        while self.idle_connections:
+            last_used, conn = self.idle_connections.pop()
+            if now - last_used < self.idle_timeout and not conn[0].at_eof():
+                self.evict_idle(now)
+                return conn, True
+            conn[1].close()
+        return await self.new_connection(), False
+
+    def evict_idle(self, now):
+        while (
+            self.idle_connections
+            and now - self.idle_connections[0][0] >= self.idle_timeout
+        ):
+            self.idle_connections.pop(0)[1][1].close()
+
+    def put_connection(self, conn):
+        self.idle_connections.append((time.monotonic(), conn))
+        while len(self.idle_connections) > self.pool_size:
+            self.idle_connections.pop(0)[1][1].close()
+
+    async def close(self):
+        """
+        Close all pooled connections
+        """
+        for _, (_, writer) in self.idle_connections:
+            writer.close()
+        self.idle_connections = []
+
+    async def send(self, conn, path, postdata):
+        """
+        Issue one request on a connection, returning the response status,
+        reason, payload, and whether the server will close the connection.
+        """
+        reader, writer = conn
+        method = "GET" if postdata is None else "POST"
+        head = "%s %s HTTP/1.1\r\nHost: %s:%s\r\n" % (
+            method,
+            path,
+            self.host,
+            self.port,
+        )
+        if postdata is not None:
+            head += "Content-Type: application/x-www-form-urlencoded\r\n"
+            head += "Content-Length: %d\r\n" % len(postdata)
+        writer.write(head.encode("latin-1") + b"\r\n" + (postdata or b""))
+        await writer.drain()
+
+        # Status line, e.g. "HTTP/1.1 200 OK"
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("PWI4 closed the connection")
+        version, status, reason = (
+            status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+        )[:3]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        will_close = (
+            headers.get("connection", "").lower() == "close"
+            or version == "HTTP/1.0"
+            and headers.get("connection", "").lower() != "keep-alive"
+        )
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                payload += await reader.readexactly(size)
+                await reader.readline()
+        elif "content-length" in headers:
+            payload = await reader.readexactly(int(headers["content-length"]))
+        else:
+            payload = await reader.read()
+            will_close = True
+
+        return int(status), reason, payload, will_close
+
+    async def request(self, path, postdata=None, **kwargs):
+        """
+        Issue a request to PWI using the keyword=value parameters
+        supplied to the function, and return the response received from
+        PWI. See PWI4HttpCommunicator.request().
+        """
+
+        # Construct the path and query that we will request
+        path = self.make_path(path, **kwargs)
+
+        if self.pool_slots is None:
+            self.pool_slots = asyncio.Semaphore(self.pool_size)
+
+        async with self.pool_slots:
+            conn, reused = await asyncio.wait_for(
+                self.get_connection(), self.timeout_seconds
+            )
+            try:
+                status, reason, payload, will_close = await asyncio.wait_for(
+                    self.send(conn, path, postdata), self.timeout_seconds
+                )
+            except (
+                ConnectionResetError,
+                BrokenPipeError,
+                asyncio.IncompleteReadError,
+            ):
+                # The server closed the idle connection; try once on a new one
+                conn[1].close()
+                if not reused:
+                    raise
+                conn = await asyncio.wait_for(
+                    self.new_connection(), self.timeout_seconds
+                )
+                try:
+                    status, reason, payload, will_close = await asyncio.wait_for(
+                        self.send(conn, path, postdata), self.timeout_seconds
+                    )
+                except BaseException:
+                    conn[1].close()
+                    raise
+            except BaseException:
+                # Including a timeout or cancellation part way through a
+                # response, which leaves the connection unusable
+                conn[1].close()
+                raise
+
+            if will_close:
+                conn[1].close()
+            else:
+                self.put_connection(conn)
+
+        self.check_response(status, reason, payload)
+        return payload
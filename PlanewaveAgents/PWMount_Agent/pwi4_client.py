@@ -5,16 +5,11 @@ from other Python scripts, or can be adapted to other languages
 as needed.
 """
 
-try:
-    # Python 3.x version
-    from urllib.parse import urlencode
-    from urllib.request import urlopen
-    from urllib.error import HTTPError
-except ImportError:
-    # Python 2.7 version
-    from urllib import urlencode
-
-    # from urllib2 import urlopen, HTTPError
+import http.client
+import socket
+import threading
+import time
+from urllib.parse import urlencode
 
 
 class PWI4:
@@ -22,10 +17,10 @@ class PWI4:
     Client to the PWI4 telescope control application.
     """
 
-    def __init__(self, host="localhost", port=8220):
+    def __init__(self, host="localhost", port=8220, pool_size=4, idle_timeout=30.0):
         self.host = host
         self.port = port
-        self.comm = PWI4HttpCommunicator(host, port)
+        self.comm = PWI4HttpCommunicator(host, port, pool_size, idle_timeout)
 
     ### High-level methods #################################
 
@@ -315,248 +310,301 @@ class PWI4:
         return response_dict
 
     def parse_status(self, response_text):
-        response_dict = self.status_text_to_dict(response_text)
-        return PWI4Status(response_dict)
+        return PWI4Status(response_text)
+
+
+### Status schema #############################################
+
+
+# Converters from the raw bytes of a status value
+def bool_value(value):
+    return value.strip().lower() == b"true"
+
+
+def str_value(value):
+    return value.decode("utf-8")
+
+
+def offset_fields(axis):
+    return [
+        ("mount.offsets.%s.total" % axis, float),
+        ("mount.offsets.%s.rate" % axis, float),
+        ("mount.offsets.%s.gradual_offset_progress" % axis, float),
+    ]
+
+
+def axis_fields(axis):
+    return [
+        ("mount.%s.is_enabled" % axis, bool_value),
+        ("mount.%s.rms_error_arcsec" % axis, float),
+        ("mount.%s.dist_to_target_arcsec" % axis, float),
+        ("mount.%s.servo_error_arcsec" % axis, float),
+        ("mount.%s.position_degs" % axis, float),
+        ("mount.%s.position_timestamp_str" % axis, str_value),  # Added in 4.0.9 beta 2
+    ]
+
+
+# Every field of PWI4Status as (attribute path, converter). The attribute
+# path is also the PWI4 status keyword, except for those in STATUS_KEYS.
+STATUS_FIELDS = (
+    [
+        ("pwi4.version", str_value),  # Added in 4.0.5 beta 1
+        ("pwi4.version_field", None),  # Added in 4.0.9 beta 2
+        ("response.timestamp_utc", str_value),  # Added in 4.0.9 beta 2
+        ("site.latitude_degs", float),
+        ("site.longitude_degs", float),
+        ("site.height_meters", float),
+        ("site.lmst_hours", float),
+        ("mount.is_connected", bool_value),
+        ("mount.geometry", int),
+        ("mount.timestamp_utc", str_value),  # Added in 4.0.9 beta 7
+        ("mount.julian_date", float),  # Added in 4.0.9 beta 2
+        ("mount.slew_time_constant", float),  # Added in 4.0.9 beta 6
+        ("mount.ra_apparent_hours", float),
+        ("mount.dec_apparent_degs", float),
+        ("mount.ra_j2000_hours", float),
+        ("mount.dec_j2000_degs", float),
+        ("mount.target_ra_apparent_hours", float),  # Added in 4.0.5 beta 1
+        ("mount.target_dec_apparent_degs", float),  # Added in 4.0.5 beta 1
+        ("mount.azimuth_degs", float),
+        ("mount.altitude_degs", float),
+        ("mount.is_slewing", bool_value),
+        ("mount.is_tracking", bool_value),
+        ("mount.field_angle_here_degs", float),
+        ("mount.field_angle_at_target_degs", float),
+        ("mount.field_angle_rate_at_target_degs_per_sec", float),
+        ("mount.path_angle_at_target_degs", float),
+        ("mount.path_angle_rate_at_target_degs_per_sec", float),
+    ]
+    + axis_fields("axis0")
+    + axis_fields("axis1")
+    + [
+        ("mount.model.filename", str_value),
+        ("mount.model.num_points_total", int),
+        ("mount.model.num_points_enabled", int),
+        ("mount.model.rms_error_arcsec", float),
+    ]
+    + offset_fields("ra_arcsec")  # mount.offests.* was added in PWI 4.0.11 Beta 5
+    + offset_fields("dec_arcsec")
+    + offset_fields("axis0_arcsec")
+    + offset_fields("axis1_arcsec")
+    + offset_fields("path_arcsec")
+    + offset_fields("transverse_arcsec")
+    + [
+        ("focuser.is_connected", bool_value),
+        ("focuser.is_enabled", bool_value),
+        ("focuser.position", float),
+        ("focuser.is_moving", bool_value),
+        ("rotator.is_connected", bool_value),
+        ("rotator.is_enabled", bool_value),
+        ("rotator.mech_position_degs", float),
+        ("rotator.field_angle_degs", float),
+        ("rotator.is_moving", bool_value),
+        ("rotator.is_slewing", bool_value),
+        ("m3.port", int),
+        ("autofocus.is_running", bool_value),
+        ("autofocus.success", bool_value),
+        ("autofocus.best_position", float),
+        ("autofocus.tolerance", float),
+    ]
+)
+
+# Attributes whose PWI4 keyword differs from the attribute path
+STATUS_KEYS = {
+    "mount.axis0.position_timestamp_str": "mount.axis0.position_timestamp",
+    "mount.axis1.position_timestamp_str": "mount.axis1.position_timestamp",
+    "focuser.is_connected": "focuser.is_enabled",
+}
+
+# Values used when a keyword is missing from the response (otherwise None)
+STATUS_DEFAULTS = {
+    "pwi4.version": "<unknown>",
+}
+
+# Fields built from several keywords
+COMPUTED_FIELDS = {
+    "pwi4.version_field": lambda status: [
+        status.get_int("pwi4.version_field[%d]" % i, 0) for i in range(4)
+    ],
+}
+
+# Sections that are None unless the response contains the given keyword
+# (reporting not supported by the running version of PWI4)
+OPTIONAL_SECTIONS = {
+    "mount.offsets": "mount.offsets.ra_arcsec.total",
+}
+
+
+### Status objects ############################################
+
+
+def field_loader(path, convert):
+    if path in COMPUTED_FIELDS:
+        return COMPUTED_FIELDS[path]
+    key = ("\n" + STATUS_KEYS.get(path, path) + "=").encode("utf-8")
+    # PWI4 sends its keywords in the same order every time, so where this
+    # one was last found is a good place to start looking next time
+    hint = [0]
+    default = STATUS_DEFAULTS.get(path)
+
+    def load(status):
+        value = status.lookup(key, hint)
+        return default if value is None else convert(value)
+
+    return load
+
+
+def section_loader(path, section_class):
+    required = OPTIONAL_SECTIONS.get(path)
+    required = None if required is None else ("\n" + required + "=").encode("utf-8")
+
+    def load(status):
+        if required is not None and status.lookup(required) is None:
+            return None
+        return section_class(status)
+
+    return load
+
+
+def make_loaders(prefix, fields):
+    """
+    Return a dictionary of member name -> loader function for the fields
+    and subsections under prefix. A loader takes the PWI4Status and
+    returns the converted value (or the Section).
+    """
+    members = {}
+    for path, convert in fields:
+        name, _, rest = path[len(prefix) :].partition(".")
+        if rest:
+            members.setdefault(name, []).append((path, convert))
+        else:
+            members[name] = convert
+
+    loaders = {}
+    for name, member in members.items():
+        path = prefix + name
+        if isinstance(member, list):
+            loaders[name] = section_loader(path, make_section(path + ".", member))
+        else:
+            loaders[name] = field_loader(path, member)
+    return loaders
 
 
-class Section(object):
+def make_section(prefix, fields):
     """
-    Simple object for collecting properties in PWI4Status
+    Build a slotted Section class for the status fields under prefix
     """
+    loaders = make_loaders(prefix, fields)
+    return type(
+        "Section", (Section,), {"__slots__": tuple(loaders), "loaders": loaders}
+    )
 
-    pass
 
-
-class PWI4Status:
+class LazyMembers(object):
     """
-    Wraps the status response for many PWI4 commands in a class with named members
+    Base for status objects whose members are slots filled in on first
+    access, from the loader functions in the class's loaders dictionary.
     """
 
-    def __init__(self, status_dict):
-        self.raw = status_dict  # Allow direct access to raw entries as needed
-
-        self.pwi4 = Section()
-        self.pwi4.version = "<unknown>"
-        self.pwi4.version_field = [0, 0, 0, 0]
-
-        self.pwi4.version = self.raw["pwi4.version"]  # Added in 4.0.5 beta 1
-
-        # pwi4.version_field[] was added in 4.0.9 beta 2
-        self.pwi4.version_field[0] = self.get_int("pwi4.version_field[0]", 0)
-        self.pwi4.version_field[1] = self.get_int("pwi4.version_field[1]", 0)
-        self.pwi4.version_field[2] = self.get_int("pwi4.version_field[2]", 0)
-        self.pwi4.version_field[3] = self.get_int("pwi4.version_field[3]", 0)
-
-        # response.timestamp_utc was added in 4.0.9 beta 2
-        self.response = Section()
-        self.response.timestamp_utc = self.get_string("response.timestamp_utc")
-
-        self.site = Section()
-        self.site.latitude_degs = self.get_float("site.latitude_degs")
-        self.site.longitude_degs = self.get_float("site.longitude_degs")
-        self.site.height_meters = self.get_float("site.height_meters")
-        self.site.lmst_hours = self.get_float("site.lmst_hours")
-
-        self.mount = Section()
-        self.mount.is_connected = self.get_bool("mount.is_connected")
-        self.mount.geometry = self.get_int("mount.geometry")
-        self.mount.timestamp_utc = self.get_string(
-            "mount.timestamp_utc"
-        )  # Added in 4.0.9 beta 7
-        self.mount.julian_date = self.get_float(
-            "mount.julian_date"
-        )  # Added in 4.0.9 beta 2
-        self.mount.slew_time_constant = self.get_float(
-            "mount.slew_time_constant"
-        )  # Added in 4.0.9 beta 6
-        self.mount.ra_apparent_hours = self.get_float("mount.ra_apparent_hours")
-        self.mount.dec_apparent_degs = self.get_float("mount.dec_apparent_degs")
-        self.mount.ra_j2000_hours = self.get_float("mount.ra_j2000_hours")
-        self.mount.dec_j2000_degs = self.get_float("mount.dec_j2000_degs")
-        self.mount.target_ra_apparent_hours = self.get_float(
-            "mount.target_ra_apparent_hours"
-        )  # Added in 4.0.5 beta 1
-        self.mount.target_dec_apparent_degs = self.get_float(
-            "mount.target_dec_apparent_degs"
-        )  # Added in 4.0.5 beta 1
-        self.mount.azimuth_degs = self.get_float("mount.azimuth_degs")
-        self.mount.altitude_degs = self.get_float("mount.altitude_degs")
-        self.mount.is_slewing = self.get_bool("mount.is_slewing")
-        self.mount.is_tracking = self.get_bool("mount.is_tracking")
-        self.mount.field_angle_here_degs = self.get_float("mount.field_angle_here_degs")
-        self.mount.field_angle_at_target_degs = self.get_float(
-            "mount.field_angle_at_target_degs"
-        )
-        self.mount.field_angle_rate_at_target_degs_per_sec = self.get_float(
-            "mount.field_angle_rate_at_target_degs_per_sec"
-        )
-        self.mount.path_angle_at_target_degs = self.get_float(
-            "mount.path_angle_at_target_degs"
-        )
-        self.mount.path_angle_rate_at_target_degs_per_sec = self.get_float(
-            "mount.path_angle_rate_at_target_degs_per_sec"
-        )
+    __slots__ = ()
+    loaders = {}
 
-        self.mount.axis0 = Section()
-        self.mount.axis0.is_enabled = self.get_bool("mount.axis0.is_enabled")
-        self.mount.axis0.rms_error_arcsec = self.get_float(
-            "mount.axis0.rms_error_arcsec"
-        )
-        self.mount.axis0.dist_to_target_arcsec = self.get_float(
-            "mount.axis0.dist_to_target_arcsec"
-        )
-        self.mount.axis0.servo_error_arcsec = self.get_float(
-            "mount.axis0.servo_error_arcsec"
-        )
-        self.mount.axis0.position_degs = self.get_float("mount.axis0.position_degs")
-        self.mount.axis0.position_timestamp_str = self.get_string(
-            "mount.axis0.position_timestamp"
-        )  # Added in 4.0.9 beta 2
-
-        self.mount.axis1 = Section()
-        self.mount.axis1.is_enabled = self.get_bool("mount.axis1.is_enabled")
-        self.mount.axis1.rms_error_arcsec = self.get_float(
-            "mount.axis1.rms_error_arcsec"
-        )
-        self.mount.axis1.dist_to_target_arcsec = self.get_float(
-            "mount.axis1.dist_to_target_arcsec"
-        )
-        self.mount.axis1.servo_error_arcsec = self.get_float(
-            "mount.axis1.servo_error_arcsec"
-        )
-        self.mount.axis1.position_degs = self.get_float("mount.axis1.position_degs")
-        self.mount.axis1.position_timestamp_str = self.get_string(
-            "mount.axis1.position_timestamp"
-        )  # Added in 4.0.9 beta 2
-
-        self.mount.model = Section()
-        self.mount.model.filename = self.get_string("mount.model.filename")
-        self.mount.model.num_points_total = self.get_int("mount.model.num_points_total")
-        self.mount.model.num_points_enabled = self.get_int(
-            "mount.model.num_points_enabled"
-        )
-        self.mount.model.rms_error_arcsec = self.get_float(
-            "mount.model.rms_error_arcsec"
-        )
+    def __getattr__(self, name):
+        # Only called when the slot has not been filled in yet
+        try:
+            load = self.loaders[name]
+        except KeyError:
+            raise AttributeError(
+                "%r object has no attribute %r" % (type(self).__name__, name)
+            ) from None
+        value = load(self.status)
+        setattr(self, name, value)
+        return value
 
-        # mount.offests.* was added in PWI 4.0.11 Beta 5
-        if "mount.offsets.ra_arcsec.total" not in self.raw:
-            self.mount.offsets = (
-                None  # Offset reporting not supported by running version of PWI4
-            )
-        else:
-            self.mount.offsets = Section()
 
-            self.mount.offsets.ra_arcsec = Section()
-            self.mount.offsets.ra_arcsec.total = self.get_float(
-                "mount.offsets.ra_arcsec.total"
-            )
-            self.mount.offsets.ra_arcsec.rate = self.get_float(
-                "mount.offsets.ra_arcsec.rate"
-            )
-            self.mount.offsets.ra_arcsec.gradual_offset_progress = self.get_float(
-                "mount.offsets.ra_arcsec.gradual_offset_progress"
-            )
+class Section(LazyMembers):
+    """
+    Simple object for collecting properties in PWI4Status
+    """
 
-            self.mount.offsets.dec_arcsec = Section()
-            self.mount.offsets.dec_arcsec.total = self.get_float(
-                "mount.offsets.dec_arcsec.total"
-            )
-            self.mount.offsets.dec_arcsec.rate = self.get_float(
-                "mount.offsets.dec_arcsec.rate"
-            )
-            self.mount.offsets.dec_arcsec.gradual_offset_progress = self.get_float(
-                "mount.offsets.dec_arcsec.gradual_offset_progress"
-            )
+    __slots__ = ("status",)
 
-            self.mount.offsets.axis0_arcsec = Section()
-            self.mount.offsets.axis0_arcsec.total = self.get_float(
-                "mount.offsets.axis0_arcsec.total"
-            )
-            self.mount.offsets.axis0_arcsec.rate = self.get_float(
-                "mount.offsets.axis0_arcsec.rate"
-            )
-            self.mount.offsets.axis0_arcsec.gradual_offset_progress = self.get_float(
-                "mount.offsets.axis0_arcsec.gradual_offset_progress"
-            )
+    def __init__(self, status):
+        self.status = status
 
-            self.mount.offsets.axis1_arcsec = Section()
-            self.mount.offsets.axis1_arcsec.total = self.get_float(
-                "mount.offsets.axis1_arcsec.total"
-            )
-            self.mount.offsets.axis1_arcsec.rate = self.get_float(
-                "mount.offsets.axis1_arcsec.rate"
-            )
-            self.mount.offsets.axis1_arcsec.gradual_offset_progress = self.get_float(
-                "mount.offsets.axis1_arcsec.gradual_offset_progress"
-            )
 
-            self.mount.offsets.path_arcsec = Section()
-            self.mount.offsets.path_arcsec.total = self.get_float(
-                "mount.offsets.path_arcsec.total"
-            )
-            self.mount.offsets.path_arcsec.rate = self.get_float(
-                "mount.offsets.path_arcsec.rate"
-            )
-            self.mount.offsets.path_arcsec.gradual_offset_progress = self.get_float(
-                "mount.offsets.path_arcsec.gradual_offset_progress"
-            )
+class PWI4Status(LazyMembers):
+    """
+    Wraps the status response for many PWI4 commands in a class with named members
 
-            self.mount.offsets.transverse_arcsec = Section()
-            self.mount.offsets.transverse_arcsec.total = self.get_float(
-                "mount.offsets.transverse_arcsec.total"
-            )
-            self.mount.offsets.transverse_arcsec.rate = self.get_float(
-                "mount.offsets.transverse_arcsec.rate"
-            )
-            self.mount.offsets.transverse_arcsec.gradual_offset_progress = (
-                self.get_float(
-                    "mount.offsets.transverse_arcsec.gradual_offset_progress"
-                )
-            )
+    The response is kept as raw bytes. Each member is found and converted
+    the first time it is read, so a caller that needs only a handful of the
+    fields pays only for those.
+    """
+
+    loaders = make_loaders("", STATUS_FIELDS)
+    __slots__ = ("payload", "status", "_raw") + tuple(loaders)
 
-        self.focuser = Section()
-        self.focuser.is_connected = self.get_bool("focuser.is_enabled")
-        self.focuser.is_enabled = self.get_bool("focuser.is_enabled")
-        self.focuser.position = self.get_float("focuser.position")
-        self.focuser.is_moving = self.get_bool("focuser.is_moving")
-
-        self.rotator = Section()
-        self.rotator.is_connected = self.get_bool("rotator.is_connected")
-        self.rotator.is_enabled = self.get_bool("rotator.is_enabled")
-        self.rotator.mech_position_degs = self.get_float("rotator.mech_position_degs")
-        self.rotator.field_angle_degs = self.get_float("rotator.field_angle_degs")
-        self.rotator.is_moving = self.get_bool("rotator.is_moving")
-        self.rotator.is_slewing = self.get_bool("rotator.is_slewing")
-
-        self.m3 = Section()
-        self.m3.port = self.get_int("m3.port")
-
-        self.autofocus = Section()
-        self.autofocus.is_running = self.get_bool("autofocus.is_running")
-        self.autofocus.success = self.get_bool("autofocus.success")
-        self.autofocus.best_position = self.get_float("autofocus.best_position")
-        self.autofocus.tolerance = self.get_float("autofocus.tolerance")
+    def __init__(self, payload):
+        # In Python 3, the response is of type "bytes"
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        self.payload = payload
+        self.status = self
+
+    def lookup(self, key, hint=None):
+        """
+        Return the raw bytes value of key (given as b"\\nname="), or None if
+        it is not in the response. If given, hint is a one-element list
+        holding the offset at which to start searching; it is updated to
+        just before where the key was found.
+        """
+        payload = self.payload
+        if payload.startswith(key[1:]):
+            start = len(key) - 1
+        else:
+            start = payload.find(key, hint[0]) if hint else -1
+            if start < 0:
+                start = payload.find(key)
+                if start < 0:
+                    return None
+            if hint is not None:
+                hint[0] = max(start - 64, 0)
+            start += len(key)
+        end = payload.find(b"\n", start)
+        value = payload[start:] if end < 0 else payload[start:end]
+        return value.rstrip(b"\r")
+
+    @property
+    def raw(self):
+        """
+        Dictionary of all keyword=value pairs, for direct access as needed
+        """
+        try:
+            return self._raw
+        except AttributeError:
+            self._raw = {}
+            for line in self.payload.decode("utf-8").split("\n"):
+                fields = line.rstrip("\r").split("=", 1)
+                if len(fields) == 2:
+                    self._raw[fields[0]] = fields[1]
+            return self._raw
 
     def get_bool(self, name, value_if_missing=None):
-        if name not in self.raw:
-            return value_if_missing
-        return self.raw[name].lower() == "true"
+        value = self.lookup(("\n" + name + "=").encode("utf-8"))
+        return value_if_missing if value is None else bool_value(value)
 
     def get_float(self, name, value_if_missing=None):
-        if name not in self.raw:
-            return value_if_missing
-        return float(self.raw[name])
+        value = self.lookup(("\n" + name + "=").encode("utf-8"))
+        return value_if_missing if value is None else float(value)
 
     def get_int(self, name, value_if_missing=None):
-        if name not in self.raw:
-            return value_if_missing
-        return int(self.raw[name])
+        value = self.lookup(("\n" + name + "=").encode("utf-8"))
+        return value_if_missing if value is None else int(value)
 
     def get_string(self, name, value_if_missing=None):
-        if name not in self.raw:
-            return value_if_missing
-        return self.raw[name]
+        value = self.lookup(("\n" + name + "=").encode("utf-8"))
+        return value_if_missing if value is None else str_value(value)
 
     def __repr__(self):
         """
@@ -575,30 +623,52 @@ class PWI4Status:
         return "\n".join(lines)
 
 
+class NoDelayHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection with Nagle's algorithm disabled, so that a request
+    sent in two writes (headers, then POST body) is not held back waiting
+    for a delayed ACK on a persistent connection.
+    """
+
+    def connect(self):
+        super().connect()
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
 class PWI4HttpCommunicator:
     """
     Manages communication with PWI4 via HTTP.
+
+    Requests are sent over a pool of persistent (keep-alive) connections,
+    so that frequent status polling does not pay for a new TCP connection
+    each time. At most pool_size requests are in flight at once; pooled
+    connections idle for longer than idle_timeout seconds are closed, and a
+    request on a pooled connection that the server has since dropped is
+    transparently retried on a fresh one.
     """
 
-    def __init__(self, host="localhost", port=8220):
+    def __init__(self, host="localhost", port=8220, pool_size=4, idle_timeout=30.0):
         self.host = host
         self.port = port
 
         self.timeout_seconds = 3
 
-    def make_url(self, path, **kwargs):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.idle_connections = []  # (time last used, connection), oldest first
+        self.pool_lock = threading.Lock()
+        self.pool_slots = threading.BoundedSemaphore(pool_size)
+
+    def make_path(self, path, **kwargs):
         """
         Utility function that takes a set of keyword=value arguments
-        and converts them into a properly formatted URL to send to PWI.
+        and converts them into a properly formatted path and query string.
         Special characters (spaces, colons, plus symbols, etc.) are encoded as needed.
 
         Example:
-          make_url("/mount/gotoradec2000", ra=10.123, dec="15 30 45") -> "http://localhost:8220/mount/gotoradec2000?ra=10.123&dec=15%2030%2045"
+          make_path("/mount/gotoradec2000", ra=10.123, dec="15 30 45") -> "/mount/gotoradec2000?ra=10.123&dec=15%2030%2045"
         """
 
-        # Construct the basic URL, excluding the keyword parameters; for example: "http://localhost:8220/specified/path?"
-        url = "http://" + self.host + ":" + str(self.port) + path + "?"
-
         # For every keyword=value argument given to this function,
         # construct a string of the form "key1=val1&key2=val2".
         keyword_values = list(
@@ -610,9 +680,89 @@ class PWI4HttpCommunicator:
         # This will convert plus symbols to percent encoding for improved compatibility.
         urlparams = urlparams.replace("+", "%20")
 
-        # Build the final URL and return it.
-        url = url + urlparams
-        return url
+        return path + "?" + urlparams
+
+    def make_url(self, path, **kwargs):
+        """
+        Utility function that takes a set of keyword=value arguments
+        and converts them into a properly formatted URL to send to PWI.
+
+        Example:
+          make_url("/mount/gotoradec2000", ra=10.123, dec="15 30 45") -> "http://localhost:8220/mount/gotoradec2000?ra=10.123&dec=15%2030%2045"
+        """
+        return (
+            "http://"
+            + self.host
+            + ":"
+            + str(self.port)
+            + self.make_path(path, **kwargs)
+        )
+
+    def get_connection(self):
+        """
+        Take the most recently used idle connection from the pool, closing any
+        that have been idle too long, or open a new one.
+        Returns the connection, and whether it was reused.
+        """
+        now = time.monotonic()
+        with self.pool_lock:
+            while self.idle_connections:
+                last_used, conn = self.idle_connections.pop()
+                if now - last_used < self.idle_timeout:
+                    self.evict_idle(now)
+                    return conn, True
+                conn.close()
+        return self.new_connection(), False
+
+    def new_connection(self):
+        return NoDelayHTTPConnection(self.host, self.port, timeout=self.timeout_seconds)
+
+    def evict_idle(self, now):
+        """
+        Close pooled connections that have been idle too long.
+        Must be called with pool_lock held.
+        """
+        while (
+            self.idle_connections
+            and now - self.idle_connections[0][0] >= self.idle_timeout
+        ):
+            self.idle_connections.pop(0)[1].close()
+
+    def put_connection(self, conn):
+        """
+        Return a connection to the pool for reuse
+        """
+        with self.pool_lock:
+            self.idle_connections.append((time.monotonic(), conn))
+            while len(self.idle_connections) > self.pool_size:
+                self.idle_connections.pop(0)[1].close()
+
+    def close(self):
+        """
+        Close all pooled connections
+        """
+        with self.pool_lock:
+            for _, conn in self.idle_connections:
+                conn.close()
+            self.idle_connections = []
+
+    def send(self, conn, path, postdata):
+        """
+        Issue one request on a connection, returning the response status,
+        reason, payload, and whether the server will close the connection.
+        """
+        if postdata is None:
+            conn.request("GET", path)
+        else:
+            conn.request(
+                "POST",
+                path,
+                body=postdata,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+        response = conn.getresponse()
+        payload = response.read()
+        return response.status, response.reason, payload, response.will_close
 
     def request(self, path, postdata=None, **kwargs):
         """
@@ -633,38 +783,63 @@ class PWI4HttpCommunicator:
         if there was an error with the request.
         """
 
-        # Construct the URL that we will request
-        url = self.make_url(path, **kwargs)
+        # Construct the path and query that we will request
+        path = self.make_path(path, **kwargs)
 
-        # Open a connection to the server, issue the request, and try to receive the response.
-        # The server will return an HTTP Status Code as part of the response.
-        # If the status code indicates an error, an HTTPError will be thrown.
-        try:
-            response = urlopen(url, data=postdata, timeout=self.timeout_seconds)
-        except HTTPError as e:
-            if e.code == 404:
-                error_message = "Command not found"
-            elif e.code == 400:
-                error_message = "Bad request"
-            elif e.code == 500:
-                error_message = "Internal server error (possibly a bug in PWI)"
+        # Issue the request on a pooled connection, and try to receive the response.
+        with self.pool_slots:
+            conn, reused = self.get_connection()
+            try:
+                status, reason, payload, will_close = self.send(conn, path, postdata)
+            except (
+                http.client.RemoteDisconnected,
+                ConnectionResetError,
+                BrokenPipeError,
+            ):
+                # The server closed the idle connection; try once on a new one
+                conn.close()
+                if not reused:
+                    raise
+                conn = self.new_connection()
+                try:
+                    status, reason, payload, will_close = self.send(
+                        conn, path, postdata
+                    )
+                except Exception:
+                    conn.close()
+                    raise
+            except Exception:
+                # This will often be an OSError to indicate that a connection
+                # could not be made to the server, but we'll handle any exception here
+                conn.close()
+                raise
+
+            if will_close:
+                conn.close()
             else:
-                error_message = str(e)
+                self.put_connection(conn)
 
-            try:
-                error_details = (
-                    e.read()
-                )  # Try to read the payload of the response for error information
-                error_message = error_message + ": " + error_details
-            except:
-                pass  # If that failed, we won't include any further details
+        self.check_response(status, reason, payload)
+        return payload
 
-            raise Exception(error_message)  # TODO: Consider a custom exception here
+    def check_response(self, status, reason, payload):
+        """
+        The server will return an HTTP Status Code as part of the response.
+        If the status code indicates an error, raise an exception.
+        """
+        if status < 400:
+            return
+
+        if status == 404:
+            error_message = "Command not found"
+        elif status == 400:
+            error_message = "Bad request"
+        elif status == 500:
+            error_message = "Internal server error (possibly a bug in PWI)"
+        else:
+            error_message = "HTTP Error %d: %s" % (status, reason)
 
-        except Exception as e:
-            # This will often be a urllib2.URLError to indicate that a connection
-            # could not be made to the server, but we'll handle any exception here
-            raise
+        if payload:
+            error_message = error_message + ": " + payload.decode("utf-8", "replace")
 
-        payload = response.read()
-        return payload
+        raise Exception(error_message)  # TODO: Consider a custom exception here
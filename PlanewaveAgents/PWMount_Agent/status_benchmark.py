@@ -0,0 +1,105 @@
+"""
+Created on Oct 19, 2026
+
+@author: dlytle
+
+Microbenchmark of PWI4 status parsing.
+
+Compares the lazy PWI4Status (reading only the fields that
+PlanewaveMountAgent.get_status_and_broadcast broadcasts) against the
+previous eager approach (split the whole response into a dict, then
+convert every field).
+
+Usage:
+    python status_benchmark.py [captured_status.txt ...]
+
+Capture a response with, e.g., "curl -s localhost:8220/status > status.txt".
+With no files, a synthetic response containing every status field is used.
+"""
+
+import sys
+import timeit
+
+from pwi4_client import (
+    COMPUTED_FIELDS,
+    PWI4,
+    PWI4Status,
+    STATUS_FIELDS,
+    STATUS_KEYS,
+    bool_value,
+    str_value,
+)
+
+
+def synthetic_response():
+    lines = ["pwi4.version_field[%d]=%d" % (i, v) for i, v in enumerate((4, 0, 11, 10))]
+    for path, convert in STATUS_FIELDS:
+        if path in COMPUTED_FIELDS:
+            continue
+        key = STATUS_KEYS.get(path, path)
+        if convert is bool_value:
+            value = "false"
+        elif convert is int:
+            value = "3"
+        elif convert is str_value:
+            value = "2026-10-19 07:30:00.1234567"
+        else:
+            value = "123.456789012"
+        lines.append("%s=%s" % (key, value))
+    return "\n".join(lines).encode("utf-8")
+
+
+def eager_parse(payload):
+    """
+    The previous parser: decode and split everything, convert every field
+    """
+    raw = PWI4.status_text_to_dict(None, payload)
+    values = {}
+    for path, convert in STATUS_FIELDS:
+        if path in COMPUTED_FIELDS:
+            values[path] = [
+                int(raw.get("pwi4.version_field[%d]" % i, 0)) for i in range(4)
+            ]
+            continue
+        key = STATUS_KEYS.get(path, path)
+        if key not in raw:
+            values[path] = None
+        elif convert is bool_value:
+            values[path] = raw[key].lower() == "true"
+        elif convert is str_value:
+            values[path] = raw[key]
+        else:
+            values[path] = convert(raw[key])
+    return values
+
+
+def agent_fields(payload):
+    """
+    The lazy parser, reading what the mount agent broadcasts
+    """
+    status = PWI4Status(payload)
+    return (
+        status.response.timestamp_utc,
+        status.mount.is_slewing,
+        status.mount.is_tracking,
+        status.mount.azimuth_degs,
+        status.mount.altitude_degs,
+        status.mount.ra_j2000_hours,
+        status.mount.dec_j2000_degs,
+        status.rotator.field_angle_degs,
+    )
+
+
+def main(paths):
+    payloads = [open(path, "rb").read() for path in paths] or [synthetic_response()]
+    number = 2000
+
+    for payload in payloads:
+        print("Response: %d bytes, %d lines" % (len(payload), payload.count(b"\n") + 1))
+        for name, func in (("eager dict", eager_parse), ("lazy slots", agent_fields)):
+            best = min(timeit.repeat(lambda: func(payload), number=number, repeat=5))
+            print("  %-10s  %7.2f us/response" % (name, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
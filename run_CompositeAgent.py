@@ -22,7 +22,6 @@ defined in the config file.
 # Built-In Libraries
 import argparse
 import sys
-import time
 
 # 3rd Party Libraries
 
@@ -50,12 +49,11 @@ def main():
     composite_agent = CompositeAgent(args.conffile)
     print("   ===> Agent Initialized... waiting on commands")
     while True:
-        if composite_agent.message_received:
-            composite_agent.handle_message()
-            composite_agent.message_received = 0
-        else:
+        # Handle commands as they arrive; broadcast status when idle
+        if not composite_agent.handle_message(
+            composite_agent.config["message_wait_time"]
+        ):
             composite_agent.get_status_and_broadcast()
-        time.sleep(composite_agent.config["message_wait_time"])
 
 
 if __name__ == "__main__":
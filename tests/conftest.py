@@ -0,0 +1,28 @@
+"""Test configuration: make the packages and the PlaneWave agent's modules,
+which import each other by plain module name, importable, and provide a fake
+broker connection"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "PlanewaveAgents", "PWMount_Agent"))
+
+
+class FakeConn:
+    """Broker connection recording the (body, correlation ID) of each message
+    sent"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, body, destination, headers=None):
+        self.sent.append((body, (headers or {}).get("correlation-id")))
+
+
+@pytest.fixture
+def conn():
+    return FakeConn()
@@ -0,0 +1,80 @@
+"""Command schemas: argument checking and conversion, and script checking"""
+
+import re
+
+import pytest
+
+from CommandLanguage.command_registry import (
+    Arg,
+    Command,
+    CommandError,
+    CommandRegistry,
+    validate_script,
+)
+
+MOVE = Command("move", "move", (Arg("position", int), Arg("speed", float, 1.0)))
+
+
+@pytest.mark.parametrize(
+    "arguments, values",
+    [
+        ([3.0], [3, 1.0]),
+        ([3.0, 0.5], [3, 0.5]),
+        ([-2.0], [-2, 1.0]),
+    ],
+)
+def test_validate_converts_and_fills_defaults(arguments, values):
+    converted = MOVE.validate(arguments)
+    assert converted == values
+    assert isinstance(converted[0], int)
+
+
+@pytest.mark.parametrize(
+    "arguments, message",
+    [
+        ([None], "needs argument position"),
+        ([""], "needs argument position"),
+        ([2.5], "must be a whole number"),
+        (["fast"], "must be a number"),
+        ([1.0, 2.0, 3.0], "at most 2 argument(s), 3 given"),
+    ],
+)
+def test_validate_rejects(arguments, message):
+    with pytest.raises(CommandError, match=re.escape(message)):
+        MOVE.validate(arguments)
+
+
+def test_validate_without_arguments():
+    home = Command("home", "home")
+    assert home.validate([None]) == []
+    assert home.validate([""]) == []
+    with pytest.raises(CommandError):
+        home.validate([1.0])
+
+
+def test_validate_varargs():
+    sequence = Command("sequence", "run", (Arg("count", int),), varargs=Arg("f", str))
+    assert sequence.validate([2.0, "V", 1.5]) == [2, "V", "1.5"]
+    assert sequence.validate([2.0]) == [2]
+
+
+def test_any_kind_passes_values_through():
+    assert Command("set", "set", (Arg("value", None),)).validate(["x"]) == ["x"]
+    assert Command("set", "set", (Arg("value", None),)).validate([2.5]) == [2.5]
+
+
+def test_validate_script():
+    registry = CommandRegistry("mount")
+    registry.add(MOVE)
+    script = [
+        "mount : move(3)",
+        "sleep : 5",
+        "mount : move(3.5)",
+        "",
+        "camera : anything(1, 2, 3)",
+        "mount : park",
+    ]
+    problems = validate_script(script, {"mount": registry})
+    assert [number for number, _ in problems] == [3, 6]
+    assert "whole number" in problems[0][1]
+    assert "Unknown mount command: park" in problems[1][1]
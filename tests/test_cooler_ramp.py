@@ -0,0 +1,93 @@
+"""Cooler ramps run by the CcdCoolerSubAgent, and the replies they send"""
+
+import types
+
+import pytest
+
+from AbstractAgents.CcdCoolerSubAgent import CcdCoolerSubAgent
+
+
+class FakeCooler(CcdCoolerSubAgent):
+    def __init__(self, conn):
+        super().__init__(
+            None, conn, {"dto_command_topic": "t", "ramp_update_interval": 0.02}
+        )
+        self.device_cooler = types.SimpleNamespace(isConnected=lambda: True)
+        self.setpoints = []
+        self.broadcasts = []
+
+    def get_status_and_broadcast(self):
+        self.broadcasts.append(dict(self.ramp_status))
+
+    def connect_to_cooler(self):
+        pass
+
+    def disconnect_from_cooler(self):
+        pass
+
+    def set_temperature(self, cool_temp):
+        pass
+
+    def set_cooler_setpoint(self, cool_temp):
+        self.setpoints.append(cool_temp)
+
+    def get_temperature(self):
+        return 0.0
+
+    def power_off(self):
+        pass
+
+
+def start(cooler, target, slope):
+    cooler.start_command("ramp")
+    cooler.start_ramp(target, slope)
+    cooler.finish_command()
+
+
+def test_completed_ramp_replies_go_and_clears_status(conn):
+    cooler = FakeCooler(conn)
+    start(cooler, -1.0, 120.0)  # 0.5 s
+    cooler.ramp_thread.join(5.0)
+
+    assert cooler.conn.sent == [("WAIT", "ramp"), ("GO", "ramp")]
+    assert cooler.setpoints[-1] == -1.0
+    assert cooler.broadcasts[-1]["PROFILE_STATE"] == "DONE"
+    assert cooler.ramp_status == {}
+
+
+def test_aborted_ramp_replies_error_and_clears_status(conn):
+    cooler = FakeCooler(conn)
+    start(cooler, -10.0, 1.0)  # 10 min
+    cooler.abort_ramp()
+
+    assert cooler.conn.sent == [("WAIT", "ramp"), ("ERROR: ramp aborted", "ramp")]
+    assert cooler.broadcasts[-1]["PROFILE_STATE"] == "ABORTED"
+    assert cooler.ramp_status == {}
+
+
+def test_untagged_ramp_does_not_reply_under_a_later_command(conn):
+    cooler = FakeCooler(conn)
+    cooler.start_command(None)
+    cooler.start_ramp(-10.0, 1.0)
+    cooler.finish_command()
+
+    # The ramp ends while another command is being handled
+    cooler.start_command("power_off")
+    cooler.abort_ramp()
+    cooler.finish_command()
+
+    assert conn.sent == [
+        ("WAIT", None),
+        ("ERROR: ramp aborted", None),
+        ("GO", "power_off"),
+    ]
+
+
+def test_ramp_without_temperature_replies_error(conn):
+    cooler = FakeCooler(conn)
+    cooler.get_temperature = lambda: None
+    with pytest.warns(UserWarning, match="CCD temperature not available"):
+        start(cooler, -10.0, 1.0)
+
+    assert conn.sent == [("ERROR: CCD temperature not available", "ramp")]
+    assert cooler.ramp_thread is None
@@ -0,0 +1,54 @@
+"""Dome azimuth geometry and the planning of dome moves"""
+
+import numpy as np
+import pytest
+
+from AbstractAgents.DomeSlaving import DomeGeometry, plan_dome_move
+
+TIMES = np.arange(0.0, 3601.0, 60.0)
+
+
+def test_centered_mount_follows_the_telescope():
+    dome = DomeGeometry(radius=5.0, slit_width=2.0, aperture=1.0)
+    alt = np.array([20.0, 45.0, 70.0])
+    azimuth, tolerance = dome.dome_azimuth(alt, np.array([10.0, 200.0, 359.0]))
+    assert azimuth == pytest.approx([10.0, 200.0, 359.0])
+    # Half the spare slit width, seen from the dome axis
+    expected = np.degrees(np.arcsin(0.5 / (5.0 * np.cos(np.radians(alt)))))
+    assert tolerance == pytest.approx(expected)
+
+
+def test_offset_mount_looks_through_a_different_azimuth():
+    # A mount 1 m north of center, looking east at the horizon, meets the
+    # dome north of due east
+    dome = DomeGeometry(5.0, 2.0, 1.0, mount_offset=(1.0, 0.0, 0.0))
+    azimuth, _ = dome.dome_azimuth(0.0, 90.0)
+    assert azimuth == pytest.approx(np.degrees(np.arctan2(np.sqrt(24.0), 1.0)))
+
+
+def test_plan_dome_move():
+    # The beam moves 0.6 deg a minute; 4 deg of the 5 deg tolerance is used
+    path = 100.0 + 0.01 * TIMES
+    leave, target, hold = plan_dome_move(TIMES, path, np.full(TIMES.shape, 5.0), 100.0)
+    assert leave == 420.0
+    # The target stays inside the windows up to 800 s: 103.9 is still within
+    #  4 deg of the path at 780 s
+    assert target == pytest.approx(103.9)
+    assert hold == 780.0
+
+
+def test_plan_dome_move_across_north():
+    path = (358.0 + 0.01 * TIMES) % 360.0
+    leave, target, hold = plan_dome_move(TIMES, path, np.full(TIMES.shape, 5.0), 0.5)
+    # The dome, 2.5 deg ahead, is left behind 6.5 deg on
+    assert leave == 660.0
+    assert target == pytest.approx(1.9)
+    assert hold == 780.0
+
+
+def test_plan_dome_move_not_needed():
+    path = np.full(TIMES.shape, 200.0)
+    leave, target, hold = plan_dome_move(TIMES, path, np.full(TIMES.shape, 5.0), 202.0)
+    assert leave is None
+    assert target == pytest.approx(200.0)
+    assert hold == TIMES[-1]
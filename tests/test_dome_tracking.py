@@ -0,0 +1,52 @@
+"""The reply to a dome command to track the mount that cannot be carried out"""
+
+import types
+import warnings
+
+import pytest
+
+from AbstractAgents.DomeSubAgent import DomeSubAgent
+
+
+class Dome(DomeSubAgent):
+    def __init__(self, conn, config):
+        super().__init__(None, conn, {"dto_command_topic": "dome.dto", **config})
+        self.device_dome = types.SimpleNamespace(isConnected=lambda: True)
+
+    def get_status_and_broadcast(self):
+        pass
+
+    def connect_to_dome(self):
+        pass
+
+    def disconnect_from_dome(self):
+        pass
+
+    def home(self):
+        pass
+
+    def move(self, azimuth):
+        pass
+
+    def get_azimuth(self):
+        return 0.0
+
+
+@pytest.mark.parametrize(
+    "peers, reply",
+    [
+        ({}, "ERROR: No mount to track in this CompositeAgent"),
+        ({"mount": object()}, "ERROR: Dome geometry not usable: 'dome_radius'"),
+    ],
+)
+def test_track_mount_without_mount_or_geometry_replies_error(conn, peers, reply):
+    dome = Dome(conn, {})
+    dome.peers = peers
+    dome.start_command("a")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        dome.handle_message("track_mount")
+    dome.finish_command()
+
+    assert conn.sent == [(reply, "a")]
+    assert dome.tracking_thread is None
@@ -0,0 +1,73 @@
+"""The WAIT / GO / ERROR replies a SubAgent sends the DTO for a command"""
+
+import warnings
+
+import pytest
+
+from AbstractAgents.SubAgent import SubAgent
+from CommandLanguage.command_registry import Arg, CommandRegistry
+
+
+class Agent(SubAgent):
+    commands = CommandRegistry("test", parent=SubAgent.commands)
+
+    def get_status_and_broadcast(self):
+        pass
+
+    def handle_message(self, message):
+        self.dispatch_command(message)
+
+    @commands.command("quick", Arg("n", int))
+    def quick(self, n):
+        pass
+
+    @commands.command("fail")
+    def fail(self):
+        self.reply_to_dto("ERROR: not connected")
+
+    @commands.command("slow")
+    def slow(self):
+        self.reply_to_dto("WAIT")
+        self.started = self.correlation_id
+
+
+@pytest.fixture
+def agent(conn):
+    return Agent(None, conn, {"dto_command_topic": "test.dto"})
+
+
+def run(agent, message, correlation_id):
+    agent.start_command(correlation_id)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        agent.handle_message(message)
+    agent.finish_command()
+    return agent.conn.sent
+
+
+def test_finished_command_replies_go(agent):
+    assert run(agent, "quick(3)", "a") == [("GO", "a")]
+
+
+def test_failed_command_replies_error_only(agent):
+    assert run(agent, "fail", "b") == [("ERROR: not connected", "b")]
+
+
+@pytest.mark.parametrize("message", ["nosuch", "quick", "quick(1.5)"])
+def test_bad_command_replies_error(agent, message):
+    (reply,) = run(agent, message, "c")
+    assert reply[0].startswith("ERROR: ") and reply[1] == "c"
+
+
+def test_continuing_command_replies_go_later(agent):
+    assert run(agent, "slow", "d") == [("WAIT", "d")]
+    # The next command is under way when the first finishes
+    agent.start_command("e")
+    agent.reply_to_dto("GO", agent.started)
+    assert agent.conn.sent[-1] == ("GO", "d")
+    agent.finish_command()
+    assert agent.conn.sent[-1] == ("GO", "e")
+
+
+def test_untagged_command_gets_no_reply(agent):
+    assert run(agent, "quick(1)", None) == []
@@ -0,0 +1,82 @@
+"""Ephemeris tables resampled and sent to the PWI4 custom path in chunks"""
+
+import numpy as np
+import pytest
+
+import EphemerisPath
+from EphemerisPath import load_ephemeris, resample_ephemeris, upload_path
+
+
+class FakePWI4:
+    """Records the custom path requests"""
+
+    def __init__(self):
+        self.requests = []
+
+    def mount_custom_path_new(self, coord_type):
+        self.requests.append(("new", coord_type))
+
+    def mount_custom_path_add_point_list(self, points):
+        self.requests.append(("add", list(points)))
+
+    def mount_custom_path_apply(self):
+        self.requests.append(("apply",))
+        return "status"
+
+
+def test_path_is_sent_in_chunks():
+    pwi4 = FakePWI4()
+    jd = 2461000.0 + np.arange(2500) / 8640.0
+    ra, dec = np.linspace(0.0, 1.0, 2500), np.linspace(-5.0, 5.0, 2500)
+    assert upload_path(pwi4, jd, ra, dec, chunk_points=1000) == "status"
+
+    new, *adds, apply = pwi4.requests
+    assert new == ("new", "raj2000") and apply == ("apply",)
+    assert [len(points) for _, points in adds] == [1000, 1000, 500]
+    sent = [point for _, points in adds for point in points]
+    assert sent == list(zip(jd.tolist(), ra.tolist(), dec.tolist()))
+
+
+def test_resampling_is_evenly_spaced_and_wraps_ra():
+    jd = np.array([2461000.0, 2461000.01])
+    new_jd, ra, dec = resample_ephemeris(jd, [23.9, 0.1], [10.0, 10.0], 86.4)
+
+    assert len(new_jd) == 11 and np.allclose(np.diff(new_jd), 0.001)
+    # Through 0h, not back across 12h
+    assert min(ra[5], 24.0 - ra[5]) == pytest.approx(0.0, abs=1e-6)
+    assert np.all((ra > 23.8) | (ra < 0.2))
+    assert dec[5] == pytest.approx(10.0, abs=0.01)
+
+
+def test_resampling_outside_the_table_raises():
+    with pytest.raises(ValueError):
+        resample_ephemeris([1.0, 2.0], [0.0, 1.0], [0.0, 1.0], 60.0, start=3.0)
+
+
+def test_table_is_read_and_sorted(tmp_path):
+    path = tmp_path / "ephem.txt"
+    path.write_text("# jd, ra, dec\n2461000.1, 1.5, -2.0\n2461000.0 1.0 -1.0\n")
+    jd, ra, dec = load_ephemeris(path)
+    assert jd.tolist() == [2461000.0, 2461000.1]
+    assert ra.tolist() == [1.0, 1.5] and dec.tolist() == [-1.0, -2.0]
+
+    path.write_text("2461000.0 1.0 -1.0\n")
+    with pytest.raises(ValueError):
+        load_ephemeris(path)
+
+
+def test_tracking_starts_a_step_before_now(tmp_path, monkeypatch):
+    path = tmp_path / "ephem.txt"
+    path.write_text("2461000.0 1.0 -1.0\n2461001.0 2.0 1.0\n")
+    monkeypatch.setattr(EphemerisPath, "julian_date_now", lambda: 2461000.5)
+    pwi4 = FakePWI4()
+    EphemerisPath.track_ephemeris(pwi4, path, step_seconds=864.0, chunk_points=30)
+
+    points = [point for request in pwi4.requests[1:-1] for point in request[1]]
+    assert points[0][0] == pytest.approx(2461000.49)
+    assert points[-1][0] == 2461001.0
+    assert len(points) == 52 and len(pwi4.requests) == 4
+
+    monkeypatch.setattr(EphemerisPath, "julian_date_now", lambda: 2461002.0)
+    with pytest.raises(ValueError, match="ephemeris ended"):
+        EphemerisPath.track_ephemeris(pwi4, path)
@@ -0,0 +1,268 @@
+"""The IndiClient property cache, fed with vector properties as the INDI
+server would send them"""
+
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+PyIndi = pytest.importorskip("PyIndi")
+
+from IndiAgents import IndiClient as client_module  # noqa: E402
+from IndiAgents.IndiClient import IndiClient  # noqa: E402
+
+DEVICE = "QHY CCD"
+
+
+class Vector(list):
+    """A PyIndi vector property: a list of elements, with a state"""
+
+    def __init__(self, name, state=None, device=DEVICE, **elements):
+        super().__init__(
+            types.SimpleNamespace(name=key, value=value, s=value, text=value, size=0)
+            for key, value in elements.items()
+        )
+        self.device = device
+        self.name = name
+        self.s = PyIndi.IPS_OK if state is None else state
+
+
+class Parent:
+    """The SubAgent an IndiClient reports to"""
+
+    def __init__(self):
+        self.device_status = {}
+        self.broadcasts = 0
+        self.server_changes = []
+
+    def get_status_and_broadcast(self):
+        self.broadcasts += 1
+
+    def indi_server_changed(self, connected):
+        self.server_changes.append(connected)
+
+
+@pytest.fixture
+def client():
+    config = {"status": ["CCD_TEMPERATURE"], "indi_timeout": 1.0}
+    return IndiClient(Parent(), config, DEVICE, properties=["CCD_EXPOSURE"])
+
+
+def test_updates_replace_the_cached_values(client):
+    client.newNumber(Vector("CCD_EXPOSURE", PyIndi.IPS_BUSY, CCD_EXPOSURE_VALUE=5.0))
+    first = client.get_property("CCD_EXPOSURE")
+    assert first.version == 1 and first.state == PyIndi.IPS_BUSY
+
+    client.newNumber(Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=0.0))
+    entry = client.get_property("CCD_EXPOSURE")
+    assert entry is first and entry.version == 2
+    assert entry.values == {"CCD_EXPOSURE_VALUE": 0.0}
+    assert entry.state == PyIndi.IPS_OK and entry.kind == "number"
+    assert client.get_value("CCD_EXPOSURE", "CCD_EXPOSURE_VALUE") == 0.0
+
+
+def test_unknown_properties_and_devices_read_as_none(client):
+    client.newNumber(Vector("CCD_EXPOSURE", device="Other", CCD_EXPOSURE_VALUE=1.0))
+    assert client.get_property("CCD_EXPOSURE") is None
+    assert client.get_value("CCD_EXPOSURE", "CCD_EXPOSURE_VALUE") is None
+    assert client.get_property("CCD_EXPOSURE", "Other").values == {
+        "CCD_EXPOSURE_VALUE": 1.0
+    }
+
+
+def test_status_properties_are_broadcast(client):
+    client.newNumber(Vector("CCD_TEMPERATURE", CCD_TEMPERATURE_VALUE=-10.0))
+    client.newNumber(Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=1.0))
+    assert client.parent.device_status == {"CCD_TEMPERATURE_VALUE": -10.0}
+    assert client.parent.broadcasts == 1
+
+
+def test_callbacks_get_every_update(client):
+    seen = []
+    client.register_callback("CCD_EXPOSURE", seen.append)
+    update = Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=1.0)
+    client.newNumber(update)
+    assert seen == [update]
+
+
+def test_new_and_removed_properties(client):
+    vector = Vector("CONNECTION", CONNECT=PyIndi.ISS_ON, DISCONNECT=PyIndi.ISS_OFF)
+    prop = types.SimpleNamespace(
+        getType=lambda: PyIndi.INDI_SWITCH,
+        getDeviceName=lambda: DEVICE,
+        getName=lambda: "CONNECTION",
+        getSwitch=lambda: vector,
+    )
+    client.newProperty(prop)
+    entry = client.get_property("CONNECTION")
+    assert entry.kind == "switch" and entry.handle is vector
+    assert entry.values == {"CONNECT": PyIndi.ISS_ON, "DISCONNECT": PyIndi.ISS_OFF}
+
+    client.removeProperty(prop)
+    assert client.get_property("CONNECTION") is None
+
+
+def later(func, *args):
+    """Call a function from another thread (as the INDI client thread would)"""
+    timer = threading.Timer(0.05, func, args)
+    timer.start()
+    return timer
+
+
+def test_wait_for_property_wakes_on_the_update(client):
+    later(client.newNumber, Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=1.0))
+    entry = client.wait_for_property("CCD_EXPOSURE", timeout=5.0)
+    assert entry.values == {"CCD_EXPOSURE_VALUE": 1.0}
+    # Already cached: no wait
+    assert client.wait_for_property("CCD_EXPOSURE", timeout=0.0) is entry
+
+
+def test_wait_for_state_times_out(client):
+    client.newNumber(Vector("CCD_EXPOSURE", PyIndi.IPS_BUSY, CCD_EXPOSURE_VALUE=1.0))
+    with pytest.raises(TimeoutError):
+        client.wait_for_state(
+            "CCD_EXPOSURE", lambda p: p.state == PyIndi.IPS_OK, timeout=0.1
+        )
+
+
+def test_connect_device_waits_for_the_driver(client):
+    def connect(svp):
+        assert [switch.s for switch in svp] == [PyIndi.ISS_ON, PyIndi.ISS_OFF]
+        later(
+            client.newSwitch,
+            Vector("CONNECTION", CONNECT=PyIndi.ISS_ON, DISCONNECT=PyIndi.ISS_OFF),
+        )
+
+    client.sendNewSwitch = connect
+    client.newSwitch(
+        Vector("CONNECTION", CONNECT=PyIndi.ISS_OFF, DISCONNECT=PyIndi.ISS_ON)
+    )
+    client.connect_device(timeout=5.0)
+    assert client.get_value("CONNECTION", "CONNECT") == PyIndi.ISS_ON
+
+
+def test_async_wait_is_resolved_from_the_client_thread(client):
+    async def wait():
+        later(client.newNumber, Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=2.0))
+        return await client.async_wait_for_state(
+            "CCD_EXPOSURE", lambda p: p.values["CCD_EXPOSURE_VALUE"] > 1, timeout=5.0
+        )
+
+    assert asyncio.run(wait()).values == {"CCD_EXPOSURE_VALUE": 2.0}
+    assert client.async_waiters == []
+
+
+def test_async_wait_times_out(client):
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.async_wait_for_property("CCD_EXPOSURE", timeout=0.1))
+    assert client.async_waiters == []
+
+
+def recorded(client, *names):
+    """Record the calls made to some of the client's server requests"""
+    calls = []
+    for name in names:
+        setattr(client, name, lambda *args, name=name: calls.append((name, *args)))
+    return calls
+
+
+def test_only_the_device_and_used_properties_are_watched(client):
+    calls = recorded(client, "watchDevice", "watchProperty")
+    client.subscribe()
+    assert calls == [
+        ("watchDevice", DEVICE),
+        ("watchProperty", DEVICE, "CCD_EXPOSURE"),
+        ("watchProperty", DEVICE, "CCD_TEMPERATURE"),
+    ]
+
+
+def test_client_without_a_device_watches_everything():
+    anything = IndiClient(Parent(), {"status": []})
+    calls = recorded(anything, "watchDevice", "watchProperty", "setBLOBMode")
+    anything.subscribe()
+    anything.apply_blob_modes()
+    assert calls == []
+
+
+def test_blobs_are_refused_except_those_asked_for():
+    camera = IndiClient(
+        Parent(), {"status": []}, DEVICE, blob_modes={"CCD1": PyIndi.B_ALSO}
+    )
+    calls = recorded(camera, "setBLOBMode")
+    camera.newDevice(types.SimpleNamespace(getDeviceName=lambda: DEVICE))
+    assert calls == [
+        ("setBLOBMode", PyIndi.B_NEVER, DEVICE),
+        ("setBLOBMode", PyIndi.B_ALSO, DEVICE, "CCD1"),
+    ]
+
+
+def test_lost_server_fails_waits_and_clears_the_status(client):
+    client.reconnect = lambda: None
+    client.newNumber(Vector("CCD_TEMPERATURE", CCD_TEMPERATURE_VALUE=-10.0))
+    errors = []
+
+    def wait():
+        try:
+            client.wait_for_property("CCD_EXPOSURE", timeout=5.0)
+        except ConnectionError as err:
+            errors.append(err)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    later(client.serverDisconnected, -1).join()
+    waiter.join()
+
+    assert len(errors) == 1
+    assert client.get_property("CCD_TEMPERATURE") is None
+    assert client.parent.device_status == {}
+    assert client.parent.server_changes == [False]
+
+
+def test_requested_disconnection_is_not_a_lost_server(client):
+    client.newNumber(Vector("CCD_TEMPERATURE", CCD_TEMPERATURE_VALUE=-10.0))
+    client.serverDisconnected(0)
+    assert client.get_value("CCD_TEMPERATURE", "CCD_TEMPERATURE_VALUE") == -10.0
+    assert client.parent.server_changes == []
+
+
+def test_reconnect_backs_off_and_swaps_in_the_new_cache(monkeypatch):
+    config = {
+        "status": ["CCD_TEMPERATURE"],
+        "indi_timeout": 1.0,
+        "indi_reconnect_min": 1.0,
+        "indi_reconnect_max": 4.0,
+        "indi_resync_quiet": 0.05,
+    }
+    client = IndiClient(Parent(), config, DEVICE)
+    sleeps = []
+    monkeypatch.setattr(
+        client_module,
+        "time",
+        types.SimpleNamespace(
+            sleep=sleeps.append, monotonic=time.monotonic, time=time.time
+        ),
+    )
+    attempts = iter([False, False, False, False, True])
+    client.connectServer = lambda: next(attempts)
+    client.getDevice = lambda device: object()
+    client.isServerConnected = lambda: True
+    resync, client.reconnect = client.reconnect, lambda: None
+
+    client.newNumber(Vector("CCD_TEMPERATURE", CCD_TEMPERATURE_VALUE=-10.0))
+    client.newNumber(Vector("CCD_EXPOSURE", CCD_EXPOSURE_VALUE=1.0))
+    client.serverDisconnected(-1)
+    assert not client.is_ready()
+
+    # The server resends what it has while the cache is rebuilt
+    client.newNumber(Vector("CCD_TEMPERATURE", CCD_TEMPERATURE_VALUE=-20.0))
+    assert client.get_property("CCD_TEMPERATURE") is None
+    resync()
+
+    assert sleeps == [1.0, 2.0, 4.0, 4.0, 4.0]
+    assert client.is_ready()
+    assert client.get_value("CCD_TEMPERATURE", "CCD_TEMPERATURE_VALUE") == -20.0
+    assert client.get_property("CCD_EXPOSURE") is None
+    assert client.parent.device_status == {"CCD_TEMPERATURE_VALUE": -20.0}
+    assert client.parent.server_changes == [False, True]
@@ -0,0 +1,119 @@
+"""IndiFilterWheel moves, which end on FILTER_SLOT updates from the INDI
+server"""
+
+import types
+import warnings
+
+import pytest
+
+PyIndi = pytest.importorskip("PyIndi")
+
+from IndiAgents.IndiClient import IndiClient  # noqa: E402
+from IndiAgents.IndiFilterWheel import IndiFilterWheel  # noqa: E402
+
+
+class Slot(list):
+    """The FILTER_SLOT number vector property"""
+
+    def __init__(self, slot, state=None):
+        super().__init__(
+            [types.SimpleNamespace(name="FILTER_SLOT_VALUE", value=slot, min=1, max=5)]
+        )
+        self.s = PyIndi.IPS_OK if state is None else state
+
+
+@pytest.fixture
+def wheel(conn, monkeypatch):
+    # No INDI server: the device is known at once
+    monkeypatch.setattr(IndiClient, "connectServer", lambda self: True)
+    monkeypatch.setattr(IndiClient, "wait_for_device", lambda self: None)
+    config = {
+        "fw_name": "Filter Simulator",
+        "fw_host": "localhost",
+        "fw_port": 7624,
+        "status": ["FILTER_SLOT"],
+        "dto_command_topic": "fw.dto",
+    }
+    wheel = IndiFilterWheel(None, conn, config)
+    wheel.device_filterwheel = types.SimpleNamespace(
+        isConnected=lambda: True, getSwitch=lambda name: [types.SimpleNamespace()] * 2
+    )
+    wheel.slot_property = Slot(1)
+    wheel.filter_names = {1: "V", 2: "R"}
+    wheel.filter_slots = {"V": 1, "R": 2}
+    wheel.sent = []
+    wheel.indiclient.sendNewNumber = wheel.sent.append
+    wheel.indiclient.sendNewSwitch = wheel.sent.append
+    return wheel
+
+
+def command(wheel, message, correlation_id="a"):
+    wheel.start_command(correlation_id)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        wheel.handle_message(message)
+    wheel.finish_command()
+
+
+def test_move_replies_go_when_the_wheel_arrives(wheel, conn):
+    command(wheel, "move(R)")
+    assert conn.sent == [("WAIT", "a")]
+    assert wheel.sent == [wheel.slot_property] and wheel.slot_property[0].value == 2
+    assert not wheel.move_complete.is_set()
+
+    # Another command is under way when the move ends
+    wheel.start_command("b")
+    wheel.filter_slot_updated(Slot(1, PyIndi.IPS_BUSY))
+    wheel.filter_slot_updated(Slot(1))  # stale
+    assert conn.sent == [("WAIT", "a")]
+    wheel.filter_slot_updated(Slot(2))
+    assert conn.sent == [("WAIT", "a"), ("GO", "a")]
+    assert wheel.move_complete.is_set() and wheel.move_error is None
+
+
+def test_failed_move_replies_error(wheel, conn):
+    command(wheel, "move(2)")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        wheel.filter_slot_updated(Slot(1, PyIndi.IPS_ALERT))
+    assert conn.sent == [("WAIT", "a"), ("ERROR: " + wheel.move_error, "a")]
+    assert wheel.move_complete.is_set()
+
+
+@pytest.mark.parametrize(
+    "position, error", [("B", "Unknown filter B"), ("6", "Filter slot 6 is out")]
+)
+def test_impossible_move_replies_error_only(wheel, conn, position, error):
+    command(wheel, f"move({position})")
+    ((reply, cid),) = conn.sent
+    assert reply.startswith("ERROR: " + error) and cid == "a"
+    assert wheel.sent == [] and wheel.move_complete.is_set()
+
+
+def test_peer_moves_send_no_replies(wheel, conn):
+    assert wheel.start_move("R") is None
+    wheel.filter_slot_updated(Slot(2))
+    assert wheel.start_move(7) == wheel.move_error == "Filter slot 7 is out of range"
+    assert conn.sent == [] and wheel.move_complete.is_set()
+
+
+def test_disconnect_fails_a_pending_move(wheel, conn):
+    command(wheel, "move(R)")
+    command(wheel, "disconnect", "b")
+    assert conn.sent == [("WAIT", "a"), ("ERROR: disconnected", "a"), ("GO", "b")]
+    assert wheel.move_complete.is_set() and wheel.move_error is not None
+
+
+def test_disconnect_without_the_device(wheel, conn):
+    wheel.device_filterwheel = None
+    command(wheel, "disconnect")
+    assert conn.sent == [("GO", "a")]
+
+
+def test_lost_server_fails_a_pending_move(wheel, conn):
+    command(wheel, "move(R)")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        wheel.indi_server_changed(False)
+    assert conn.sent[-1] == ("ERROR: INDI server lost moving to slot 2", "a")
+    assert wheel.move_complete.is_set()
@@ -0,0 +1,183 @@
+"""The replies the mount agent sends the DTO for commands that cannot be
+carried out"""
+
+import os
+import types
+
+import pytest
+
+import PlanewaveMountAgent as agent_module
+import PlanewaveMountTalk as talk_module
+from AbstractAgents.SubAgent import SubAgent
+from PlanewaveMountAgent import PlanewaveMountAgent
+from PlanewaveMountTalk import PlanewaveMountTalk
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+class FakePWI4:
+    """Answers status requests and records the mount commands sent"""
+
+    def __init__(self):
+        self.sent = []
+
+    def status(self):
+        return types.SimpleNamespace(mount=types.SimpleNamespace(is_slewing=False))
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.sent.append(name)
+            return self.status()
+
+        return command
+
+
+class FakeTalk(PlanewaveMountTalk):
+    def make_client(self, host, port):
+        return FakePWI4()
+
+
+class Mount(PlanewaveMountAgent):
+    def __init__(self, conn, config):
+        SubAgent.__init__(
+            self, None, conn, {"dto_command_topic": "mount.dto", **config}
+        )
+        self.planewave_mount_talk = FakeTalk(self, "localhost", 8220)
+        self.slews = 0
+
+    def track_slew(self):
+        self.slews += 1
+        return {
+            "completed": True,
+            "settle_time": 1.0,
+            "settle_time_uncertainty": 0.1,
+            "polls": 3,
+        }
+
+    def broadcast_mount_status(self, extra=None):
+        pass
+
+
+def run(mount, message):
+    mount.start_command("a")
+    mount.handle_message(message)
+    mount.finish_command()
+    return mount.conn.sent
+
+
+@pytest.fixture
+def mount(conn, tmp_path):
+    return Mount(conn, {"site_latitude": 35.0969, "site_longitude": -111.535})
+
+
+def test_unreadable_ephemeris_replies_error(mount, tmp_path):
+    ((reply, cid),) = run(mount, f"trackEphemeris({tmp_path / 'none.txt'})")
+    assert reply.startswith("ERROR: Cannot track ephemeris") and cid == "a"
+    assert mount.slews == 0 and mount.planewave_mount_talk.pwi4.sent == []
+
+
+@pytest.mark.parametrize("name, elements_file", [("Ceres", False), ("Pallas", True)])
+def test_untrackable_orbit_replies_error(mount, tmp_path, name, elements_file):
+    # No elements file at all, or no elements for the object
+    if elements_file:
+        elements = tmp_path / "elements.yaml"
+        elements.write_text(
+            "Ceres: {a: 2.77, e: 0.0785, i: 10.59, node: 80.3, peri: 73.6, "
+            "M: 291.4, epoch: 2460600.5}\n"
+        )
+        mount.config["orbit_elements_file"] = str(elements)
+    ((reply, cid),) = run(mount, f"trackOrbit({name})")
+    assert reply.startswith("ERROR: Cannot track orbit") and cid == "a"
+    assert mount.slews == 0 and mount.planewave_mount_talk.pwi4.sent == []
+
+
+@pytest.fixture
+def satellites(mount, monkeypatch):
+    # LEO TEST rises at JD 2461333.4017 and sets at 2461333.4045
+    mount.config["tle_file"] = os.path.join(DATA, "reference.tle")
+
+    def at(jd):
+        monkeypatch.setattr(talk_module, "julian_date_now", lambda: jd)
+
+    return at
+
+
+@pytest.mark.parametrize(
+    "message, jd, hours, reason",
+    [
+        ("trackTle(LEO TEST)", 2461333.38, 3.0, "LEO TEST is down; next pass"),
+        ("trackTle(LEO TEST)", 2461333.5, 1.0, "LEO TEST: no pass in the next 1 hours"),
+        ("trackTle(NOAA 19)", 2461333.403, 1.0, "Cannot track satellite"),
+    ],
+)
+def test_untrackable_satellite_replies_error(
+    mount, satellites, message, jd, hours, reason
+):
+    mount.config["tle_search_hours"] = hours
+    satellites(jd)
+    ((reply, cid),) = run(mount, message)
+    assert reply.startswith(f"ERROR: {reason}") and cid == "a"
+    assert mount.slews == 0 and mount.planewave_mount_talk.pwi4.sent == []
+
+
+def test_satellite_up_is_followed(mount, satellites):
+    satellites(2461333.403)
+    assert run(mount, "trackTle(LEO TEST)") == [("WAIT", "a"), ("GO", "a")]
+    assert mount.slews == 1
+    assert mount.planewave_mount_talk.pwi4.sent == ["mount_follow_tle"]
+
+
+class FakeSearch:
+    """SpiralAcquisition stand-in finding the target, or not"""
+
+    found = True
+
+    def __init__(self, agent):
+        pass
+
+    def run(self, max_steps):
+        return {
+            "found": self.found,
+            "steps": max_steps if not self.found else 3,
+            "snr": 50.0,
+            "offset_arcsec": (1.0, 2.0) if self.found else None,
+            "elapsed": 10.0,
+        }
+
+
+def test_acquisition_without_camera_replies_error(mount):
+    assert run(mount, "acquireTarget(9)") == [
+        ("WAIT", "a"),
+        (
+            "ERROR: Acquisition failed: Acquisition needs acquire_camera_agent "
+            "(None) in the same CompositeAgent",
+            "a",
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "found, reply", [(True, "GO"), (False, "ERROR: target not found in 9 steps")]
+)
+def test_acquisition_replies(mount, monkeypatch, found, reply):
+    monkeypatch.setattr(agent_module, "SpiralAcquisition", FakeSearch)
+    monkeypatch.setattr(FakeSearch, "found", found)
+    assert run(mount, "acquireTarget(9)") == [("WAIT", "a"), (reply, "a")]
+
+
+def test_pointing_model_without_camera_replies_error(mount):
+    wait, (reply, cid) = run(mount, "buildPointingModel(10)")
+    assert wait == ("WAIT", "a")
+    assert reply.startswith("ERROR: Cannot run a pointing model") and cid == "a"
+
+
+def test_slew_model_without_slews_replies_error(mount, tmp_path):
+    mount.config["slew_log_file"] = str(tmp_path / "slews.txt")
+    mount.config["slew_model_file"] = str(tmp_path / "model.yaml")
+    ((reply, cid),) = run(mount, "fitSlewModel")
+    assert reply.startswith("ERROR: Cannot fit slew model") and cid == "a"
+
+
+def test_passes_without_tle_file_replies_error(mount):
+    ((reply, cid),) = run(mount, "listPasses")
+    assert reply.startswith("ERROR: Cannot predict passes") and cid == "a"
@@ -0,0 +1,74 @@
+"""Kepler's equation and the RA/Dec of objects on known orbits"""
+
+import datetime
+import warnings
+
+import numpy as np
+import pytest
+
+from Astronomy.OrbitPropagator import OrbitalElements, propagate, solve_kepler
+
+
+def julian_date(*when):
+    delta = datetime.datetime(*when) - datetime.datetime(2000, 1, 1, 12)
+    return 2451545.0 + delta.total_seconds() / 86400.0
+
+
+@pytest.mark.parametrize("e", [0.0, 0.3, 0.9, 0.99, 0.999999, 0.999999999])
+def test_solve_kepler(e):
+    mean_anomaly = np.linspace(-10.0, 10.0, 401)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        ecc_anom = solve_kepler(mean_anomaly, e)
+    residual = ecc_anom - e * np.sin(ecc_anom) - mean_anomaly
+    # Kepler's equation holds modulo a whole revolution
+    residual = np.remainder(residual + np.pi, 2.0 * np.pi) - np.pi
+    assert np.abs(residual).max() < 1e-12
+    # and the solution is odd in M on the reduced range
+    assert solve_kepler(-mean_anomaly, e) == pytest.approx(-ecc_anom, abs=1e-12)
+
+
+def test_solve_kepler_near_perihelion():
+    # (1 - e) E + e E^3 / 6 = M to first order
+    assert solve_kepler(np.array(1e-12), 0.999999) == pytest.approx(
+        1e-6 * (1.0 - 1e-6 / 6.0), rel=1e-9
+    )
+
+
+@pytest.mark.parametrize(
+    "when, ra, dec",
+    [
+        ((2000, 3, 20, 7, 35), 0.0, 0.0),
+        ((2000, 6, 21, 1, 48), 6.0, 23.4393),
+        ((2000, 9, 22, 17, 27), 12.0, 0.0),
+        ((2000, 12, 21, 13, 37), 18.0, -23.4393),
+    ],
+)
+def test_sun_at_equinoxes_and_solstices(when, ra, dec):
+    # An object at the Sun, seen from the geocenter
+    sun = OrbitalElements(["Sun"], [1e-9], [0.0], [0.0], [0.0], [0.0], [2451545.0])
+    ra_hours, dec_degs, dist = propagate(sun, julian_date(*when))
+    assert (ra_hours[0, 0] - ra + 12.0) % 24.0 - 12.0 == pytest.approx(0.0, abs=0.002)
+    assert dec_degs[0, 0] == pytest.approx(dec, abs=0.01)
+    assert 0.983 < dist[0, 0] < 1.017
+
+
+def test_distant_objects_keep_their_direction():
+    # Perihelia 1e6 AU away, toward ecliptic longitudes 0 and 90 deg
+    far = OrbitalElements(
+        ["a", "b"],
+        [1e6, 1e6],
+        [1.5, 1.5],
+        [0.0, 0.0],
+        [0.0, 90.0],
+        [0.0, 0.0],
+        [2451545.0, 2451545.0],
+    )
+    ra_hours, dec_degs, dist = propagate(
+        far, [2451545.0, 2451600.0], latitude=35.0969, longitude=-111.5350
+    )
+    assert (ra_hours[0] + 12.0) % 24.0 - 12.0 == pytest.approx(0.0, abs=1e-4)
+    assert dec_degs[0] == pytest.approx(0.0, abs=1e-3)
+    assert ra_hours[1] == pytest.approx(6.0, abs=1e-4)
+    assert dec_degs[1] == pytest.approx(23.4393, abs=1e-3)
+    assert dist == pytest.approx(1e6, rel=1e-5)
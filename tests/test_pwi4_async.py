@@ -0,0 +1,115 @@
+"""The hand-written HTTP/1.1 client of AsyncPWI4"""
+
+import asyncio
+
+import pytest
+
+from pwi4_async import AsyncPWI4, AsyncPWI4HttpCommunicator
+
+
+class Writer:
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def exchange(response, postdata=None):
+    """Send one request through ``send``, answered with a canned response"""
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(response)
+        reader.feed_eof()
+        writer = Writer()
+        comm = AsyncPWI4HttpCommunicator("pwi4", 8220)
+        result = await comm.send((reader, writer), "/status?", postdata)
+        return writer.data, result
+
+    return asyncio.run(run())
+
+
+def test_get_request_and_content_length_response():
+    request, result = exchange(
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello extra"
+    )
+    assert request == b"GET /status? HTTP/1.1\r\nHost: pwi4:8220\r\n\r\n"
+    assert result == (200, "OK", b"hello", False)
+
+
+def test_post_request_body():
+    request, _ = exchange(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", b"a=1")
+    assert request.endswith(b"Content-Length: 3\r\n\r\na=1")
+    assert b"POST /status? HTTP/1.1\r\n" in request
+
+
+def test_chunked_response():
+    _, result = exchange(
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"4;ext=1\r\nmoun\r\n7\r\nt.x=1\r\n\r\n0\r\n\r\n"
+    )
+    assert result == (200, "OK", b"mount.x=1\r\n", False)
+
+
+@pytest.mark.parametrize(
+    "response, will_close",
+    [
+        (b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 2\r\n\r\nok", True),
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 2\r\n\r\nok", True),
+        (
+            b"HTTP/1.0 200 OK\r\nConnection: Keep-Alive\r\nContent-Length: 2\r\n\r\nok",
+            False,
+        ),
+        # No length: the body runs to the end of the connection
+        (b"HTTP/1.1 200 OK\r\n\r\nok", True),
+    ],
+)
+def test_connection_reuse_follows_the_response(response, will_close):
+    _, result = exchange(response)
+    assert result == (200, "OK", b"ok", will_close)
+
+
+def test_status_line_without_reason():
+    _, result = exchange(b"HTTP/1.1 404\r\nContent-Length: 0\r\n\r\n")
+    assert result == (404, "", b"", False)
+
+
+def test_closed_connection_raises():
+    with pytest.raises(ConnectionResetError):
+        exchange(b"")
+
+
+def test_requests_over_a_keep_alive_server():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while line := await reader.readline():
+            path = line.split()[1]
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(path), path)
+            )
+            await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        pwi4 = AsyncPWI4("127.0.0.1", server.sockets[0].getsockname()[1])
+        replies = [await pwi4.request("/mount/stop") for _ in range(3)]
+        await pwi4.close()
+        server.close()
+        await server.wait_closed()
+        return replies
+
+    assert asyncio.run(run()) == [b"/mount/stop?"] * 3
+    assert len(connections) == 1
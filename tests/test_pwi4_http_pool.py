@@ -0,0 +1,83 @@
+"""The keep-alive connection pool of PWI4HttpCommunicator"""
+
+import http.server
+import threading
+import time
+
+import pytest
+
+from pwi4_client import PWI4HttpCommunicator
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        status = 404 if self.path.startswith("/nosuch") else 200
+        body = self.path.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Drop the connection without saying so, as an idle PWI4 may
+        self.close_connection = self.server.drop_connections
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.connections = 0
+    server.drop_connections = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def communicator(server, **kwargs):
+    return PWI4HttpCommunicator("127.0.0.1", server.server_address[1], **kwargs)
+
+
+def test_requests_share_one_connection(server):
+    comm = communicator(server)
+    for k in range(5):
+        assert comm.request("/status", n=k) == b"/status?n=%d" % k
+    comm.close()
+    assert server.connections == 1
+
+
+def test_stale_connection_is_retried_on_a_new_one(server):
+    server.drop_connections = True
+    comm = communicator(server)
+    assert comm.request("/status") == b"/status?"
+    time.sleep(0.1)  # the server has closed the pooled connection by now
+    assert comm.request("/mount/stop") == b"/mount/stop?"
+    comm.close()
+    assert server.connections == 2
+
+
+def test_idle_connections_are_not_reused(server):
+    comm = communicator(server, idle_timeout=0.0)
+    comm.request("/status")
+    comm.request("/status")
+    assert server.connections == 2
+    assert len(comm.idle_connections) == 1
+    comm.close()
+
+
+def test_http_error_raises_with_the_response_body(server):
+    comm = communicator(server)
+    with pytest.raises(Exception, match="Command not found: /nosuch"):
+        comm.request("/nosuch")
+    # The connection is still good after an error response
+    comm.request("/status")
+    comm.close()
+    assert server.connections == 1
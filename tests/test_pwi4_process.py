@@ -0,0 +1,71 @@
+"""Starting PWI4 and probing its status until it is ready"""
+
+import sys
+
+import pytest
+
+import PWI4Process as process_module
+from PWI4Process import PWI4Process
+
+
+class Status:
+    """A status request that fails until the given call"""
+
+    def __init__(self, ready_on):
+        self.ready_on = ready_on
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls < self.ready_on:
+            raise ConnectionRefusedError("PWI4 not listening yet")
+        return "status"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(process_module.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def python(tmp_path, code):
+    return PWI4Process([sys.executable, "-c", code], str(tmp_path), display=None)
+
+
+def test_probe_returns_none_when_pwi4_does_not_answer():
+    assert PWI4Process.probe(Status(2)) is None
+    assert PWI4Process.probe(Status(1)) == "status"
+
+
+def test_probe_interval_doubles_up_to_the_maximum(sleeps):
+    get_status = Status(7)
+    status = PWI4Process().wait_until_ready(
+        get_status, min_interval=0.1, max_interval=0.5
+    )
+    assert status == "status" and get_status.calls == 7
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5, 0.5])
+
+
+def test_wait_gives_up_after_the_timeout():
+    with pytest.raises(TimeoutError):
+        PWI4Process().wait_until_ready(Status(10**6), timeout=0.2, min_interval=0.05)
+
+
+def test_wait_stops_when_the_launched_pwi4_exits(tmp_path):
+    pwi4 = python(tmp_path, "raise SystemExit(3)")
+    pwi4.start()
+    pwi4.process.wait()
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        pwi4.wait_until_ready(Status(10**6), timeout=10.0)
+    assert not pwi4.running()
+
+
+def test_stop_ends_only_the_pwi4_we_launched(tmp_path):
+    PWI4Process().stop()  # not launched: nothing to do
+
+    pwi4 = python(tmp_path, "import time; time.sleep(60)")
+    pwi4.start()
+    assert pwi4.running() and pwi4.pid is not None
+    pwi4.stop()
+    assert not pwi4.running()
@@ -0,0 +1,82 @@
+"""PWI4Status, which finds and converts each status field when first read"""
+
+import functools
+
+import pytest
+
+from pwi4_client import STATUS_FIELDS, PWI4Status
+from status_benchmark import eager_parse, synthetic_response
+
+RESPONSE = b"\r\n".join(
+    [
+        b"pwi4.version=4.0.11 beta 10",
+        b"pwi4.version_field[0]=4",
+        b"pwi4.version_field[1]=0",
+        b"pwi4.version_field[2]=11",
+        b"pwi4.version_field[3]=10",
+        b"mount.is_connected=true",
+        b"mount.geometry=0",
+        b"mount.azimuth_degs=180.25",
+        b"mount.altitude_degs=not a number",
+        b"mount.is_slewing=False",
+        b"mount.axis0.position_timestamp=2026-10-19 07:30:00",
+        b"focuser.is_enabled=true",
+        b"m3.port=2",
+    ]
+)
+
+
+def read(status, path):
+    return functools.reduce(getattr, path.split("."), status)
+
+
+def test_fields_are_converted():
+    status = PWI4Status(RESPONSE)
+    assert status.pwi4.version == "4.0.11 beta 10"
+    assert status.pwi4.version_field == [4, 0, 11, 10]
+    assert status.mount.is_connected is True
+    assert status.mount.is_slewing is False
+    assert status.mount.geometry == 0
+    assert status.mount.azimuth_degs == 180.25
+    assert status.m3.port == 2
+
+
+def test_renamed_keywords():
+    status = PWI4Status(RESPONSE.decode())
+    assert status.mount.axis0.position_timestamp_str == "2026-10-19 07:30:00"
+    assert status.focuser.is_connected is True
+
+
+def test_missing_fields_and_sections():
+    status = PWI4Status(b"mount.is_connected=false\n")
+    assert status.pwi4.version == "<unknown>"
+    assert status.pwi4.version_field == [0, 0, 0, 0]
+    assert status.mount.azimuth_degs is None
+    # Offsets are not reported by older versions of PWI4
+    assert status.mount.offsets is None
+
+
+def test_fields_not_read_are_not_converted():
+    status = PWI4Status(RESPONSE)
+    assert status.mount.azimuth_degs == 180.25
+    with pytest.raises(ValueError):
+        status.mount.altitude_degs
+
+
+def test_raw_and_get_helpers():
+    status = PWI4Status(RESPONSE)
+    assert status.raw["mount.azimuth_degs"] == "180.25"
+    assert status.get_float("mount.azimuth_degs") == 180.25
+    assert status.get_int("m3.port") == 2
+    assert status.get_bool("mount.is_tracking", False) is False
+    assert status.get_string("pwi4.version") == "4.0.11 beta 10"
+
+
+def test_every_field_matches_the_eager_parser():
+    payload = synthetic_response()
+    expected = eager_parse(payload)
+    status = PWI4Status(payload)
+    # Twice, so that the second pass starts from the remembered positions
+    for _ in range(2):
+        assert {path: read(status, path) for path, _ in STATUS_FIELDS} == expected
+        status = PWI4Status(payload)
@@ -0,0 +1,46 @@
+"""Satellite positions and passes, against tables from the sgp4 package"""
+
+import os
+
+import numpy as np
+import pytest
+
+from Astronomy.SatellitePasses import (
+    TwoLineElements,
+    find_passes,
+    satellite_position,
+)
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SITE = (35.0969, -111.5350, 2163.0)
+SECOND = 1.0 / 86400.0
+
+
+@pytest.fixture(scope="module")
+def tles():
+    return TwoLineElements.load(os.path.join(DATA, "reference.tle"))
+
+
+def test_positions_within_25_km_for_three_days(tles):
+    table = np.loadtxt(os.path.join(DATA, "sgp4_positions.txt"))
+    for index, name in enumerate(tles.names):
+        rows = table[table[:, 0] == index]
+        position = satellite_position(tles.select([name]), rows[:, 1])[:, 0, :]
+        error = np.sqrt(np.sum((position.T - rows[:, 2:]) ** 2, axis=1))
+        assert error.max() < 25.0, name
+
+
+def test_passes_match_sgp4(tles):
+    table = np.loadtxt(os.path.join(DATA, "sgp4_passes.txt"))
+    for index, name in enumerate(tles.names):
+        expected = table[table[:, 0] == index]
+        start = np.ceil(tles.epoch[index] * 24.0) / 24.0
+        found = find_passes(tles.select([name]), start, start + 1.0, *SITE)
+        assert len(found) == len(expected), name
+        for sat_pass, (_, rise, peak, end, max_alt) in zip(found, expected):
+            assert sat_pass["rise_jd"] == pytest.approx(rise, abs=10 * SECOND)
+            assert sat_pass["culmination_jd"] == pytest.approx(peak, abs=10 * SECOND)
+            assert sat_pass["set_jd"] == pytest.approx(end, abs=10 * SECOND)
+            # The altitude peaks too sharply near the zenith for the grid
+            if max_alt < 60.0:
+                assert sat_pass["max_altitude"] == pytest.approx(max_alt, abs=1.0)
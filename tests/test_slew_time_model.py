@@ -0,0 +1,72 @@
+"""The slew-time model, its fit and the target ordering"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from SlewTimeModel import (
+    SlewTimeModel,
+    axis_time,
+    fit_axis,
+    order_targets,
+    sequence_time,
+)
+
+MODEL = SlewTimeModel(((1.5, 4.0), (1.0, 3.0)), 2.0)
+
+
+def test_axis_time_profile():
+    # 4 deg/s is reached after 16/1.5 deg; the two profiles meet there
+    corner = 4.0**2 / 1.5
+    assert axis_time(corner, 1.5, 4.0) == pytest.approx(2.0 * 4.0 / 1.5)
+    assert axis_time(6.0, 1.5, 4.0) == pytest.approx(4.0)
+    assert axis_time(-100.0, 1.5, 4.0) == pytest.approx(100.0 / 4.0 + 4.0 / 1.5)
+
+
+def test_slew_time_takes_azimuth_the_short_way():
+    assert MODEL.slew_time(45.0, 350.0, 45.0, 10.0) == pytest.approx(
+        axis_time(20.0, 1.5, 4.0) + 2.0
+    )
+    assert MODEL.slew_time(45.0, 10.0, 45.0, 10.0) == 0.0
+
+
+def test_fit_axis_recovers_the_profile():
+    distance = np.array([0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 40.0, 90.0, 150.0])
+    accel, max_rate = fit_axis(distance, axis_time(distance, 1.5, 4.0))
+    assert accel == pytest.approx(1.5, rel=0.03)
+    assert max_rate == pytest.approx(4.0, rel=0.03)
+
+
+def test_fit_recovers_the_settle_time():
+    rng = np.random.default_rng(0)
+    travel = rng.uniform(1.0, 120.0, (20, 2))
+    arrival = np.column_stack(
+        (axis_time(travel[:, 0], 1.5, 4.0), axis_time(travel[:, 1], 1.0, 3.0))
+    )
+    records = np.column_stack((travel, arrival, arrival.max(axis=1) + 2.0))
+    model = SlewTimeModel.fit(records)
+    assert model.settle == pytest.approx(2.0)
+    assert model.axes[0] == pytest.approx((1.5, 4.0), rel=0.03)
+    assert model.axes[1] == pytest.approx((1.0, 3.0), rel=0.03)
+
+
+def test_order_targets_along_the_horizon():
+    azs = np.array([50.0, 10.0, 40.0, 20.0, 30.0])
+    order = order_targets(MODEL, np.full(5, 45.0), azs, start=(45.0, 0.0))
+    assert list(azs[order]) == [10.0, 20.0, 30.0, 40.0, 50.0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_order_targets_near_optimal(seed):
+    rng = np.random.default_rng(seed)
+    alts, azs = rng.uniform(20.0, 85.0, 8), rng.uniform(0.0, 360.0, 8)
+    start = (45.0, 180.0)
+    order = order_targets(MODEL, alts, azs, start)
+    assert sorted(order) == list(range(8))
+    # Every route, by brute force: node 0 is the start
+    cost = MODEL.cost_matrix(np.r_[start[0], alts], np.r_[start[1], azs])
+    routes = np.array(list(itertools.permutations(range(1, 9))))
+    routes = np.column_stack((np.zeros(len(routes), dtype=int), routes))
+    best = cost[routes[:, :-1], routes[:, 1:]].sum(axis=1).min()
+    assert sequence_time(MODEL, alts[order], azs[order], start) <= 1.15 * best
@@ -0,0 +1,100 @@
+"""SlewTracker: adaptive poll interval, settle time and progress reports"""
+
+import threading
+import time
+import types
+
+import pytest
+
+from SlewTracker import SlewTracker
+
+
+class SlewingMount:
+    """A mount closing on its target at a constant speed (arcsec/s), both
+    axes together"""
+
+    def __init__(self, distance, speed):
+        self.start = time.time()
+        self.distance = distance
+        self.speed = speed
+        self.polls = []
+
+    def arrival(self):
+        return self.start + self.distance / self.speed
+
+    def get_status(self, max_age):
+        now = time.time()
+        self.polls.append(now)
+        left = max(self.distance - self.speed * (now - self.start), 0.0)
+        return types.SimpleNamespace(
+            mount=types.SimpleNamespace(
+                is_slewing=left > 0,
+                julian_date=now / 86400.0,
+                axis0=self.axis(0.6, left),
+                axis1=self.axis(0.8, left),
+            )
+        )
+
+    def axis(self, share, left):
+        return types.SimpleNamespace(
+            dist_to_target_arcsec=share * left,
+            position_degs=share * (self.distance - left) / 3600.0,
+        )
+
+
+@pytest.mark.parametrize(
+    "distance, speed, interval",
+    [
+        (1000.0, None, 0.05),
+        (1000.0, 0.0, 1.0),
+        (1000.0, 100.0, 1.0),
+        (40.0, 100.0, 0.1),
+        (1.0, 100.0, 0.05),
+    ],
+)
+def test_next_interval_is_a_quarter_of_the_time_to_arrival(distance, speed, interval):
+    tracker = SlewTracker(None, min_interval=0.05, max_interval=1.0)
+    assert tracker.next_interval(distance, speed) == pytest.approx(interval)
+
+
+def test_settle_time_is_bracketed_by_the_last_polls():
+    mount = SlewingMount(3600.0, 6000.0)  # 0.6 s
+    tracker = SlewTracker(mount.get_status, min_interval=0.01, max_interval=0.5)
+    result = tracker.track()
+
+    assert result["completed"]
+    settle = mount.arrival() - mount.polls[0]
+    assert result["settle_time"] == pytest.approx(
+        settle, abs=result["settle_time_uncertainty"] + 0.01
+    )
+    # Polls slow down in the middle of the slew and speed up near the end
+    assert result["polls"] == len(mount.polls) < 0.6 / 0.01 / 2
+    assert result["settle_time_uncertainty"] < 0.05
+    assert result["axis_travel_degs"] == pytest.approx([0.6, 0.8], rel=1e-3)
+
+
+def test_progress_is_throttled():
+    mount = SlewingMount(3600.0, 6000.0)
+    tracker = SlewTracker(
+        mount.get_status, min_interval=0.01, max_interval=0.05, progress_interval=0.2
+    )
+    reports = []
+    tracker.track(lambda status, progress: reports.append(progress))
+
+    assert 2 <= len(reports) <= 4
+    assert all(0.0 <= report["slew_progress"] <= 1.0 for report in reports)
+    assert reports[-1]["slew_speed_arcsec_per_sec"] == pytest.approx(6000.0, rel=0.2)
+
+
+@pytest.mark.parametrize("stop", ["timeout", "abort"])
+def test_unfinished_slew_is_not_completed(stop):
+    mount = SlewingMount(3600.0, 10.0)
+    tracker = SlewTracker(
+        mount.get_status, min_interval=0.01, max_interval=0.05, timeout=0.1
+    )
+    if stop == "abort":
+        tracker.timeout = 600.0
+        threading.Timer(0.1, tracker.abort.set).start()
+    result = tracker.track()
+
+    assert not result["completed"] and result["settle_time"] is None
@@ -0,0 +1,52 @@
+"""The reply to a slew made together with the dome"""
+
+import pytest
+
+from AbstractAgents.SubAgent import SubAgent
+from PlanewaveMountAgent import PlanewaveMountAgent
+
+
+class FakeTalk:
+    def command(self, name, *args, **kwargs):
+        return None
+
+
+class FakeDome:
+    def __init__(self, arrival):
+        self.arrival = arrival
+
+    def start_slew(self, alt, az, ra=None, dec=None):
+        return az
+
+    def wait_for_slew(self):
+        return self.arrival
+
+
+class Mount(PlanewaveMountAgent):
+    def __init__(self, conn, completed, dome):
+        SubAgent.__init__(self, None, conn, {"dto_command_topic": "mount.dto"})
+        self.planewave_mount_talk = FakeTalk()
+        self.completed = completed
+        self.peers = {"dome": dome} if dome is not None else {}
+
+    def track_slew(self):
+        return {"completed": self.completed, "settle_time": 1.0}
+
+    def broadcast_mount_status(self, extra=None):
+        pass
+
+
+@pytest.mark.parametrize(
+    "completed, dome, reply",
+    [
+        (True, FakeDome(5.0), "GO"),
+        (True, None, "GO"),
+        (False, FakeDome(5.0), "ERROR: slew did not complete"),
+        (True, FakeDome(None), "ERROR: dome did not reach its azimuth"),
+    ],
+)
+def test_slew_with_dome_reply(conn, completed, dome, reply):
+    mount = Mount(conn, completed, dome)
+    mount.start_command("a")
+    mount.slew_with_dome("mount_goto_alt_az", (45.0, 90.0), 45.0, 90.0)
+    assert mount.conn.sent == [("WAIT", "a"), (reply, "a")]
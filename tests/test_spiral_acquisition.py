@@ -0,0 +1,128 @@
+"""Spiral target acquisition, against a simulated PWI4 and camera"""
+
+import types
+
+import numpy as np
+
+from PlanewaveMountTalk import PlanewaveMountTalk
+from SpiralAcquisition import SpiralAcquisition
+
+PLATE_SCALE = 1.0  # arcsec / pixel
+ROI = [100, 200, 64, 64]
+
+
+class FakePWI4:
+    """The offsets PWI4 applies to the pointing: a square spiral of steps
+    (mount_spiral_offset_*) plus any mount_offset (east, north arcsec)"""
+
+    def __init__(self):
+        self.step = (0.0, 0.0)
+        self.index = 0
+        self.offset = np.zeros(2)
+
+    @staticmethod
+    def spiral(index):
+        # 0, (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), ...
+        x = y = 0
+        dx, dy, leg, n = 1, 0, 1, 0
+        while n < index:
+            for _ in range(leg):
+                if n == index:
+                    break
+                x, y, n = x + dx, y + dy, n + 1
+            dx, dy = -dy, dx
+            if dy == 0:
+                leg += 1
+        return x, y
+
+    def pointing(self):
+        x, y = self.spiral(self.index)
+        return self.offset + (x * self.step[0], y * self.step[1])
+
+    def status(self):
+        return types.SimpleNamespace(pointing=self.pointing())
+
+    def mount_spiral_offset_new(self, x_step_arcsec, y_step_arcsec):
+        self.step, self.index = (x_step_arcsec, y_step_arcsec), 0
+        return self.status()
+
+    def mount_spiral_offset_next(self):
+        self.index += 1
+        return self.status()
+
+    def mount_spiral_offset_previous(self):
+        self.index -= 1
+        return self.status()
+
+    def mount_offset(self, ra_add_arcsec=0.0, dec_add_arcsec=0.0):
+        self.offset += (ra_add_arcsec, dec_add_arcsec)
+        return self.status()
+
+
+class FakeTalk(PlanewaveMountTalk):
+    """PlanewaveMountTalk with the fake PWI4 in place of the HTTP client"""
+
+    def make_client(self, host, port):
+        return FakePWI4()
+
+
+class FakeCamera:
+    """Frames of the region of interest with one star, at target (east,
+    north arcsec) from where the mount points when the search starts"""
+
+    def __init__(self, pwi4, target):
+        self.pwi4 = pwi4
+        self.target = np.asarray(target)
+        self.rng = np.random.default_rng(1)
+
+    def acquire_frame(self, exptime, roi=None):
+        east, north = self.target - self.pwi4.pointing()
+        # Camera angle 0, not flipped: +y is north, +x is west
+        x = 0.5 * (roi[2] - 1) - east / PLATE_SCALE
+        y = 0.5 * (roi[3] - 1) + north / PLATE_SCALE
+        yy, xx = np.mgrid[0 : roi[3], 0 : roi[2]]
+        image = 100.0 + self.rng.normal(0.0, 3.0, (roi[3], roi[2]))
+        image += 500.0 * np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * 1.5**2))
+        return image, (roi[0], roi[1])
+
+
+def make_agent(target):
+    agent = types.SimpleNamespace(
+        config={
+            "acquire_camera_agent": "camera",
+            "acquire_roi": ROI,
+            "pointing_plate_scale": PLATE_SCALE,
+            "status_max_age": 0.0,
+        },
+        mount_status=None,
+        track_slew=lambda: {"completed": True},
+    )
+    agent.planewave_mount_talk = FakeTalk(agent, "localhost", 8220)
+    agent.peers = {"camera": FakeCamera(agent.planewave_mount_talk.pwi4, target)}
+    return agent
+
+
+def test_target_found_and_centered():
+    agent = make_agent((60.0, -45.0))
+    result = SpiralAcquisition(agent).run(max_steps=25)
+
+    assert result["found"]
+    assert 1 < result["steps"] < 25
+    pointing = agent.planewave_mount_talk.pwi4.pointing()
+    assert np.allclose(pointing, (60.0, -45.0), atol=1.0)
+
+
+def test_target_in_first_frame():
+    agent = make_agent((5.0, 8.0))
+    result = SpiralAcquisition(agent).run(max_steps=25)
+
+    assert result["found"] and result["steps"] == 1
+    assert np.allclose(agent.planewave_mount_talk.pwi4.pointing(), (5.0, 8.0), atol=1.0)
+
+
+def test_target_not_found():
+    agent = make_agent((5000.0, 5000.0))
+    result = SpiralAcquisition(agent).run(max_steps=9)
+
+    assert not result["found"] and result["steps"] == 9
+    assert result["offset_arcsec"] is None
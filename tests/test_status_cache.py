@@ -0,0 +1,120 @@
+"""The PWI4 status cache of PlanewaveMountTalk: TTL, single-flight requests,
+and invalidation by mount commands"""
+
+import threading
+import time
+import types
+
+import pytest
+
+from PlanewaveMountTalk import PlanewaveMountTalk
+
+
+class FakePWI4:
+    """Counts status requests; each may be held until ``gate`` is set"""
+
+    def __init__(self):
+        self.requests = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.error = None
+
+    def status(self):
+        self.requests += 1
+        self.started.set()
+        self.gate.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return types.SimpleNamespace(request=self.requests)
+
+    def mount_stop(self):
+        return types.SimpleNamespace(command="stop")
+
+
+class Talk(PlanewaveMountTalk):
+    def make_client(self, host, port):
+        return FakePWI4()
+
+
+@pytest.fixture
+def talk():
+    parent = types.SimpleNamespace(config={"status_max_age": 0.2})
+    talk = Talk(parent, "localhost", 8220)
+    # The probe and the initial status at startup
+    talk.pwi4.requests = 0
+    talk.invalidate_status()
+    return talk
+
+
+def in_threads(func, n):
+    results = [None] * n
+
+    def run(i):
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_recent_status_is_reused(talk):
+    first = talk.get_status()
+    assert talk.get_status() is first
+    assert talk.get_status(max_age=0.0) is not first
+    time.sleep(0.25)
+    assert talk.get_status().request == 3
+    assert talk.pwi4.requests == 3
+
+
+def test_concurrent_readers_share_one_request(talk):
+    talk.pwi4.gate.clear()
+    threads, results = in_threads(talk.get_status, 8)
+    talk.pwi4.started.wait(5.0)
+    time.sleep(0.05)  # let the other readers join the request
+    talk.pwi4.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert talk.pwi4.requests == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_failed_request_is_shared_and_not_cached(talk):
+    talk.pwi4.error = ConnectionRefusedError("PWI4 is down")
+    talk.pwi4.gate.clear()
+    threads, results = in_threads(talk.get_status, 3)
+    talk.pwi4.started.wait(5.0)
+    time.sleep(0.05)
+    talk.pwi4.gate.set()
+    for thread in threads:
+        thread.join()
+    assert all(result is talk.pwi4.error for result in results)
+
+    talk.pwi4.error = None
+    assert talk.get_status().request == 2
+
+
+def test_command_replaces_the_cached_status(talk):
+    talk.get_status()
+    talk.command(talk.pwi4.mount_stop)
+    assert talk.get_status().command == "stop"
+    assert talk.pwi4.requests == 1
+
+
+def test_status_requested_before_a_command_is_not_cached(talk):
+    talk.pwi4.gate.clear()
+    threads, results = in_threads(talk.get_status, 1)
+    talk.pwi4.started.wait(5.0)
+    talk.command(talk.pwi4.mount_stop)
+    talk.pwi4.gate.set()
+    threads[0].join()
+
+    # The reader that was waiting gets its (older) status ...
+    assert results[0].request == 1
+    # ... but later readers get the status the command returned
+    assert talk.get_status().command == "stop"
@@ -0,0 +1,61 @@
+"""The fixed-memory telemetry history kept by every SubAgent"""
+
+import time
+
+from AbstractAgents.TelemetryHistory import RingBuffer, TelemetryHistory
+
+
+def test_ring_buffer_keeps_the_newest_samples_in_order():
+    ring = RingBuffer(3)
+    for t in range(5):
+        ring.append(float(t), -t, t)
+
+    assert ring.count == 3
+    assert ring.oldest == 2.0
+    assert ring.snapshot() == ([2.0, 3.0, 4.0], [-2, -3, -4], [2, 3, 4])
+    assert ring.snapshot(since=3.0) == ([3.0, 4.0], [-3, -4], [3, 4])
+
+
+def test_raw_ring_buffer_shares_min_and_max():
+    ring = RingBuffer(2, minmax=False)
+    ring.append(0.0, 1.5, 1.5)
+    assert ring.highs is ring.lows
+    assert ring.snapshot() == ([0.0], [1.5], [1.5])
+
+
+def test_coarse_tiers_hold_the_min_max_envelope():
+    history = TelemetryHistory(length=10, decimation=2, n_tiers=3)
+    values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+    for t, value in enumerate(values):
+        history.record({"temp": value}, timestamp=float(t))
+
+    tiers = history.fields["temp"].tiers
+    assert tiers[0].snapshot() == (list(map(float, range(8))), values, values)
+    # Each bin is stamped with the time of its first sample
+    assert tiers[1].snapshot() == (
+        [0.0, 2.0, 4.0, 6.0],
+        [1.0, 1.0, 5.0, 2.0],
+        [3.0, 4.0, 9.0, 6.0],
+    )
+    assert tiers[2].snapshot() == ([0.0, 4.0], [1.0, 2.0], [4.0, 9.0])
+
+
+def test_only_numeric_fields_are_recorded():
+    history = TelemetryHistory()
+    history.record({"temp": -10, "connected": True, "name": "ccd", "power": 0.5})
+    assert sorted(history.fields) == ["power", "temp"]
+
+
+def test_query_uses_the_finest_tier_reaching_back():
+    history = TelemetryHistory(length=4, decimation=2, n_tiers=2)
+    now = time.time()
+    for k in range(8):
+        history.record({"alt": float(k)}, timestamp=now - 70 + 10 * k)
+
+    # The raw tier reaches back 30 s, the coarse tier 70 s
+    recent = history.query("alt", seconds=25)
+    assert recent["tier"] == 0 and recent["min"] == [5.0, 6.0, 7.0]
+    longer = history.query("alt", seconds=65)
+    assert longer["tier"] == 1 and longer["bin_samples"] == 2
+    assert longer["min"] == [2.0, 4.0, 6.0] and longer["max"] == [3.0, 5.0, 7.0]
+    assert history.query("missing") is None